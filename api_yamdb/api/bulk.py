@@ -0,0 +1,176 @@
+from collections import Counter
+from http import HTTPStatus
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from .serializers import TitleBulkItemSerializer
+from .signals import titles_bulk_saved
+from reviews.models import Category, ChangeLog, Genre, GenreTitle, Title
+
+
+def collect_values(items, key, kind):
+    """Значения поля всех элементов пакета, пригодные для поиска в БД."""
+    values = set()
+    for item in items:
+        raw = item.get(key) if isinstance(item, dict) else None
+        for value in raw if isinstance(raw, list) else [raw]:
+            if isinstance(value, kind) and not isinstance(value, bool):
+                values.add(value)
+    return values
+
+
+class TitleBulkWriter:
+    """Пакетное создание и изменение произведений.
+
+    Жанры, категории и изменяемые произведения загружаются тремя запросами
+    на весь пакет, корректные элементы записываются через `bulk_create` и
+    `bulk_update` в одной транзакции, для каждого элемента возвращается
+    свой результат.
+    """
+
+    def __init__(self, items):
+        self.items = items
+        self.results = [None] * len(items)
+        self.created, self.updated = [], []
+        self.genres = []
+
+    def load(self):
+        context = {
+            'genres': dict(Genre.objects.filter(
+                slug__in=collect_values(self.items, 'genre', str)
+            ).values_list('slug', 'pk')),
+            'categories': dict(Category.objects.filter(
+                slug__in=collect_values(self.items, 'category', str)
+            ).values_list('slug', 'pk')),
+        }
+        self.serializers = {
+            False: TitleBulkItemSerializer(context=context),
+            True: TitleBulkItemSerializer(context=context, partial=True),
+        }
+
+    def validate(self):
+        updates = []
+        for index, item in enumerate(self.items):
+            partial = isinstance(item, dict) and 'id' in item
+            try:
+                data = self.serializers[partial].run_validation(item)
+            except ValidationError as error:
+                self.fail(index, HTTPStatus.BAD_REQUEST, error.detail)
+                continue
+            if partial:
+                updates.append((index, data))
+            else:
+                self.add_create(index, data)
+        self.add_updates(updates)
+
+    def fail(self, index, status, errors):
+        self.results[index] = {'status': status, 'errors': errors}
+
+    def add_create(self, index, data):
+        genres = data.pop('genre')
+        category_id = data.pop('category')
+        title = Title(category_id=category_id, **data)
+        self.created.append((index, title))
+        self.genres.append((title, genres))
+
+    def add_updates(self, updates):
+        """Изменяемые произведения загружаются по уже проверенным id.
+
+        Элементы с одинаковым id отклоняются все: порядок их применения
+        в одном пакете не определён.
+        """
+        counts = Counter(data['id'] for _, data in updates)
+        existing = Title.objects.in_bulk(list(counts)) if counts else {}
+        for index, data in updates:
+            title_id = data.pop('id')
+            if counts[title_id] > 1:
+                self.fail(index, HTTPStatus.BAD_REQUEST, {'id': [
+                    'Произведение встречается в пакете несколько раз.'
+                ]})
+            elif title_id not in existing:
+                self.fail(index, HTTPStatus.NOT_FOUND, {'id': [
+                    'Произведение не найдено.'
+                ]})
+            else:
+                self.add_update(index, existing[title_id], data)
+
+    def add_update(self, index, title, data):
+        if 'genre' in data:
+            self.genres.append((title, data.pop('genre')))
+        if 'category' in data:
+            data['category_id'] = data.pop('category')
+        for field, value in data.items():
+            setattr(title, field, value)
+        self.updated.append((index, title))
+
+    def write(self):
+        titles = [title for _, title in self.created]
+        Title.objects.bulk_create(titles)
+        if titles and titles[0].pk is None:
+            # SQLite не возвращает pk из bulk_create; внутри транзакции
+            # вставленные строки - последние по pk.
+            ids = Title.objects.order_by('-pk').values_list(
+                'pk', flat=True
+            )[:len(titles)]
+            for title, pk in zip(titles, reversed(ids)):
+                title.pk = pk
+        updated = [title for _, title in self.updated]
+        if updated:
+            modified = timezone.now()
+            for title in updated:
+                title.version = F('version') + 1
+                title.modified = modified
+            Title.objects.bulk_update(updated, (
+                'name', 'year', 'description', 'category', 'version',
+                'modified',
+            ))
+        removed = self.remove_genres(updated)
+        links = [
+            GenreTitle(title_id=title.pk, genre_id=genre_id)
+            for title, genre_ids in self.genres
+            for genre_id in genre_ids
+        ]
+        GenreTitle.objects.bulk_create(links)
+        ChangeLog.record(
+            Title, [title.pk for title in titles], ChangeLog.CREATE
+        )
+        ChangeLog.record(
+            Title, [title.pk for title in updated], ChangeLog.UPDATE
+        )
+        titles_bulk_saved.send(
+            sender=Title, titles=titles + updated,
+            genre_links=[(link.title_id, link.genre_id) for link in links],
+            removed_links=removed,
+        )
+
+    def remove_genres(self, updated):
+        """Удаляет прежние жанры изменяемых произведений одним запросом.
+
+        Обычное `delete()` отправляет сигналы на каждую связь; версии,
+        кеши, журнал и индексы обновляются по всему пакету в
+        `titles_bulk_saved`. Возвращает удалённые пары (произведение, жанр).
+        """
+        updated_ids = {title.pk for title in updated}
+        links = GenreTitle.objects.filter(title_id__in=[
+            title.pk for title, _ in self.genres if title.pk in updated_ids
+        ])
+        removed = list(links.values_list('title_id', 'genre_id'))
+        if removed:
+            links._raw_delete(links.db)
+        return removed
+
+    def save(self):
+        self.load()
+        self.validate()
+        if self.created or self.updated:
+            with transaction.atomic():
+                self.write()
+        for index, title in self.created:
+            self.results[index] = {'status': HTTPStatus.CREATED,
+                                   'id': title.pk}
+        for index, title in self.updated:
+            self.results[index] = {'status': HTTPStatus.OK, 'id': title.pk}
+        return self.results
@@ -0,0 +1,63 @@
+import time
+from hashlib import md5
+
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
+
+from reviews.models import CacheTag
+
+
+def _now():
+    return time.time_ns() // 1000
+
+
+def get_tag_versions(tags):
+    """Текущие версии тегов; у ни разу не сдвинутых тегов версия 0."""
+    versions = dict.fromkeys(tags, 0)
+    versions.update(CacheTag.objects.filter(tag__in=versions).values_list(
+        'tag', 'version'
+    ))
+    return versions
+
+
+def bump_tags(*tags):
+    """Сдвигает версии тегов, делая устаревшими все зависящие ключи.
+
+    Версии пишутся в БД в той же транзакции, что и изменённые данные,
+    поэтому видны всем процессам одновременно с ними.
+    """
+    tags = set(tags)
+    now = _now()
+    updated = CacheTag.objects.filter(tag__in=tags).update(
+        version=Greatest(F('version') + 1, Value(now))
+    )
+    if updated < len(tags):
+        CacheTag.objects.bulk_create(
+            [CacheTag(tag=tag, version=now) for tag in tags],
+            ignore_conflicts=True,
+        )
+
+
+def make_key(prefix, *parts):
+    digest = md5('|'.join(map(str, parts)).encode()).hexdigest()
+    return f'{prefix}:{digest}'
+
+
+def normalized_query(request, exclude=()):
+    """Строка запроса с отсортированными параметрами без служебных."""
+    return '&'.join(
+        f'{name}={value}'
+        for name in sorted(request.query_params)
+        if name not in exclude
+        for value in sorted(request.query_params.getlist(name))
+    )
+
+
+def tag_validators(tags, *parts):
+    """ETag и время изменения ответа по версиям тегов без рендеринга."""
+    versions = get_tag_versions(tags)
+    etag = '"{}"'.format(
+        make_key('v', sorted(versions.items()), *parts).split(':')[1]
+    )
+    last_modified = max(versions.values(), default=0) // 10 ** 6
+    return etag, last_modified or None
@@ -0,0 +1,46 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import prefetch_related_objects
+from rest_framework import serializers
+
+from .querysets import build_query_plan
+
+
+def title_card_key(title):
+    return f'title-card:{title.pk}:{title.version}'
+
+
+def get_title_cards(titles, render, prefetch=()):
+    """Представления произведений из кеша одним запросом get_many.
+
+    Отсутствующие карточки рендерятся через `render`, перед этим для них
+    одним проходом подгружаются связи `prefetch`.
+    """
+    keys = [title_card_key(title) for title in titles]
+    cards = caches['cards'].get_many(keys)
+    misses = [
+        title for title, key in zip(titles, keys) if key not in cards
+    ]
+    if misses:
+        if prefetch:
+            prefetch_related_objects(misses, *prefetch)
+        rendered = {title_card_key(title): render(title) for title in misses}
+        caches['cards'].set_many(
+            rendered, timeout=settings.TITLE_CARD_CACHE_TIMEOUT
+        )
+        cards.update(rendered)
+    return [cards[key] for key in keys]
+
+
+class TitleCardListSerializer(serializers.ListSerializer):
+    """Список произведений, собранный из закешированных карточек."""
+    defer_prefetch = True
+
+    def to_representation(self, data):
+        if self.child.is_sparse:
+            return super().to_representation(data)
+        titles = list(data.all() if hasattr(data, 'all') else data)
+        plan = build_query_plan(type(self.child))
+        return get_title_cards(
+            titles, self.child.render_card, plan.prefetch_related
+        )
@@ -0,0 +1,22 @@
+from reviews.models import ChangeLog
+
+
+def compact_changes(rows):
+    """Сворачивает записи журнала до последней операции над объектом.
+
+    `rows` - кортежи (seq, model, object_id, op) по возрастанию `seq`.
+    Отметки `purge` пропускаются. Результат сгруппирован по моделям:
+    `changed` - id созданных или изменённых объектов, `deleted` - удалённых.
+    """
+    latest = {}
+    for _, model, object_id, op in rows:
+        if op == ChangeLog.PURGE:
+            continue
+        latest.pop((model, object_id), None)
+        latest[model, object_id] = op
+    changes = {}
+    for (model, object_id), op in latest.items():
+        group = changes.setdefault(model, {'changed': [], 'deleted': []})
+        key = 'deleted' if op == ChangeLog.DELETE else 'changed'
+        group[key].append(object_id)
+    return changes
@@ -0,0 +1,226 @@
+import asyncio
+import atexit
+import json
+import os
+import re
+import socket
+from contextlib import suppress
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from .renderers import dumps
+from reviews.models import Title
+
+EVENTS_PATH = re.compile(r'^/api/v1/titles/(?P<title_id>\d+)/events/$')
+MAX_DATAGRAM_SIZE = 64 * 1024
+
+
+class Notifier:
+    """Передаёт события всем процессам-воркерам через датаграммы Unix.
+
+    Каждый воркер с открытыми потоками слушает свой сокет в
+    `EVENTS_SOCKET_DIR`; событие отправляется во все сокеты каталога,
+    сокеты завершившихся процессов удаляются. Отправка не блокирует:
+    если буфер получателя полон, событие для него теряется.
+    """
+
+    def __init__(self):
+        self.socket = None
+
+    def send(self, event):
+        try:
+            paths = [entry.path for entry in os.scandir(
+                settings.EVENTS_SOCKET_DIR
+            )]
+        except FileNotFoundError:
+            return
+        if self.socket is None:
+            self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+            self.socket.setblocking(False)
+        payload = dumps(event)
+        for path in paths:
+            try:
+                self.socket.sendto(payload, path)
+            except (ConnectionRefusedError, FileNotFoundError):
+                with suppress(FileNotFoundError):
+                    os.unlink(path)
+            except BlockingIOError:
+                pass
+
+
+class Broadcaster:
+    """Раздаёт события из сокета процесса подписчикам на произведения.
+
+    У каждого подписчика своя очередь на `EVENTS_QUEUE_SIZE` событий.
+    Отстающий подписчик не копит события в памяти: его очередь
+    очищается, и поток закрывается, чтобы клиент переподключился.
+    """
+
+    def __init__(self):
+        self.subscribers = {}
+        self.count = 0
+        self.loop = self.socket = self.path = None
+        atexit.register(self.close)
+
+    def subscribe(self, title_id):
+        loop = asyncio.get_running_loop()
+        if self.loop is not loop:
+            self.listen(loop)
+        queue = asyncio.Queue(settings.EVENTS_QUEUE_SIZE)
+        self.subscribers.setdefault(title_id, set()).add(queue)
+        self.count += 1
+        return queue
+
+    def unsubscribe(self, title_id, queue):
+        queues = self.subscribers.get(title_id, set())
+        if queue in queues:
+            queues.discard(queue)
+            self.count -= 1
+        if not queues:
+            self.subscribers.pop(title_id, None)
+
+    def listen(self, loop):
+        self.close()
+        os.makedirs(settings.EVENTS_SOCKET_DIR, exist_ok=True)
+        self.path = os.path.join(
+            settings.EVENTS_SOCKET_DIR, f'{os.getpid()}.sock'
+        )
+        with suppress(FileNotFoundError):
+            os.unlink(self.path)
+        self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self.socket.bind(self.path)
+        self.socket.setblocking(False)
+        loop.add_reader(self.socket.fileno(), self.receive)
+        self.loop = loop
+
+    def close(self):
+        if self.socket is None:
+            return
+        if not self.loop.is_closed():
+            self.loop.remove_reader(self.socket.fileno())
+        self.socket.close()
+        with suppress(FileNotFoundError):
+            os.unlink(self.path)
+        self.loop = self.socket = self.path = None
+
+    def receive(self):
+        while True:
+            try:
+                payload = self.socket.recv(MAX_DATAGRAM_SIZE)
+            except BlockingIOError:
+                return
+            self.publish(json.loads(payload))
+
+    def publish(self, event):
+        for queue in list(self.subscribers.get(event['title'], ())):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(None)
+
+
+notifier = Notifier()
+broadcaster = Broadcaster()
+
+
+def format_event(event):
+    return b'event: %s\ndata: %s\n\n' % (event['type'].encode(), dumps(event))
+
+
+class EventStream:
+    """Поток Server-Sent Events с событиями отзывов одного произведения.
+
+    Раз в `EVENTS_HEARTBEAT` секунд отправляется комментарий-пинг; поток
+    без событий дольше `EVENTS_IDLE_TIMEOUT` секунд закрывается.
+    """
+    headers = [
+        (b'content-type', b'text/event-stream'),
+        (b'cache-control', b'no-cache'),
+        (b'x-accel-buffering', b'no'),
+    ]
+
+    def __init__(self, title_id, receive, send):
+        self.title_id, self.receive, self.send = title_id, receive, send
+
+    async def __call__(self):
+        if broadcaster.count >= settings.EVENTS_MAX_CONNECTIONS:
+            return await self.respond(503, b'Too many event streams.')
+        if not await sync_to_async(self.title_exists)():
+            return await self.respond(404, b'Title not found.')
+        queue = broadcaster.subscribe(self.title_id)
+        disconnect = asyncio.ensure_future(self.wait_disconnect())
+        try:
+            await self.send({
+                'type': 'http.response.start',
+                'status': 200,
+                'headers': self.headers,
+            })
+            await self.write(b'retry: %d\n\n' % settings.EVENTS_RETRY)
+            if await self.relay(queue, disconnect):
+                await self.send({'type': 'http.response.body', 'body': b''})
+        finally:
+            broadcaster.unsubscribe(self.title_id, queue)
+            disconnect.cancel()
+
+    async def relay(self, queue, disconnect):
+        """Пересылает события; False, если клиент отключился сам."""
+        loop = asyncio.get_running_loop()
+        idle_until = loop.time() + settings.EVENTS_IDLE_TIMEOUT
+        while loop.time() < idle_until:
+            getter = asyncio.ensure_future(queue.get())
+            done, _ = await asyncio.wait(
+                (getter, disconnect), timeout=settings.EVENTS_HEARTBEAT,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            if disconnect in done:
+                getter.cancel()
+                return False
+            if getter not in done:
+                getter.cancel()
+                await self.write(b': ping\n\n')
+                continue
+            event = getter.result()
+            if event is None:
+                break
+            await self.write(format_event(event))
+            idle_until = loop.time() + settings.EVENTS_IDLE_TIMEOUT
+        return True
+
+    def title_exists(self):
+        return Title.objects.filter(pk=self.title_id).exists()
+
+    async def wait_disconnect(self):
+        while (await self.receive())['type'] != 'http.disconnect':
+            pass
+
+    async def write(self, body):
+        await self.send({
+            'type': 'http.response.body', 'body': body, 'more_body': True
+        })
+
+    async def respond(self, status, body):
+        await self.send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': [(b'content-type', b'text/plain; charset=utf-8')],
+        })
+        await self.send({'type': 'http.response.body', 'body': body})
+
+
+def event_stream_application(application):
+    """ASGI-приложение: потоки событий сами, остальное - `application`."""
+
+    async def route(scope, receive, send):
+        match = scope['type'] == 'http' and scope['method'] == 'GET' and (
+            EVENTS_PATH.match(scope['path'])
+        )
+        if not match:
+            return await application(scope, receive, send)
+        return await EventStream(
+            int(match['title_id']), receive, send
+        )()
+
+    return route
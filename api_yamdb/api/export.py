@@ -0,0 +1,157 @@
+import zlib
+from datetime import datetime, time
+from itertools import groupby
+from operator import itemgetter
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import ValidationError
+
+from .renderers import dumps
+from reviews.models import Comment, GenreTitle, Review, Title
+
+WBITS = {'gzip': zlib.MAX_WBITS | 16, 'deflate': zlib.MAX_WBITS}
+TITLE_FIELDS = ('id', 'name', 'year', 'description', 'rating', 'modified',
+                'category__name', 'category__slug')
+REVIEW_FIELDS = ('id', 'title_id', 'author__username', 'text', 'score',
+                 'pub_date')
+COMMENT_FIELDS = ('id', 'review__title_id', 'review_id', 'author__username',
+                  'text', 'pub_date')
+
+
+def parse_since(value):
+    """Момент, начиная с которого выгружаются изменения."""
+    try:
+        since = parse_datetime(value)
+        if since is None:
+            date = parse_date(value)
+            since = date and datetime.combine(date, time.min)
+    except ValueError:
+        since = None
+    if since is None:
+        raise ValidationError({'since': 'Неверный формат даты.'})
+    if timezone.is_naive(since):
+        since = timezone.make_aware(since)
+    return since
+
+
+class Children:
+    """Дочерние строки упорядоченного потока, выдаваемые по родителю.
+
+    Поток и родители упорядочены одинаково, поэтому строки чужих
+    родителей пропускаются, а в памяти держится одна группа.
+    """
+
+    def __init__(self, rows, *key):
+        self.groups = groupby(rows, key=itemgetter(*key))
+        self.current = next(self.groups, None)
+
+    def pop(self, parent_key):
+        while self.current is not None and self.current[0] < parent_key:
+            self.current = next(self.groups, None)
+        if self.current is None or self.current[0] != parent_key:
+            return []
+        rows = list(self.current[1])
+        self.current = next(self.groups, None)
+        return rows
+
+
+def export_records(since=None, chunk_size=None):
+    """Произведения с жанрами, категорией, отзывами и комментариями.
+
+    Четыре запроса читаются параллельно через `iterator()` в одном порядке
+    по id произведения и сливаются на лету, так что память не зависит от
+    объёма каталога.
+    """
+    chunk_size = chunk_size or settings.EXPORT_CHUNK_SIZE
+    titles = Title.objects.all()
+    genres = GenreTitle.objects.all()
+    reviews = Review.objects.all()
+    comments = Comment.objects.all()
+    if since is not None:
+        titles = titles.filter(modified__gte=since)
+        genres = genres.filter(title__modified__gte=since)
+        reviews = reviews.filter(title__modified__gte=since)
+        comments = comments.filter(review__title__modified__gte=since)
+    genres = Children(genres.order_by('title_id', 'genre__slug').values(
+        'title_id', 'genre__name', 'genre__slug'
+    ).iterator(chunk_size), 'title_id')
+    reviews = Children(reviews.order_by('title_id', 'id').values(
+        *REVIEW_FIELDS
+    ).iterator(chunk_size), 'title_id')
+    comments = Children(comments.order_by(
+        'review__title_id', 'review_id', 'id'
+    ).values(*COMMENT_FIELDS).iterator(chunk_size),
+        'review__title_id', 'review_id')
+    for title in titles.order_by('id').values(*TITLE_FIELDS).iterator(
+            chunk_size):
+        yield export_title(title, genres, reviews, comments)
+
+
+def export_title(title, genres, reviews, comments):
+    return {
+        'id': title['id'],
+        'name': title['name'],
+        'year': title['year'],
+        'description': title['description'],
+        'rating': title['rating'],
+        'modified': title['modified'],
+        'category': title['category__slug'] and {
+            'name': title['category__name'],
+            'slug': title['category__slug'],
+        },
+        'genre': [
+            {'name': genre['genre__name'], 'slug': genre['genre__slug']}
+            for genre in genres.pop(title['id'])
+        ],
+        'reviews': [
+            export_review(
+                review, comments.pop((title['id'], review['id']))
+            )
+            for review in reviews.pop(title['id'])
+        ],
+    }
+
+
+def export_review(review, comments):
+    return {
+        'id': review['id'],
+        'author': review['author__username'],
+        'text': review['text'],
+        'score': review['score'],
+        'pub_date': review['pub_date'],
+        'comments': [
+            {
+                'id': comment['id'],
+                'author': comment['author__username'],
+                'text': comment['text'],
+                'pub_date': comment['pub_date'],
+            }
+            for comment in comments
+        ],
+    }
+
+
+def ndjson_chunks(records, buffer_size=None):
+    """Строки NDJSON, собранные в куски не меньше `buffer_size` байт."""
+    buffer_size = buffer_size or settings.EXPORT_BUFFER_SIZE
+    buffer = bytearray()
+    for record in records:
+        buffer += dumps(record)
+        buffer += b'\n'
+        if len(buffer) >= buffer_size:
+            yield bytes(buffer)
+            buffer.clear()
+    if buffer:
+        yield bytes(buffer)
+
+
+def compress_chunks(chunks, encoding):
+    """Сжимает поток кусков в один поток gzip или deflate."""
+    compressor = zlib.compressobj(wbits=WBITS[encoding])
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
@@ -1,22 +1,106 @@
+from django.conf import settings
 from django_filters import rest_framework as filters
 
-from reviews.models import Title
+from .indexes import title_filter_index
+from .search import search_titles
+from reviews.models import GenreTitle, Title
+
+
+def filter_titles_sql(queryset, genres=(), genre_mode='or', category=None,
+                      year_min=None, year_max=None):
+    """Те же условия, что и у индекса, средствами ORM."""
+    if genres and genre_mode == 'and':
+        for slug in genres:
+            queryset = queryset.filter(pk__in=GenreTitle.objects.filter(
+                genre__slug=slug).values('title_id'))
+    elif genres:
+        queryset = queryset.filter(pk__in=GenreTitle.objects.filter(
+            genre__slug__in=genres).values('title_id'))
+    if category:
+        queryset = queryset.filter(category__slug=category)
+    if year_min is not None:
+        queryset = queryset.filter(year__gte=year_min)
+    if year_max is not None:
+        queryset = queryset.filter(year__lte=year_max)
+    return queryset
 
 
 class TitleFilter(filters.FilterSet):
-    """Фильтр произведений по полям."""
+    """Фильтр произведений по полям.
 
-    category = filters.CharFilter(
-        field_name='category__slug',
+    Жанры, категория и годы отбираются по индексу в памяти, в ORM уходит
+    готовый список id. Несколько жанров передаются через запятую,
+    `genre_mode=and` требует наличия всех жанров сразу.
+    """
 
+    category = filters.CharFilter(
+        method='filter_by_index',
+    )
+    genre = filters.BaseInFilter(
+        method='filter_by_index',
+    )
+    genre_mode = filters.ChoiceFilter(
+        choices=(('or', 'or'), ('and', 'and')),
+        method='filter_by_index',
+    )
+    year = filters.NumberFilter(
+        method='filter_by_index',
+    )
+    year_min = filters.NumberFilter(
+        method='filter_by_index',
     )
-    genre = filters.CharFilter(
-        field_name='genre__slug',
+    year_max = filters.NumberFilter(
+        method='filter_by_index',
     )
     name = filters.CharFilter(
         field_name='name',
     )
+    rating_min = filters.NumberFilter(
+        field_name='rating',
+        lookup_expr='gte',
+    )
+    rating_max = filters.NumberFilter(
+        field_name='rating',
+        lookup_expr='lte',
+    )
+    search = filters.CharFilter(
+        method='filter_search',
+    )
 
     class Meta:
         model = Title
-        fields = ('category', 'genre', 'name', 'year')
+        fields = ('category', 'genre', 'genre_mode', 'name', 'year',
+                  'year_min', 'year_max', 'rating_min', 'rating_max',
+                  'search')
+
+    def get_index_criteria(self):
+        data = self.form.cleaned_data
+        year_min, year_max = data.get('year_min'), data.get('year_max')
+        if data.get('year') is not None:
+            year_min = year_max = data['year']
+        return {
+            'genres': [slug for slug in data.get('genre') or () if slug],
+            'genre_mode': data.get('genre_mode') or 'or',
+            'category': data.get('category') or None,
+            'year_min': year_min,
+            'year_max': year_max,
+        }
+
+    def filter_queryset(self, queryset):
+        criteria = self.get_index_criteria()
+        if (criteria['genres'] or criteria['category']
+                or criteria['year_min'] is not None
+                or criteria['year_max'] is not None):
+            ids = title_filter_index.select(**criteria)
+            if len(ids) > settings.FILTER_INDEX_MAX_IDS:
+                queryset = filter_titles_sql(queryset, **criteria)
+            else:
+                queryset = queryset.filter(pk__in=ids)
+        return super().filter_queryset(queryset)
+
+    def filter_by_index(self, queryset, name, value):
+        """Условие уже применено в filter_queryset по индексу."""
+        return queryset
+
+    def filter_search(self, queryset, name, value):
+        return search_titles(queryset, value)
@@ -0,0 +1,534 @@
+import threading
+import time
+from bisect import bisect_left, insort
+from functools import reduce
+from operator import or_
+
+from django.conf import settings
+from django.db.models import Max
+
+from .search import WORD_PATTERN, normalize_text
+from reviews.models import Category, ChangeLog, Genre, GenreTitle, Title
+
+
+class InMemoryIndex:
+    """Индекс в памяти процесса, собираемый из БД при первом обращении.
+
+    Записи этого процесса применяются к индексу сразу, записи других
+    процессов - при следующем чтении: объекты, упомянутые в журнале
+    изменений после собранной версии, перечитываются из БД. Индекс
+    пересобирается полностью, если журнал сжат дальше этой версии, и раз
+    в `settings.IN_MEMORY_INDEX_TTL` секунд.
+    """
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.built_at = None
+        self.seq = 0
+
+    def build(self):
+        raise NotImplementedError
+
+    def refresh_changes(self, changes):
+        """Перечитывает объекты из `changes`: {модель: множество id}."""
+        raise NotImplementedError
+
+    def ensure_built(self):
+        with self.lock:
+            if (self.built_at is None or time.monotonic() - self.built_at
+                    > settings.IN_MEMORY_INDEX_TTL):
+                self.rebuild()
+            else:
+                self.catch_up()
+
+    def rebuild(self):
+        # Номер берётся до чтения данных: изменения, сделанные во время
+        # сборки, будут перечитаны ещё раз, а не потеряны.
+        self.seq = ChangeLog.objects.aggregate(seq=Max('seq'))['seq'] or 0
+        self.build()
+        self.built_at = time.monotonic()
+
+    def catch_up(self):
+        rows = list(ChangeLog.objects.filter(seq__gt=self.seq).values_list(
+            'seq', 'model', 'object_id', 'op'
+        ))
+        if not rows:
+            return
+        if any(op == ChangeLog.PURGE for *_, op in rows):
+            self.rebuild()
+            return
+        changes = {}
+        for _, model, object_id, _ in rows:
+            changes.setdefault(model, set()).add(object_id)
+        self.refresh_changes(changes)
+        self.seq = rows[-1][0]
+
+    def reset(self):
+        with self.lock:
+            self.built_at = None
+
+    def apply(self, method, *args):
+        """Применяет изменение, только если индекс уже собран."""
+        with self.lock:
+            if self.built_at is not None:
+                method(*args)
+
+
+def group_bits(pairs):
+    """Битовые множества id по ключам из пар (ключ, id)."""
+    groups = {}
+    for key, pk in pairs:
+        if key is not None:
+            groups.setdefault(key, []).append(pk)
+    return {key: ids_to_bits(ids) for key, ids in groups.items()}
+
+
+class SuggestIndex(InMemoryIndex):
+    """Отсортированные ключи для подсказок по началу названия или слова."""
+    sources = (
+        ('title', Title, 'id'),
+        ('genre', Genre, 'slug'),
+        ('category', Category, 'slug'),
+    )
+
+    def build(self):
+        self.keys, self.entries = [], {}
+        for kind, model, ident in self.sources:
+            for pk, value, name in model.objects.values_list(
+                    'pk', ident, 'name').iterator():
+                self._add(kind, pk, {'type': kind, ident: value,
+                                     'name': name})
+
+    def refresh_changes(self, changes):
+        for kind, model, ident in self.sources:
+            ids = changes.get(kind)
+            if not ids:
+                continue
+            rows = {
+                pk: (value, name) for pk, value, name in
+                model.objects.filter(pk__in=ids).values_list(
+                    'pk', ident, 'name'
+                )
+            }
+            for pk in ids:
+                self._remove(kind, pk)
+                if pk in rows:
+                    value, name = rows[pk]
+                    self._add(kind, pk, {'type': kind, ident: value,
+                                         'name': name})
+
+    @staticmethod
+    def _keys(name):
+        normalized = normalize_text(name)
+        return {
+            normalized[match.start():]
+            for match in WORD_PATTERN.finditer(normalized)
+        }
+
+    def _add(self, kind, pk, entry):
+        keys = self._keys(entry['name'])
+        self.entries[(kind, pk)] = (keys, entry)
+        for key in keys:
+            insort(self.keys, (key, kind, pk))
+
+    def _remove(self, kind, pk):
+        keys, _ = self.entries.pop((kind, pk), ((), None))
+        for key in keys:
+            item = (key, kind, pk)
+            index = bisect_left(self.keys, item)
+            if index < len(self.keys) and self.keys[index] == item:
+                del self.keys[index]
+
+    def update(self, instance):
+        kind, _, ident = next(
+            source for source in self.sources
+            if isinstance(instance, source[1])
+        )
+        entry = {'type': kind, ident: getattr(instance, ident),
+                 'name': instance.name}
+        self.apply(self._update, kind, instance.pk, entry)
+
+    def _update(self, kind, pk, entry):
+        self._remove(kind, pk)
+        self._add(kind, pk, entry)
+
+    def remove(self, instance):
+        kind = next(
+            source[0] for source in self.sources
+            if isinstance(instance, source[1])
+        )
+        self.apply(self._remove, kind, instance.pk)
+
+    def suggest(self, prefix, limit):
+        prefix = normalize_text(prefix).strip()
+        if not prefix:
+            return []
+        self.ensure_built()
+        with self.lock:
+            found, results = set(), []
+            index = bisect_left(self.keys, (prefix,))
+            while index < len(self.keys) and len(results) < limit:
+                key, kind, pk = self.keys[index]
+                if not key.startswith(prefix):
+                    break
+                if (kind, pk) not in found:
+                    found.add((kind, pk))
+                    results.append(self.entries[(kind, pk)][1])
+                index += 1
+        return results
+
+
+def bits_to_ids(bits):
+    """Номера установленных битов по возрастанию."""
+    digits = bin(bits)[:1:-1]
+    ids, position = [], digits.find('1')
+    while position != -1:
+        ids.append(position)
+        position = digits.find('1', position + 1)
+    return ids
+
+
+def ids_to_bits(ids):
+    """Битовое множество из набора id."""
+    ids = list(ids)
+    if not ids:
+        return 0
+    buffer = bytearray(max(ids) // 8 + 1)
+    for pk in ids:
+        buffer[pk >> 3] |= 1 << (pk & 7)
+    return int.from_bytes(buffer, 'little')
+
+
+def popcount(bits):
+    return bin(bits).count('1')
+
+
+class TitleFilterIndex(InMemoryIndex):
+    """Битовые множества id произведений по жанрам, категориям и годам.
+
+    Каждое множество - целое число, где бит с номером id установлен для
+    входящих в него произведений, поэтому сочетание фильтров сводится к
+    побитовым операциям, а в ORM уходит готовый список id.
+    """
+
+    def build(self):
+        self.genre_slugs = dict(Genre.objects.values_list('slug', 'pk'))
+        self.category_slugs = dict(
+            Category.objects.values_list('slug', 'pk')
+        )
+        self.titles = {
+            pk: (year, category_id)
+            for pk, year, category_id in Title.objects.values_list(
+                'pk', 'year', 'category_id').iterator()
+        }
+        self.year_bits = group_bits(
+            (year, pk) for pk, (year, _) in self.titles.items()
+        )
+        self.category_bits = group_bits(
+            (category_id, pk) for pk, (_, category_id) in self.titles.items()
+        )
+        self.genre_bits = group_bits(
+            (genre_id, title_id) for title_id, genre_id in
+            GenreTitle.objects.values_list('title_id', 'genre_id').iterator()
+        )
+        self.years = sorted(self.year_bits)
+
+    def refresh_changes(self, changes):
+        for kind, model in (('genre', Genre), ('category', Category)):
+            ids = changes.get(kind)
+            if not ids:
+                continue
+            slugs = dict(model.objects.filter(pk__in=ids).values_list(
+                'pk', 'slug'
+            ))
+            for pk in ids:
+                if pk in slugs:
+                    self._set_slug(kind, pk, slugs[pk])
+                else:
+                    getattr(self, f'_drop_{kind}')(pk)
+        title_ids = changes.get('title')
+        if title_ids:
+            self._refresh_titles(
+                title_ids,
+                Title.objects.filter(pk__in=title_ids).values_list(
+                    'pk', 'year', 'category_id'
+                ),
+                GenreTitle.objects.filter(
+                    title_id__in=title_ids
+                ).values_list('title_id', 'genre_id'),
+            )
+
+    def _refresh_titles(self, title_ids, rows, genre_links):
+        mask = ids_to_bits(title_ids)
+        for bitsets in (self.year_bits, self.category_bits, self.genre_bits):
+            for key in list(bitsets):
+                self._toggle(bitsets, key, mask, False)
+        for pk in title_ids:
+            self.titles.pop(pk, None)
+        for pk, year, category_id in rows:
+            self._set_title(pk, year, category_id)
+        for title_id, genre_id in genre_links:
+            self._add_genre(title_id, genre_id)
+        self.years = sorted(self.year_bits)
+
+    @staticmethod
+    def _toggle(bitsets, key, bit, present):
+        if key is None:
+            return
+        bits = bitsets.get(key, 0)
+        bits = bits | bit if present else bits & ~bit
+        if bits:
+            bitsets[key] = bits
+        else:
+            bitsets.pop(key, None)
+
+    def _set_title(self, pk, year, category_id):
+        bit = 1 << pk
+        old_year, old_category_id = self.titles.get(pk, (None, None))
+        self._toggle(self.year_bits, old_year, bit, False)
+        self._toggle(self.category_bits, old_category_id, bit, False)
+        self.titles[pk] = (year, category_id)
+        self._toggle(self.year_bits, year, bit, True)
+        self._toggle(self.category_bits, category_id, bit, True)
+        self.years = sorted(self.year_bits)
+
+    def _remove_title(self, pk):
+        year, category_id = self.titles.pop(pk, (None, None))
+        bit = 1 << pk
+        self._toggle(self.year_bits, year, bit, False)
+        self._toggle(self.category_bits, category_id, bit, False)
+        for genre_id in list(self.genre_bits):
+            self._toggle(self.genre_bits, genre_id, bit, False)
+        self.years = sorted(self.year_bits)
+
+    def _add_genre(self, title_id, genre_id):
+        self._toggle(self.genre_bits, genre_id, 1 << title_id, True)
+
+    def _remove_genre(self, title_id, genre_id):
+        self._toggle(self.genre_bits, genre_id, 1 << title_id, False)
+
+    def _set_slug(self, kind, pk, slug):
+        slugs = getattr(self, f'{kind}_slugs')
+        for old_slug, old_pk in list(slugs.items()):
+            if old_pk == pk:
+                del slugs[old_slug]
+        if slug is not None:
+            slugs[slug] = pk
+
+    def _drop_genre(self, pk):
+        self._set_slug('genre', pk, None)
+        self.genre_bits.pop(pk, None)
+
+    def _drop_category(self, pk):
+        self._set_slug('category', pk, None)
+        for title_id in bits_to_ids(self.category_bits.pop(pk, 0)):
+            self.titles[title_id] = (self.titles[title_id][0], None)
+
+    def set_title(self, title):
+        self.apply(self._set_title, title.pk, title.year, title.category_id)
+
+    def remove_title(self, title_id):
+        self.apply(self._remove_title, title_id)
+
+    def add_genres(self, title_ids, genre_ids):
+        for title_id in title_ids:
+            for genre_id in genre_ids:
+                self.apply(self._add_genre, title_id, genre_id)
+
+    def remove_genres(self, title_ids, genre_ids):
+        for title_id in title_ids:
+            for genre_id in genre_ids:
+                self.apply(self._remove_genre, title_id, genre_id)
+
+    def set_genre(self, genre):
+        self.apply(self._set_slug, 'genre', genre.pk, genre.slug)
+
+    def remove_genre(self, genre_id):
+        self.apply(self._drop_genre, genre_id)
+
+    def set_category(self, category):
+        self.apply(self._set_slug, 'category', category.pk, category.slug)
+
+    def remove_category(self, category_id):
+        self.apply(self._drop_category, category_id)
+
+    def _year_range(self, year_min, year_max):
+        start = 0 if year_min is None else bisect_left(self.years, year_min)
+        bits = 0
+        for year in self.years[start:]:
+            if year_max is not None and year > year_max:
+                break
+            bits |= self.year_bits[year]
+        return bits
+
+    def resolve(self, kind, slug):
+        """pk жанра или категории по slug."""
+        self.ensure_built()
+        with self.lock:
+            return getattr(self, f'{kind}_slugs').get(slug)
+
+    def select(self, genres=(), genre_mode='or', category=None,
+               year_min=None, year_max=None):
+        """Отсортированные id произведений, подходящих под все условия."""
+        self.ensure_built()
+        with self.lock:
+            bits = self._year_range(year_min, year_max)
+            if category:
+                bits &= self.category_bits.get(
+                    self.category_slugs.get(category), 0
+                )
+            if genres:
+                genre_bits = [
+                    self.genre_bits.get(self.genre_slugs.get(slug), 0)
+                    for slug in genres
+                ]
+                if genre_mode == 'and':
+                    for genre in genre_bits:
+                        bits &= genre
+                else:
+                    bits &= reduce(or_, genre_bits)
+        return bits_to_ids(bits)
+
+    def facets(self, bits):
+        """Количество произведений из множества по категориям, жанрам
+        и десятилетиям, включая нулевые."""
+        self.ensure_built()
+        with self.lock:
+            decades = {}
+            for year in self.years:
+                decade = year // 10 * 10
+                decades[decade] = decades.get(decade, 0) | self.year_bits[
+                    year]
+            return {
+                'category': {
+                    slug: popcount(bits & self.category_bits.get(pk, 0))
+                    for slug, pk in sorted(self.category_slugs.items())
+                },
+                'genre': {
+                    slug: popcount(bits & self.genre_bits.get(pk, 0))
+                    for slug, pk in sorted(self.genre_slugs.items())
+                },
+                'decade': {
+                    decade: popcount(bits & decade_bits)
+                    for decade, decade_bits in decades.items()
+                },
+            }
+
+
+class LeaderboardIndex(InMemoryIndex):
+    """Произведения, упорядоченные по байесовскому рейтингу.
+
+    Отдельные списки ведутся для всего каталога, каждой категории, каждого
+    жанра и каждой пары категория-жанр, так что чтение top-K - срез
+    готового списка. Оценка тянется к `LEADERBOARD_PRIOR_MEAN` с весом
+    `LEADERBOARD_PRIOR_WEIGHT` отзывов, поэтому единственный отзыв 10/10
+    не выводит произведение в лидеры.
+    """
+
+    def build(self):
+        self.titles, self.boards = {}, {}
+        genres = self._load_genres(GenreTitle.objects.all())
+        for pk, category_id, rating_sum, rating_count in (
+                Title.objects.values_list(
+                    'pk', 'category_id', 'rating_sum', 'rating_count'
+                ).iterator()):
+            self._set(pk, category_id, genres.get(pk, ()), rating_sum,
+                      rating_count)
+
+    @staticmethod
+    def _load_genres(genre_titles):
+        genres = {}
+        for title_id, genre_id in genre_titles.values_list(
+                'title_id', 'genre_id').iterator():
+            genres.setdefault(title_id, set()).add(genre_id)
+        return genres
+
+    @staticmethod
+    def score(rating_sum, rating_count):
+        weight = settings.LEADERBOARD_PRIOR_WEIGHT
+        return (weight * settings.LEADERBOARD_PRIOR_MEAN + rating_sum) / (
+            weight + rating_count
+        )
+
+    @staticmethod
+    def _board_keys(category_id, genre_ids):
+        keys = [(None, None)]
+        if category_id is not None:
+            keys.append((category_id, None))
+        for genre_id in genre_ids:
+            keys.append((None, genre_id))
+            if category_id is not None:
+                keys.append((category_id, genre_id))
+        return keys
+
+    def _remove(self, pk):
+        score, category_id, genre_ids = self.titles.pop(pk, (None,) * 3)
+        if score is None:
+            return
+        item = (-score, pk)
+        for key in self._board_keys(category_id, genre_ids):
+            board = self.boards.get(key, [])
+            index = bisect_left(board, item)
+            if index < len(board) and board[index] == item:
+                del board[index]
+            if not board:
+                self.boards.pop(key, None)
+
+    def _set(self, pk, category_id, genre_ids, rating_sum, rating_count):
+        self._remove(pk)
+        score = self.score(rating_sum, rating_count) if rating_count else None
+        self.titles[pk] = (score, category_id, frozenset(genre_ids))
+        if score is None:
+            return
+        for key in self._board_keys(category_id, genre_ids):
+            insort(self.boards.setdefault(key, []), (-score, pk))
+
+    def _refresh(self, title_ids, rows, genres):
+        for pk in title_ids:
+            self._remove(pk)
+        for pk, category_id, rating_sum, rating_count in rows:
+            self._set(pk, category_id, genres.get(pk, ()), rating_sum,
+                      rating_count)
+
+    @classmethod
+    def load(cls, title_ids):
+        """Рейтинг, категория и жанры произведений из БД."""
+        rows = list(Title.objects.filter(pk__in=title_ids).values_list(
+            'pk', 'category_id', 'rating_sum', 'rating_count'
+        ))
+        return rows, cls._load_genres(
+            GenreTitle.objects.filter(title_id__in=title_ids)
+        )
+
+    def refresh(self, title_ids):
+        """Перечитывает рейтинг, категорию и жанры произведений из БД."""
+        title_ids = list(title_ids)
+        if self.built_at is None or not title_ids:
+            return
+        self.apply(self._refresh, title_ids, *self.load(title_ids))
+
+    def refresh_changes(self, changes):
+        title_ids = list(changes.get('title', ()))
+        if title_ids:
+            self._refresh(title_ids, *self.load(title_ids))
+
+    def remove(self, title_id):
+        self.apply(self._remove, title_id)
+
+    def top(self, k, category_id=None, genre_id=None):
+        """id лучших произведений, не больше `k`."""
+        self.ensure_built()
+        with self.lock:
+            board = self.boards.get((category_id, genre_id), ())
+            return [pk for _, pk in board[:k]]
+
+
+suggest_index = SuggestIndex()
+title_filter_index = TitleFilterIndex()
+leaderboard_index = LeaderboardIndex()
+
+
+def reset_indexes():
+    suggest_index.reset()
+    title_filter_index.reset()
+    leaderboard_index.reset()
@@ -0,0 +1,111 @@
+import gzip
+import re
+import zlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.cache import has_vary_header, patch_vary_headers
+
+from .cache import make_key
+
+COMPRESSORS = {
+    'gzip': lambda content, level: gzip.compress(
+        content, compresslevel=level, mtime=0
+    ),
+    'deflate': lambda content, level: zlib.compress(content, level),
+}
+CC_DELIMITER = re.compile(r'\s*,\s*')
+
+
+def negotiate_encoding(header):
+    """Лучшее из поддерживаемых сжатий по Accept-Encoding или None.
+
+    При равных весах предпочтение отдаётся порядку `COMPRESSORS`.
+    """
+    weights = {}
+    for part in header.lower().split(','):
+        name, _, params = part.partition(';')
+        try:
+            quality = float(params.strip()[2:]) if params else 1.0
+        except ValueError:
+            quality = 0.0
+        weights[name.strip()] = quality
+    best, best_quality = None, 0.0
+    for encoding in COMPRESSORS:
+        quality = weights.get(encoding, weights.get('*', 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def is_shared(response):
+    """Ответ одинаков для всех клиентов и может кешироваться сжатым.
+
+    Формы браузерного API с CSRF-токеном помечаются `Vary: Cookie`
+    и сюда не попадают.
+    """
+    return (
+        response.has_header('ETag')
+        and 'public' in CC_DELIMITER.split(response.get('Cache-Control', ''))
+        and not has_vary_header(response, 'Cookie')
+    )
+
+
+class CompressionMiddleware:
+    """Сжимает ответы gzip или deflate по Accept-Encoding клиента.
+
+    Сжимаются только типы из `COMPRESS_CONTENT_TYPES` размером от
+    `COMPRESS_MIN_SIZE` байт; потоковые и уже сжатые ответы не трогаются.
+    Публичные ответы с ETag сжимаются один раз: результат хранится в кеше
+    по ETag и кодировке, а ETag становится слабым, чтобы If-None-Match
+    по-прежнему давал 304.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if not self.is_compressible(response):
+            return response
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = negotiate_encoding(
+            request.META.get('HTTP_ACCEPT_ENCODING', '')
+        )
+        if encoding is None:
+            return response
+        content = self.compress(response, encoding)
+        if len(content) >= len(response.content):
+            return response
+        response.content = content
+        response['Content-Length'] = str(len(content))
+        response['Content-Encoding'] = encoding
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = f'W/{etag}'
+        return response
+
+    @staticmethod
+    def is_compressible(response):
+        content_type = response.get('Content-Type', '').split(';')[0]
+        return (
+            not response.streaming
+            and not response.has_header('Content-Encoding')
+            and content_type.strip() in settings.COMPRESS_CONTENT_TYPES
+            and len(response.content) >= settings.COMPRESS_MIN_SIZE
+        )
+
+    @staticmethod
+    def compress(response, encoding):
+        key = None
+        if is_shared(response):
+            key = make_key('compressed', response['ETag'], encoding)
+            content = cache.get(key)
+            if content is not None:
+                return content
+        content = COMPRESSORS[encoding](
+            response.content, settings.COMPRESS_LEVEL
+        )
+        if key is not None:
+            cache.set(key, content, timeout=settings.RESPONSE_CACHE_TIMEOUT)
+        return content
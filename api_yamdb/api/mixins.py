@@ -1,17 +1,330 @@
-from rest_framework import filters, mixins, viewsets
-from rest_framework.pagination import LimitOffsetPagination
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils.cache import (get_conditional_response, has_vary_header,
+                                patch_cache_control, patch_vary_headers)
+from django.utils.http import http_date
+from rest_framework import filters, mixins, permissions, viewsets
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
 
+from .cache import make_key, normalized_query, tag_validators
+from .pagination import CachedCountPagination
 from .permissions import IsAdminOrReadOnly
+from .querysets import build_query_plan
+from .serializers import SparseFieldsMixin
+
+
+class CacheTagsMixin:
+    """Теги кеша, от которых зависят ответы вьюсета."""
+    cache_tags = ()
+    detail_cache_tags = None
+
+    def get_cache_tags(self):
+        tags = self.cache_tags
+        if self.detail and self.detail_cache_tags is not None:
+            tags = self.detail_cache_tags
+        return [tag.format(**self.kwargs) for tag in tags]
+
+
+class EarlyResponse(Exception):
+    """Прерывает обработку запроса готовым ответом."""
+
+    def __init__(self, response):
+        super().__init__()
+        self.response = response
+
+
+class ConditionalGetMixin(CacheTagsMixin):
+    """ETag, Last-Modified и ответ 304 до обращения к БД и сериализации.
+
+    Валидаторы строятся из версий тегов вьюсета, поэтому проверка
+    If-None-Match/If-Modified-Since стоит одного запроса к таблице версий.
+    """
+    cache_max_age = 0
+    conditional_actions = ('list', 'retrieve')
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.validators = None
+        if (request.method not in ('GET', 'HEAD')
+                or self.action not in self.conditional_actions):
+            return
+        self.validators = self.get_validators(request)
+        etag, last_modified = self.validators
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is not None:
+            raise EarlyResponse(response)
+
+    def handle_exception(self, exc):
+        if isinstance(exc, EarlyResponse):
+            return exc.response
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(
+            request, response, *args, **kwargs
+        )
+        if (getattr(self, 'validators', None)
+                and response.status_code in (200, 304)):
+            etag, last_modified = self.validators
+            response['ETag'] = etag
+            if last_modified:
+                response['Last-Modified'] = http_date(last_modified)
+            self.patch_cache_headers(request, response)
+        return response
+
+    def get_validators(self, request):
+        return tag_validators(
+            self.get_cache_tags(),
+            request.path,
+            normalized_query(request),
+            request.accepted_media_type,
+        )
+
+    def patch_cache_headers(self, request, response):
+        if 'HTTP_AUTHORIZATION' in request.META:
+            patch_cache_control(response, private=True,
+                                max_age=self.cache_max_age)
+        else:
+            patch_cache_control(response, public=True,
+                                max_age=self.cache_max_age)
+        patch_vary_headers(response, ('Accept', 'Authorization'))
+
+
+class ResponseCacheMixin(ConditionalGetMixin):
+    """Кеш готовых ответов на анонимные GET-запросы.
+
+    Ключ строится из ETag, то есть из адреса, нормализованной строки
+    запроса и версий тегов: запись в связанные модели меняет ключ,
+    а старые ответы просто истекают.
+    """
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.response_cache_key = None
+        if self.validators is None or not request.user.is_anonymous:
+            return
+        etag, _ = self.validators
+        self.response_cache_key = make_key('response', etag)
+        cached = cache.get(self.response_cache_key)
+        if cached is not None:
+            content, content_type = cached
+            raise EarlyResponse(
+                HttpResponse(content, content_type=content_type)
+            )
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(
+            request, response, *args, **kwargs
+        )
+        key = getattr(self, 'response_cache_key', None)
+        if (key and response.status_code == 200
+                and hasattr(response, 'add_post_render_callback')):
+            response.add_post_render_callback(
+                lambda rendered: self.cache_response(key, request, rendered)
+            )
+        return response
+
+    def cache_response(self, key, request, response):
+        """Кеширует ответ, если он не зависит от cookie клиента.
+
+        Формы браузерного API содержат CSRF-токен клиента; `Vary: Cookie`
+        к ним добавят middleware уже после рендеринга, поэтому проверяется
+        сам факт обращения к токену или сессии.
+        """
+        session = getattr(request, 'session', None)
+        if (request.META.get('CSRF_COOKIE_USED')
+                or (session is not None and session.accessed)
+                or has_vary_header(response, 'Cookie')):
+            return
+        cache.set(
+            key,
+            (response.content, response['Content-Type']),
+            timeout=settings.RESPONSE_CACHE_TIMEOUT,
+        )
+
+
+class SparseFieldsViewMixin:
+    """Передаёт сериализатору поля из `?fields=` и `?omit=` GET-запроса."""
+    fields_query_param = 'fields'
+    omit_query_param = 'omit'
+
+    def get_sparse_fields(self):
+        request = getattr(self, 'request', None)
+        if request is None or request.method not in permissions.SAFE_METHODS:
+            return None, frozenset()
+        fields, omit = (
+            request.query_params.get(name)
+            for name in (self.fields_query_param, self.omit_query_param)
+        )
+        return (
+            None if fields is None else split_names(fields),
+            frozenset() if omit is None else split_names(omit),
+        )
+
+    def get_serializer(self, *args, **kwargs):
+        if issubclass(self.get_serializer_class(), SparseFieldsMixin):
+            kwargs['fields'], kwargs['omit'] = self.get_sparse_fields()
+        return super().get_serializer(*args, **kwargs)
+
+
+def split_names(value):
+    return frozenset(filter(None, (name.strip() for name in value.split(','))))
+
+
+class QueryPlanMixin(SparseFieldsViewMixin):
+    """Подгружает связи по дереву полей сериализатора одним планом."""
+
+    def filter_queryset(self, queryset):
+        return self.plan_queryset(super().filter_queryset(queryset))
+
+    def plan_queryset(self, queryset):
+        serializer_class = self.get_serializer_class()
+        fields, omit = self.get_sparse_fields()
+        if not issubclass(serializer_class, SparseFieldsMixin):
+            fields, omit = None, frozenset()
+        plan = build_query_plan(serializer_class, fields, omit)
+        if plan.annotate:
+            queryset = queryset.annotate(**dict(plan.annotate))
+        if plan.select_related:
+            queryset = queryset.select_related(*plan.select_related)
+        if plan.prefetch_related and not self.defers_prefetch(
+                serializer_class):
+            queryset = queryset.prefetch_related(*plan.prefetch_related)
+        if self.request.method in permissions.SAFE_METHODS:
+            queryset = queryset.only(*plan.only, *(
+                field.lstrip('-')
+                for field in getattr(self, 'keyset_ordering', ())
+            ))
+        return queryset
+
+    def defers_prefetch(self, serializer_class):
+        """Список сам подгружает связи только для нужных объектов."""
+        list_serializer_class = getattr(
+            serializer_class.Meta, 'list_serializer_class', None
+        )
+        fields, omit = self.get_sparse_fields()
+        return not self.detail and fields is None and not omit and getattr(
+            list_serializer_class, 'defer_prefetch', False
+        )
+
+
+class MultiGetMixin:
+    """Несколько объектов по списку id в одном ответе.
+
+    `?ids=1,5,9` в запросе списка отдаёт объекты в порядке запроса одним
+    запросом `id__in` с подгрузкой связей, отсутствующие id перечисляются
+    в `missing`.
+    """
+    ids_query_param = 'ids'
+    invalid_ids_message = 'Ожидается список id через запятую.'
+
+    def list(self, request, *args, **kwargs):
+        if self.ids_query_param not in request.query_params:
+            return super().list(request, *args, **kwargs)
+        ids = self.get_requested_ids(request)
+        found = self.filter_queryset(self.get_queryset()).in_bulk(ids)
+        serializer = self.get_serializer(
+            [found[pk] for pk in ids if pk in found], many=True
+        )
+        return Response({
+            'results': serializer.data,
+            'missing': [pk for pk in ids if pk not in found],
+        })
+
+    def get_requested_ids(self, request):
+        try:
+            ids = [
+                int(value) for value in
+                request.query_params[self.ids_query_param].split(',')
+                if value.strip()
+            ]
+        except ValueError:
+            raise ValidationError({self.ids_query_param: (
+                self.invalid_ids_message
+            )})
+        ids = list(dict.fromkeys(ids))
+        if not ids or len(ids) > settings.MULTI_GET_MAX_IDS:
+            raise ValidationError({self.ids_query_param: (
+                f'Укажите от 1 до {settings.MULTI_GET_MAX_IDS} id.'
+            )})
+        return ids
+
+
+class NestedRouteMixin:
+    """Объекты вложенного маршрута `titles/{title_id}/reviews/...`.
+
+    Вся цепочка родителей из адреса проверяется одним запросом
+    к `parent_model` по `parent_lookups`, результат запоминается до конца
+    запроса. Сам запрос вьюсета фильтруется по `nested_lookups` напрямую,
+    без загрузки родителя; для одного объекта цепочку проверяет этот же
+    запрос.
+    """
+    parent_model = None
+    parent_lookups = ()
+    parent_fields = ()
+    nested_lookups = ()
+
+    def get_parent(self):
+        """Поля родителя из `parent_fields`; 404, если цепочки нет."""
+        if getattr(self, '_parent', None) is None:
+            self._parent = get_object_or_404(
+                self.parent_model.objects.values('pk', *self.parent_fields),
+                **self.get_lookups(self.parent_lookups)
+            )
+        return self._parent
+
+    def get_lookups(self, lookups):
+        return {lookup: self.kwargs[kwarg] for kwarg, lookup in lookups}
+
+    def get_queryset(self):
+        if not self.detail:
+            self.get_parent()
+        return super().get_queryset().filter(
+            **self.get_lookups(self.nested_lookups)
+        )
+
+
+class FastReadMixin:
+    """Списки через `fast_reader_class` в обход полей сериализатора.
+
+    Читатель строит тот же ответ из `values_list()`; при `?fields=`
+    и `?omit=` список отдаётся обычным сериализатором.
+    """
+    fast_reader_class = None
+
+    def get_fast_reader(self):
+        fields, omit = self.get_sparse_fields()
+        if self.fast_reader_class is None or fields is not None or omit:
+            return None
+        return self.fast_reader_class()
+
+    def list(self, request, *args, **kwargs):
+        reader = self.get_fast_reader()
+        if reader is None:
+            return super().list(request, *args, **kwargs)
+        queryset = reader.rows(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(reader.represent(page))
+        return Response(reader.represent(queryset))
 
 
 class ListCreateDeleteViewSet(
+    ResponseCacheMixin,
+    SparseFieldsViewMixin,
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
     mixins.DestroyModelMixin,
     viewsets.GenericViewSet,
 ):
     permission_classes = (IsAdminOrReadOnly,)
-    pagination_class = LimitOffsetPagination
+    pagination_class = CachedCountPagination
     filter_backends = (filters.SearchFilter,)
     search_fields = ('name',)
     lookup_field = 'slug'
+    cache_max_age = 60 * 60
@@ -0,0 +1,200 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as BinasciiError
+from collections import OrderedDict
+from functools import reduce
+from operator import or_
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from .cache import get_tag_versions, make_key, normalized_query
+
+
+class KeysetPagination(LimitOffsetPagination):
+    """Пагинация limit/offset с переключением на курсор по ключу.
+
+    Запрос с параметром `cursor` (в том числе пустым) получает страницу,
+    отобранную условием на поля `keyset_ordering` вьюсета, без COUNT(*)
+    и OFFSET. Порядок в этом режиме задаётся только `keyset_ordering`,
+    поэтому параметр `ordering` вместе с курсором отклоняется.
+    """
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Неверный курсор.'
+    cursor_ordering_message = 'Сортировка недоступна при выборке по курсору.'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = self.cursor_query_param in request.query_params
+        if not self.keyset:
+            return super().paginate_queryset(queryset, request, view)
+        if request.query_params.get(api_settings.ORDERING_PARAM):
+            raise ValidationError(
+                {api_settings.ORDERING_PARAM: [self.cursor_ordering_message]}
+            )
+        self.request = request
+        self.limit = self.get_limit(request)
+        self.ordering = getattr(view, 'keyset_ordering', ('pk',))
+        reverse, position = self.decode_cursor(request)
+        if reverse:
+            ordering = [self.flip(field) for field in self.ordering]
+        else:
+            ordering = list(self.ordering)
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(self.after(ordering, position))
+        page = list(queryset[:self.limit + 1])
+        has_more = len(page) > self.limit
+        page = page[:self.limit]
+        if reverse:
+            page.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = position is not None
+        self.page = page
+        return page
+
+    @staticmethod
+    def flip(field):
+        return field[1:] if field.startswith('-') else f'-{field}'
+
+    @staticmethod
+    def after(ordering, position):
+        """Условие «строго после позиции» для заданного порядка полей."""
+        conditions = []
+        for index, field in enumerate(ordering):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            equal = {
+                previous.lstrip('-'): value
+                for previous, value in zip(ordering[:index], position)
+            }
+            conditions.append(
+                Q(**equal, **{f'{name}__{lookup}': position[index]})
+            )
+        return reduce(or_, conditions)
+
+    def get_position(self, item):
+        return [
+            item[field.lstrip('-')] if isinstance(item, dict)
+            else getattr(item, field.lstrip('-'))
+            for field in self.ordering
+        ]
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return False, None
+        try:
+            cursor = json.loads(urlsafe_b64decode(encoded.encode('ascii')))
+            position = cursor['p']
+            reverse = bool(cursor.get('r'))
+        except (BinasciiError, KeyError, TypeError, UnicodeError,
+                ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list) or (
+                len(position) != len(self.ordering)):
+            raise NotFound(self.invalid_cursor_message)
+        return reverse, position
+
+    def encode_cursor(self, position, reverse):
+        cursor = {'p': position, 'r': int(reverse)}
+        encoded = urlsafe_b64encode(
+            json.dumps(cursor, default=str).encode()
+        ).decode('ascii')
+        url = remove_query_param(
+            self.request.build_absolute_uri(), self.offset_query_param
+        )
+        return replace_query_param(url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.keyset:
+            return super().get_next_link()
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.get_position(self.page[-1]), False)
+
+    def get_previous_link(self):
+        if not self.keyset:
+            return super().get_previous_link()
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.get_position(self.page[0]), True)
+
+    def get_paginated_response(self, data):
+        if not self.keyset:
+            return super().get_paginated_response(data)
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data)
+        ]))
+
+
+class CachedCountPagination(KeysetPagination):
+    """Пагинация с кешированным количеством объектов.
+
+    Точное количество хранится по ключу из адреса, набора фильтров и версий
+    тегов вьюсета. Параметр `count=estimate` допускает последнее известное
+    значение, `count=none` не считает объекты вовсе. Если вьюсет знает
+    количество сам (`get_known_count`), запрос к БД не выполняется.
+    """
+    count_query_param = 'count'
+    count_modes = ('exact', 'estimate', 'none')
+    page_query_params = ('limit', 'offset', 'cursor', 'count', 'ordering')
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request, self.view = request, view
+        self.count_mode = request.query_params.get(
+            self.count_query_param, 'exact'
+        )
+        if self.count_mode not in self.count_modes:
+            self.count_mode = 'exact'
+        if (self.count_mode != 'none'
+                or self.cursor_query_param in request.query_params):
+            return super().paginate_queryset(queryset, request, view)
+        self.keyset = False
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None
+        self.offset = self.get_offset(request)
+        page = list(queryset[self.offset:self.offset + self.limit + 1])
+        self.count = self.offset + len(page)
+        return page[:self.limit]
+
+    def get_count(self, queryset):
+        filters = normalized_query(self.request, self.page_query_params)
+        if not filters and hasattr(self.view, 'get_known_count'):
+            count = self.view.get_known_count()
+            if count is not None:
+                return count
+        estimate_key = make_key('count-estimate', self.request.path, filters)
+        if self.count_mode == 'estimate':
+            count = cache.get(estimate_key)
+            if count is not None:
+                return count
+        tags = self.view.get_cache_tags() if self.view else ()
+        key = make_key(
+            'count', self.request.path, filters,
+            sorted(get_tag_versions(tags).items())
+        )
+        count = cache.get(key)
+        if count is None:
+            count = super().get_count(queryset)
+            cache.set_many(
+                {key: count, estimate_key: count},
+                timeout=settings.COUNT_CACHE_TIMEOUT
+            )
+        return count
+
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        if not self.keyset and self.count_mode == 'none':
+            response.data['count'] = None
+        return response
@@ -0,0 +1,33 @@
+import codecs
+import json
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.utils.json import strict_constant
+
+from .renderers import FastJSONRenderer, orjson
+
+
+def loads(content):
+    """Разбор JSON из байтов; NaN и Infinity, как и в DRF, запрещены."""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content, parse_constant=strict_constant)
+
+
+class FastJSONParser(JSONParser):
+    """`JSONParser`, разбирающий тело запроса из байтов без потокового
+    декодера."""
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        try:
+            content = stream.read()
+            if codecs.lookup(encoding).name != 'utf-8':
+                content = content.decode(encoding)
+            return loads(content)
+        except ValueError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
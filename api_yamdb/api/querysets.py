@@ -0,0 +1,81 @@
+from collections import namedtuple
+from functools import lru_cache
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+
+QueryPlan = namedtuple(
+    'QueryPlan', ('select_related', 'prefetch_related', 'only', 'annotate')
+)
+
+
+def _nested_plan(field, path):
+    """План для вложенного сериализатора или связанного поля."""
+    if (isinstance(field, serializers.ListSerializer)
+            and isinstance(field.child, serializers.ModelSerializer)):
+        child = _collect(field.child)
+        queryset = field.child.Meta.model.objects.only(*child.only)
+        if child.select_related:
+            queryset = queryset.select_related(*child.select_related)
+        return QueryPlan([], [Prefetch(path, queryset=queryset)], [], [])
+    if isinstance(field, serializers.ModelSerializer):
+        child = _collect(field, prefix=f'{path}__')
+        return QueryPlan([path, *child.select_related],
+                         child.prefetch_related,
+                         [path, *child.only], [])
+    if isinstance(field, serializers.ManyRelatedField):
+        return QueryPlan([], [path], [], [])
+    if isinstance(field, serializers.PrimaryKeyRelatedField):
+        return QueryPlan([], [], [path], [])
+    if isinstance(field, serializers.SlugRelatedField):
+        return QueryPlan(
+            [path], [], [path, f'{path}__{field.slug_field}'], []
+        )
+    return QueryPlan([path], [], [path], [])
+
+
+def _collect(serializer, prefix=''):
+    """Обходит поля сериализатора и собирает связи и колонки для запроса."""
+    model = serializer.Meta.model
+    annotations = getattr(serializer.Meta, 'annotations', {})
+    plan = QueryPlan([], [], [f'{prefix}{model._meta.pk.name}'], [])
+    plan.only.extend(
+        f'{prefix}{name}'
+        for name in getattr(serializer.Meta, 'required_fields', ())
+    )
+    for field in serializer.fields.values():
+        if field.write_only or field.source == '*':
+            continue
+        if not prefix and field.source in annotations:
+            plan.annotate.append(
+                (field.source, annotations[field.source]())
+            )
+            continue
+        try:
+            model_field = model._meta.get_field(field.source)
+        except FieldDoesNotExist:
+            continue
+        path = f'{prefix}{field.source}'
+        if isinstance(field, (serializers.BaseSerializer,
+                              serializers.RelatedField,
+                              serializers.ManyRelatedField)):
+            for part, extra in zip(plan, _nested_plan(field, path)):
+                part.extend(extra)
+        elif model_field.concrete:
+            plan.only.append(path)
+    return plan
+
+
+@lru_cache(maxsize=256)
+def build_query_plan(serializer_class, fields=None, omit=frozenset()):
+    """План select_related/prefetch_related/only/annotate для сериализатора.
+
+    `fields` и `omit` сужают план так же, как набор полей ответа.
+    """
+    kwargs = {'fields': fields, 'omit': omit} if fields or omit else {}
+    plan = _collect(serializer_class(**kwargs))
+    return QueryPlan(
+        *(tuple(dict.fromkeys(part)) for part in plan[:3]),
+        tuple(plan.annotate),
+    )
@@ -0,0 +1,111 @@
+from rest_framework import serializers
+
+from reviews.models import GenreTitle
+
+
+def as_int(value):
+    return None if value is None else int(value)
+
+
+class ValuesReader:
+    """Представления объектов из строк `values_list()` без полей DRF.
+
+    `columns` - пары (ключ ответа, путь в запросе) в порядке полей
+    сериализатора, `converters` - преобразования значений по ключу.
+    Результат совпадает с выводом соответствующего сериализатора.
+    """
+    columns = ()
+    converters = {}
+
+    def __init__(self):
+        self.keys = tuple(key for key, _ in self.columns)
+        self.paths = tuple(path for _, path in self.columns)
+        self.conversions = tuple(
+            (index, self.converters[key])
+            for index, key in enumerate(self.keys)
+            if key in self.converters
+        )
+
+    def rows(self, queryset):
+        """Запрос строк вместо объектов модели."""
+        return queryset.prefetch_related(None).values_list(
+            *self.paths, named=True
+        )
+
+    def represent(self, rows):
+        keys, conversions = self.keys, self.conversions
+        items = []
+        for row in rows:
+            values = list(row)
+            for index, convert in conversions:
+                values[index] = convert(values[index])
+            items.append(dict(zip(keys, values)))
+        return items
+
+
+class ReviewReader(ValuesReader):
+    """Отзывы в формате `ReviewSerializer`."""
+    columns = (
+        ('id', 'id'),
+        ('title', 'title__name'),
+        ('author', 'author__username'),
+        ('text', 'text'),
+        ('pub_date', 'pub_date'),
+        ('score', 'score'),
+        ('comment_count', 'comment_count'),
+        ('last_comment_at', 'last_comment_at'),
+    )
+    converters = {
+        'pub_date': serializers.DateTimeField().to_representation,
+        'last_comment_at': serializers.DateTimeField().to_representation,
+    }
+
+
+class CommentReader(ValuesReader):
+    """Комментарии в формате `CommentSerializer`."""
+    columns = (
+        ('id', 'id'),
+        ('author', 'author__username'),
+        ('text', 'text'),
+        ('pub_date', 'pub_date'),
+        ('review', 'review_id'),
+    )
+    converters = {
+        'pub_date': serializers.DateTimeField().to_representation,
+    }
+
+
+class TitleReader(ValuesReader):
+    """Произведения в формате `TitleReadSerializer`.
+
+    Жанры всех произведений страницы загружаются одним запросом.
+    """
+    columns = (
+        ('id', 'id'),
+        ('name', 'name'),
+        ('year', 'year'),
+        ('rating', 'rating'),
+        ('review_count', 'rating_count'),
+        ('description', 'description'),
+        ('category_name', 'category__name'),
+        ('category_slug', 'category__slug'),
+    )
+    converters = {'rating': as_int}
+
+    def represent(self, rows):
+        items = super().represent(rows)
+        genres = {}
+        for title_id, name, slug in GenreTitle.objects.filter(
+                title_id__in=[item['id'] for item in items]
+        ).order_by('genre__name').values_list(
+                'title_id', 'genre__name', 'genre__slug'):
+            genres.setdefault(title_id, []).append(
+                {'name': name, 'slug': slug}
+            )
+        for item in items:
+            name, slug = item.pop('category_name'), item.pop('category_slug')
+            item['genre'] = genres.get(item['id'], [])
+            item['category'] = None if slug is None else {
+                'name': name, 'slug': slug
+            }
+        return items
@@ -0,0 +1,84 @@
+import datetime
+import decimal
+import json
+import uuid
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+ORJSON_OPTIONS = (
+    orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+    if orjson is not None else 0
+)
+LINE_SEPARATORS = (
+    ('\u2028'.encode(), b'\\u2028'),
+    ('\u2029'.encode(), b'\\u2029'),
+)
+
+
+def datetime_to_json(value):
+    representation = value.isoformat()
+    if representation.endswith('+00:00'):
+        representation = representation[:-6] + 'Z'
+    return representation
+
+
+CONVERTERS = {
+    datetime.datetime: datetime_to_json,
+    datetime.date: datetime.date.isoformat,
+    decimal.Decimal: float,
+    uuid.UUID: str,
+}
+
+drf_default = encoders.JSONEncoder().default
+
+
+def default(obj):
+    """Типы, которых нет в JSON, в том же виде, что и у `JSONEncoder` DRF.
+
+    Частые типы (`pub_date` и т. п.) разбираются по словарю, без цепочки
+    `isinstance`; остальное отдаётся кодировщику DRF.
+    """
+    convert = CONVERTERS.get(type(obj))
+    if convert is not None:
+        return convert(obj)
+    return drf_default(obj)
+
+
+stdlib_encoder = json.JSONEncoder(
+    ensure_ascii=False, allow_nan=False, separators=(',', ':'),
+    default=default,
+)
+
+
+def dumps(data):
+    """Компактный JSON в байтах, совпадающий с выводом `JSONRenderer`.
+
+    Используется `orjson`, если он установлен, иначе стандартный `json`.
+    """
+    if orjson is not None:
+        content = orjson.dumps(data, default=default, option=ORJSON_OPTIONS)
+    else:
+        content = stdlib_encoder.encode(data).encode()
+    for separator, escaped in LINE_SEPARATORS:
+        if separator in content:
+            content = content.replace(separator, escaped)
+    return content
+
+
+class FastJSONRenderer(JSONRenderer):
+    """`JSONRenderer` на `dumps`; форматированный вывод остаётся за DRF."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(
+                data, accepted_media_type, renderer_context
+            )
+        return dumps(data)
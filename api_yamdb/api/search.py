@@ -0,0 +1,49 @@
+import re
+from functools import reduce
+from operator import and_
+
+from django.db import connection
+from django.db.models import FloatField, Q
+from django.db.models.expressions import RawSQL
+
+WORD_PATTERN = re.compile(r'\w+')
+
+MATCH_SQL = (
+    'SELECT rowid FROM reviews_title_fts WHERE reviews_title_fts MATCH %s'
+)
+RANK_SQL = (
+    'SELECT bm25(reviews_title_fts, 10.0, 1.0) FROM reviews_title_fts '
+    'WHERE reviews_title_fts MATCH %s AND rowid = "reviews_title"."id"'
+)
+
+
+def normalize_text(text):
+    """Нижний регистр и `е` вместо `ё`, как в поисковых индексах."""
+    return text.replace('ё', 'е').replace('Ё', 'Е').lower()
+
+
+def search_words(text):
+    """Слова запроса в том же виде, в каком они лежат в индексе."""
+    return WORD_PATTERN.findall(normalize_text(text))
+
+
+def search_titles(queryset, text):
+    """Произведения, найденные по названию и описанию, по релевантности.
+
+    На SQLite используется индекс FTS5 с ранжированием BM25 и поиском по
+    префиксу слов, на остальных СУБД - icontains по тем же словам.
+    Совпадения отбираются подзапросом без ограничения числа, поэтому
+    фильтры и пагинация применяются ко всем найденным произведениям.
+    """
+    words = search_words(text)
+    if not words:
+        return queryset.none()
+    if connection.vendor != 'sqlite':
+        return queryset.filter(reduce(and_, (
+            Q(name__icontains=word) | Q(description__icontains=word)
+            for word in words
+        )))
+    match = ' '.join(f'"{word}"*' for word in words)
+    return queryset.filter(pk__in=RawSQL(MATCH_SQL, [match])).alias(
+        search_rank=RawSQL(RANK_SQL, [match], output_field=FloatField())
+    ).order_by('search_rank', 'name')
@@ -1,15 +1,97 @@
 from django.conf import settings
-from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
 from django.db.models import UniqueConstraint
+from django.db.models.functions import Substr
 from django.utils import timezone
 from rest_framework import serializers
+from rest_framework.settings import api_settings
 from rest_framework.validators import UniqueValidator
 
+from .cards import TitleCardListSerializer, get_title_cards
 from .validators import validate_regex_username, validate_username
 from reviews.models import Category, Comment, Genre, Review, Title, User
 
 
-class CategorySerializer(serializers.ModelSerializer):
+def unique_error_message(model_field):
+    """Сообщение о неуникальном значении, как у полей ModelSerializer."""
+    return model_field.error_messages['unique'] % {
+        'model_name': model_field.model._meta.verbose_name,
+        'field_label': model_field.verbose_name,
+    }
+
+
+class UniqueConstraintMixin:
+    """Уникальность при записи проверяет сама БД.
+
+    IntegrityError превращается в ту же ошибку валидации, что дал бы
+    предварительный запрос: `unique_errors` - пары (поле или имя
+    `UniqueConstraint` модели, сообщение). Поле ищется в тексте ошибки БД,
+    сообщение None означает сообщение поля модели. Нарушение ограничения
+    узнаётся по его имени или по всем его столбцам в тексте ошибки и
+    становится ошибкой вне полей. Прочие ошибки БД не перехватываются.
+    """
+    unique_errors = ()
+
+    def save(self, **kwargs):
+        try:
+            with transaction.atomic():
+                return super().save(**kwargs)
+        except IntegrityError as error:
+            raise serializers.ValidationError(self.get_unique_errors(error))
+
+    def get_unique_errors(self, error):
+        text = str(error)
+        opts = self.Meta.model._meta
+        constraints = {
+            constraint.name: constraint for constraint in opts.constraints
+        }
+        for name, message in self.unique_errors:
+            constraint = constraints.get(name)
+            if constraint is not None and violates(constraint, opts, text):
+                return {api_settings.NON_FIELD_ERRORS_KEY: [message]}
+            if constraint is None and name in text:
+                return {name: [
+                    message or unique_error_message(opts.get_field(name))
+                ]}
+        raise error
+
+
+def violates(constraint, opts, text):
+    """Относится ли текст ошибки БД к ограничению уникальности."""
+    return constraint.name in text or all(
+        opts.get_field(name).column in text for name in constraint.fields
+    )
+
+
+class SparseFieldsMixin:
+    """Набор полей ответа по параметрам `fields` и `omit`.
+
+    Поля из `Meta.optional_fields` выводятся, только если явно перечислены
+    в `fields`.
+    """
+
+    def __init__(self, *args, fields=None, omit=frozenset(), **kwargs):
+        super().__init__(*args, **kwargs)
+        self.only_fields, self.omit_fields = fields, omit
+
+    @property
+    def is_sparse(self):
+        return self.only_fields is not None or bool(self.omit_fields)
+
+    def get_fields(self):
+        fields = super().get_fields()
+        optional = getattr(self.Meta, 'optional_fields', ())
+        for name in list(fields):
+            if self.only_fields is not None:
+                keep = name in self.only_fields
+            else:
+                keep = name not in optional
+            if not keep or name in self.omit_fields:
+                del fields[name]
+        return fields
+
+
+class CategorySerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Сериалайзер для категории."""
 
     class Meta:
@@ -18,7 +100,7 @@ class CategorySerializer(serializers.ModelSerializer):
         model = Category
 
 
-class GenreSerializer(serializers.ModelSerializer):
+class GenreSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Сериалайзер для жанров."""
 
     class Meta:
@@ -27,12 +109,15 @@ class GenreSerializer(serializers.ModelSerializer):
         model = Genre
 
 
-class TitleReadSerializer(serializers.ModelSerializer):
+class TitleReadSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Сериализатор объектов класса Title при GET-запросе."""
 
     genre = GenreSerializer(read_only=True, many=True)
     category = CategorySerializer(read_only=True)
     rating = serializers.IntegerField(read_only=True)
+    review_count = serializers.IntegerField(
+        source='rating_count', read_only=True
+    )
 
     class Meta:
         fields = (
@@ -40,12 +125,23 @@ class TitleReadSerializer(serializers.ModelSerializer):
             'name',
             'year',
             'rating',
+            'review_count',
             'description',
             'genre',
             'category'
         )
         model = Title
         read_only_fields = ('__all__', )
+        list_serializer_class = TitleCardListSerializer
+        required_fields = ('version', )
+
+    def render_card(self, instance):
+        return super().to_representation(instance)
+
+    def to_representation(self, instance):
+        if self.is_sparse:
+            return self.render_card(instance)
+        return get_title_cards([instance], self.render_card)[0]
 
 
 class TitleWriteSerializer(TitleReadSerializer):
@@ -66,10 +162,45 @@ class TitleWriteSerializer(TitleReadSerializer):
         return data
 
     def to_representation(self, instance):
-        return TitleReadSerializer(instance).data
+        return TitleReadSerializer(context=self.context).render_card(
+            instance
+        )
 
 
-class AdminSerializer(serializers.ModelSerializer):
+class TitleBulkItemSerializer(TitleWriteSerializer):
+    """Элемент пакетной записи произведений.
+
+    Жанры и категории проверяются по словарям slug -> pk из контекста,
+    загруженным один раз на весь пакет.
+    """
+
+    id = serializers.IntegerField(required=False, min_value=1)
+    genre = serializers.ListField(child=serializers.SlugField(),
+                                  allow_empty=False)
+    category = serializers.SlugField()
+
+    class Meta(TitleReadSerializer.Meta):
+        fields = ('id', 'name', 'year', 'description', 'genre', 'category')
+
+    def validate_genre(self, slugs):
+        genres = self.context['genres']
+        missing = [slug for slug in slugs if slug not in genres]
+        if missing:
+            raise serializers.ValidationError(
+                f'Жанры не найдены: {", ".join(missing)}.'
+            )
+        return [genres[slug] for slug in dict.fromkeys(slugs)]
+
+    def validate_category(self, slug):
+        if slug not in self.context['categories']:
+            raise serializers.ValidationError(
+                f'Категория не найдена: {slug}.'
+            )
+        return self.context['categories'][slug]
+
+
+class AdminSerializer(UniqueConstraintMixin, SparseFieldsMixin,
+                      serializers.ModelSerializer):
     """Сериалайзер для админа: Все поля редактируемы."""
     username = serializers.CharField(
         max_length=settings.USERNAME_MAX_LENGHT,
@@ -77,11 +208,14 @@ class AdminSerializer(serializers.ModelSerializer):
         validators=[
             validate_regex_username,
             validate_username,
-            UniqueValidator(queryset=User.objects.all())
         ])
     email = serializers.EmailField(
         required=True,
-        max_length=settings.EMAIL_MAX_LENGHT),
+        max_length=settings.EMAIL_MAX_LENGHT)
+    unique_errors = (
+        ('username', UniqueValidator.message),
+        ('email', None),
+    )
 
     class Meta:
         model = User
@@ -140,7 +274,7 @@ class RegistrationSerializer(serializers.Serializer):
         )
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Сериалайзер для комментов."""
     author = serializers.SlugRelatedField(
         slug_field='username',
@@ -154,7 +288,8 @@ class CommentSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'author', 'review', 'pub_date']
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(UniqueConstraintMixin, SparseFieldsMixin,
+                       serializers.ModelSerializer):
     """Сериалайзер для отзывов."""
     title = serializers.SlugRelatedField(
         slug_field='name',
@@ -167,22 +302,18 @@ class ReviewSerializer(serializers.ModelSerializer):
         queryset=User.objects.all(),
         default=None
     )
+    text_preview = serializers.CharField(read_only=True)
+    unique_errors = (
+        ('unique_author_review', 'Вы уже оставили отзыв на это произведение.'),
+    )
 
     class Meta:
         model = Review
         fields = '__all__'
         read_only_fields = ['id', 'author', 'title', 'pub_date']
-
-    def validate(self, data):
-        request = self.context.get('request')
-        if request.method == 'POST':
-            if request and hasattr(request, 'user'):
-                user = request.user
-            if Review.objects.filter(
-                author=user,
-                title=self.context.get('view').kwargs.get('title_id')
-            ).exists():
-                raise ValidationError(
-                    {'Вы уже оставили отзыв на это произведение.'}
-                )
-        return data
+        optional_fields = ('text_preview',)
+        annotations = {
+            'text_preview': lambda: Substr(
+                'text', 1, settings.TEXT_PREVIEW_LENGTH
+            ),
+        }
@@ -0,0 +1,254 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import Signal, receiver
+
+from .cache import bump_tags
+from .events import notifier
+from .indexes import leaderboard_index, suggest_index, title_filter_index
+from reviews.models import (Category, ChangeLog, Comment, Genre, GenreTitle,
+                            Review, Title, User)
+
+# Пакетная запись произведений в обход post_save и m2m_changed;
+# аргументы: titles - сохранённые произведения, genre_links - созданные
+# пары (title_id, genre_id).
+titles_bulk_saved = Signal()
+
+
+@receiver(post_save, sender=Title)
+@receiver(post_delete, sender=Title)
+def bump_titles(sender, instance, **kwargs):
+    bump_tags(
+        'titles', f'title:{instance.pk}', f'reviews:{instance.pk}'
+    )
+
+
+@receiver(post_save, sender=GenreTitle)
+@receiver(post_delete, sender=GenreTitle)
+def bump_genre_titles(sender, instance, **kwargs):
+    bump_tags('titles', f'title:{instance.title_id}')
+
+
+@receiver(m2m_changed, sender=GenreTitle)
+def bump_titles_genres(sender, instance, action, reverse, pk_set, **kwargs):
+    if not action.startswith('post_'):
+        return
+    if reverse:
+        title_ids = pk_set or ()
+    else:
+        title_ids = (instance.pk,)
+    bump_tags(
+        'titles', *(f'title:{title_id}' for title_id in title_ids)
+    )
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def bump_categories(sender, **kwargs):
+    bump_tags('categories', 'titles')
+
+
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+def bump_genres(sender, **kwargs):
+    bump_tags('genres', 'titles')
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def bump_reviews(sender, instance, **kwargs):
+    bump_tags(
+        'titles',
+        f'title:{instance.title_id}',
+        f'reviews:{instance.title_id}',
+    )
+
+
+def comment_title_id(comment):
+    """id произведения комментария; запрашивается один раз на объект."""
+    if not hasattr(comment, '_title_id'):
+        comment._title_id = Review.objects.filter(
+            pk=comment.review_id
+        ).values_list('title_id', flat=True).first()
+    return comment._title_id
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def bump_comments(sender, instance, **kwargs):
+    bump_tags(
+        f'comments:{instance.review_id}',
+        f'reviews:{comment_title_id(instance)}',
+    )
+
+
+def event_operation(signal, created):
+    if signal is post_delete:
+        return ChangeLog.DELETE
+    return ChangeLog.CREATE if created else ChangeLog.UPDATE
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def publish_review_event(sender, instance, signal, created=False, **kwargs):
+    event = {
+        'type': 'review',
+        'op': event_operation(signal, created),
+        'id': instance.pk,
+        'title': instance.title_id,
+    }
+    transaction.on_commit(lambda: notifier.send(event))
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def publish_comment_event(sender, instance, signal, created=False,
+                          **kwargs):
+    event = {
+        'type': 'comment',
+        'op': event_operation(signal, created),
+        'id': instance.pk,
+        'review': instance.review_id,
+        'title': comment_title_id(instance),
+    }
+    transaction.on_commit(lambda: notifier.send(event))
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def bump_users(sender, **kwargs):
+    if kwargs.get('created'):
+        bump_tags('users')
+    else:
+        bump_tags('users', 'authors')
+
+
+@receiver(post_save, sender=Title)
+@receiver(post_save, sender=Genre)
+@receiver(post_save, sender=Category)
+def update_suggestions(sender, instance, **kwargs):
+    transaction.on_commit(lambda: suggest_index.update(instance))
+
+
+@receiver(post_delete, sender=Title)
+@receiver(post_delete, sender=Genre)
+@receiver(post_delete, sender=Category)
+def remove_suggestions(sender, instance, **kwargs):
+    transaction.on_commit(lambda: suggest_index.remove(instance))
+
+
+@receiver(post_save, sender=Title)
+def index_title(sender, instance, **kwargs):
+    transaction.on_commit(lambda: title_filter_index.set_title(instance))
+
+
+@receiver(post_delete, sender=Title)
+def unindex_title(sender, instance, **kwargs):
+    transaction.on_commit(
+        lambda: title_filter_index.remove_title(instance.pk)
+    )
+
+
+@receiver(post_save, sender=GenreTitle)
+def index_genre_title(sender, instance, **kwargs):
+    transaction.on_commit(lambda: title_filter_index.add_genres(
+        [instance.title_id], [instance.genre_id]
+    ))
+
+
+@receiver(post_delete, sender=GenreTitle)
+def unindex_genre_title(sender, instance, **kwargs):
+    transaction.on_commit(lambda: title_filter_index.remove_genres(
+        [instance.title_id], [instance.genre_id]
+    ))
+
+
+@receiver(m2m_changed, sender=GenreTitle)
+def index_titles_genres(sender, instance, action, reverse, pk_set,
+                        **kwargs):
+    if action == 'post_clear' or (reverse and action == 'pre_clear'):
+        transaction.on_commit(title_filter_index.reset)
+        return
+    if action not in ('post_add', 'post_remove'):
+        return
+    if reverse:
+        title_ids, genre_ids = pk_set, [instance.pk]
+    else:
+        title_ids, genre_ids = [instance.pk], pk_set
+    if action == 'post_add':
+        update = title_filter_index.add_genres
+    else:
+        update = title_filter_index.remove_genres
+    transaction.on_commit(lambda: update(list(title_ids), list(genre_ids)))
+
+
+@receiver(post_save, sender=Genre)
+def index_genre(sender, instance, **kwargs):
+    transaction.on_commit(lambda: title_filter_index.set_genre(instance))
+
+
+@receiver(post_delete, sender=Genre)
+def unindex_genre(sender, instance, **kwargs):
+    transaction.on_commit(
+        lambda: title_filter_index.remove_genre(instance.pk)
+    )
+
+
+@receiver(post_save, sender=Category)
+def index_category(sender, instance, **kwargs):
+    transaction.on_commit(lambda: title_filter_index.set_category(instance))
+
+
+@receiver(post_delete, sender=Category)
+def unindex_category(sender, instance, **kwargs):
+    transaction.on_commit(
+        lambda: title_filter_index.remove_category(instance.pk)
+    )
+
+
+@receiver(post_save, sender=Title)
+@receiver(post_save, sender=GenreTitle)
+@receiver(post_delete, sender=GenreTitle)
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def refresh_leaderboards(sender, instance, **kwargs):
+    title_id = instance.pk if sender is Title else instance.title_id
+    transaction.on_commit(lambda: leaderboard_index.refresh([title_id]))
+
+
+@receiver(post_delete, sender=Title)
+def remove_from_leaderboards(sender, instance, **kwargs):
+    transaction.on_commit(lambda: leaderboard_index.remove(instance.pk))
+
+
+@receiver(m2m_changed, sender=GenreTitle)
+def refresh_leaderboards_genres(sender, instance, action, reverse, pk_set,
+                                **kwargs):
+    if reverse and action == 'pre_clear':
+        transaction.on_commit(leaderboard_index.reset)
+    elif action in ('post_add', 'post_remove') or (
+            action == 'post_clear' and not reverse):
+        title_ids = list(pk_set) if reverse else [instance.pk]
+        transaction.on_commit(lambda: leaderboard_index.refresh(title_ids))
+
+
+@receiver(post_delete, sender=Category)
+def reset_leaderboards(sender, **kwargs):
+    transaction.on_commit(leaderboard_index.reset)
+
+
+@receiver(titles_bulk_saved)
+def update_after_bulk_save(sender, titles, genre_links, removed_links=(),
+                           **kwargs):
+    bump_tags('titles', *(f'title:{title.pk}' for title in titles))
+
+    def update_indexes():
+        for title in titles:
+            suggest_index.update(title)
+            title_filter_index.set_title(title)
+        for title_id, genre_id in removed_links:
+            title_filter_index.remove_genres([title_id], [genre_id])
+        for title_id, genre_id in genre_links:
+            title_filter_index.add_genres([title_id], [genre_id])
+        leaderboard_index.refresh(title.pk for title in titles)
+
+    transaction.on_commit(update_indexes)
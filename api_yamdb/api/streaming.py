@@ -0,0 +1,88 @@
+import asyncio
+import threading
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIHandler
+from django.db import connections
+
+STREAMING_QUEUE_SIZE = 2
+
+
+class StreamingASGIHandler(ASGIHandler):
+    """ASGI-обработчик Django, перебирающий потоковые ответы в потоке.
+
+    Django 3.2 перебирает `StreamingHttpResponse` прямо в цикле событий,
+    и генераторы, читающие БД по мере отдачи (выгрузка каталога), падают
+    с SynchronousOnlyOperation. Здесь ответ перебирается в отдельном
+    потоке со своим соединением с БД, а куски передаются в цикл через
+    очередь на `STREAMING_QUEUE_SIZE` кусков, так что медленный клиент
+    притормаживает чтение.
+    """
+
+    async def send_response(self, response, send):
+        if not response.streaming:
+            return await super().send_response(response, send)
+        await send({
+            'type': 'http.response.start',
+            'status': response.status_code,
+            'headers': self.response_headers(response),
+        })
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue(STREAMING_QUEUE_SIZE)
+        stopped = threading.Event()
+        thread = threading.Thread(
+            target=self.pump, args=(response, loop, queue, stopped),
+            name='streaming-response', daemon=True
+        )
+        thread.start()
+        try:
+            part = await queue.get()
+            while isinstance(part, bytes):
+                for chunk, _ in self.chunk_bytes(part):
+                    await send({
+                        'type': 'http.response.body',
+                        'body': chunk,
+                        'more_body': True,
+                    })
+                part = await queue.get()
+            if part is not None:
+                raise part
+            await send({'type': 'http.response.body'})
+        finally:
+            stopped.set()
+            while not queue.empty():
+                queue.get_nowait()
+            await sync_to_async(thread.join, thread_sensitive=False)()
+            await sync_to_async(response.close, thread_sensitive=True)()
+
+    @staticmethod
+    def pump(response, loop, queue, stopped):
+        """Перебирает ответ и кладёт куски в очередь, в конце - None."""
+        def put(item):
+            asyncio.run_coroutine_threadsafe(queue.put(item), loop).result()
+
+        result = None
+        try:
+            for part in response:
+                if stopped.is_set():
+                    return
+                put(bytes(part))
+        except Exception as error:
+            result = error
+        finally:
+            connections.close_all()
+        if not stopped.is_set():
+            put(result)
+
+    @staticmethod
+    def response_headers(response):
+        """Заголовки и куки ответа в виде пар байтов, как в Django."""
+        headers = [
+            (header.encode('ascii'), value.encode('latin1'))
+            for header, value in response.items()
+        ]
+        headers.extend(
+            (b'Set-Cookie', cookie.output(header='').encode('ascii').strip())
+            for cookie in response.cookies.values()
+        )
+        return headers
@@ -1,9 +1,10 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
-from api.views import (CategoryViewSet, CommentViewSet, GenreViewSet,
-                       JWTTokenConfirmation, ReviewViewSet, TitleViewSet,
-                       UserCreation, UserViewSet)
+from api.views import (CategoryViewSet, ChangesView, CommentViewSet,
+                       ExportView, GenreViewSet, JWTTokenConfirmation,
+                       ReviewViewSet, SuggestView, TitleViewSet, UserCreation,
+                       UserViewSet)
 
 router_v1 = DefaultRouter()
 
@@ -28,6 +29,9 @@ auth_urls = [
 ]
 
 urlpatterns = [
+    path('v1/suggest/', SuggestView.as_view(), name='suggest'),
+    path('v1/export/', ExportView.as_view(), name='export'),
+    path('v1/changes/', ChangesView.as_view(), name='changes'),
     path('v1/', include(router_v1.urls)),
     path('v1/auth/', include(auth_urls)),
 ]
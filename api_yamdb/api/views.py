@@ -3,29 +3,44 @@ from http import HTTPStatus
 from django.conf import settings
 from django.contrib.auth.tokens import default_token_generator
 from django.core.mail import send_mail
-from django.db import IntegrityError
-from django.db.models import Avg
+from django.db import IntegrityError, transaction
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from django.utils.cache import patch_vary_headers
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters, viewsets
 from rest_framework.decorators import action
-from rest_framework.pagination import LimitOffsetPagination
-from rest_framework.permissions import (IsAuthenticated,
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import (AllowAny, IsAuthenticated,
                                         IsAuthenticatedOrReadOnly)
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from .bulk import TitleBulkWriter
+from .changes import compact_changes
+from .export import (compress_chunks, export_records, ndjson_chunks,
+                     parse_since)
 from .filters import TitleFilter
-from .mixins import ListCreateDeleteViewSet
+from .indexes import (ids_to_bits, leaderboard_index, popcount,
+                      suggest_index, title_filter_index)
+from .middleware import negotiate_encoding
+from .mixins import (ConditionalGetMixin, FastReadMixin,
+                     ListCreateDeleteViewSet, MultiGetMixin, NestedRouteMixin,
+                     QueryPlanMixin, ResponseCacheMixin)
+from .pagination import CachedCountPagination
 from .permissions import (IsAdmin, IsAdminOrReadOnly,
                           IsAuthorOrModeratorOrReadOnly)
+from .readers import CommentReader, ReviewReader
 from .serializers import (AdminSerializer, CategorySerializer,
                           CommentSerializer, GenreSerializer,
                           RegistrationSerializer, ReviewSerializer,
                           TitleReadSerializer, TitleWriteSerializer,
                           TokenConfirmationSerializer, UserSerializer)
-from reviews.models import Category, Genre, Review, Title, User
+from .writes import group_commit
+from reviews.models import (Category, ChangeLog, Comment, Genre, Review,
+                            Title, User)
 
 
 class UserCreation(APIView):
@@ -49,17 +64,24 @@ class UserCreation(APIView):
         serializer.is_valid(raise_exception=True)
         data = serializer.validated_data
         try:
-            signed_user, created = User.objects.get_or_create(
-                username=data.get('username'),
-                email=data.get('email')
-            )
-        except IntegrityError:
-            return Response(
-                settings.USERNAME_EXISTS_MESSAGE if
-                User.objects.filter(username='username').exists()
-                else settings.EMAIL_EXISTS_MESSAGE,
-                status=HTTPStatus.BAD_REQUEST
-            )
+            with transaction.atomic():
+                signed_user = User.objects.create(
+                    username=data.get('username'),
+                    email=data.get('email')
+                )
+        except IntegrityError as error:
+            try:
+                signed_user = User.objects.get(
+                    username=data.get('username'),
+                    email=data.get('email')
+                )
+            except User.DoesNotExist:
+                return Response(
+                    settings.USERNAME_EXISTS_MESSAGE
+                    if 'username' in str(error)
+                    else settings.EMAIL_EXISTS_MESSAGE,
+                    status=HTTPStatus.BAD_REQUEST
+                )
         signed_user.confirmation_code = self.token_generator(signed_user)
         user_data = {
             'subject': f'Код подтверждения для {signed_user.username}',
@@ -94,7 +116,8 @@ class JWTTokenConfirmation(APIView):
         )
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(ConditionalGetMixin, QueryPlanMixin, MultiGetMixin,
+                  viewsets.ModelViewSet):
     """Вьюсет Users."""
     queryset = User.objects.all()
     serializer_class = AdminSerializer
@@ -103,7 +126,9 @@ class UserViewSet(viewsets.ModelViewSet):
     lookup_field = 'username'
     http_method_names = ('patch', 'post', 'get', 'delete',)
     permission_classes = (IsAdmin, )
-    pagination_class = LimitOffsetPagination
+    pagination_class = CachedCountPagination
+    keyset_ordering = ('username',)
+    cache_tags = ('users',)
 
     @action(detail=False, url_path='me', methods=['GET', 'PATCH'],
             permission_classes=(IsAuthenticated,))
@@ -123,75 +148,236 @@ class CategoryViewSet(ListCreateDeleteViewSet):
     """Вьюсет для категории."""
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
+    cache_tags = ('categories',)
 
 
 class GenreViewSet(ListCreateDeleteViewSet):
     """Вьюсет для жанра."""
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
+    cache_tags = ('genres',)
+
 
+class TitleViewSet(ResponseCacheMixin, QueryPlanMixin, MultiGetMixin,
+                   FastReadMixin, viewsets.ModelViewSet):
+    """Вьюсет для произведения.
 
-class TitleViewSet(viewsets.ModelViewSet):
-    """Вьюсет для произведения."""
-    queryset = Title.objects.all().annotate(
-        rating=Avg('reviews__score')).order_by('name')
+    По умолчанию списки собираются из кешированных карточек; при частых
+    изменениях произведений карточки редко переиспользуются, и вместо них
+    можно включить `fast_reader_class = readers.TitleReader`.
+    """
+    queryset = Title.objects.all().order_by('name')
+    fast_reader_class = None
     permission_classes = (IsAdminOrReadOnly,)
-    pagination_class = LimitOffsetPagination
+    pagination_class = CachedCountPagination
+    keyset_ordering = ('name', 'id')
+    cache_tags = ('titles',)
+    detail_cache_tags = ('title:{pk}', 'categories', 'genres')
+    cache_max_age = 60
     filter_backends = (DjangoFilterBackend, filters.OrderingFilter)
     filterset_class = TitleFilter
-    ordering_fields = ['name', 'year']
+    ordering_fields = ['name', 'year', 'rating']
+    conditional_actions = ('list', 'retrieve', 'facets', 'top')
 
     def get_serializer_class(self):
         if self.request.method in ['POST', 'PATCH']:
             return TitleWriteSerializer
         return TitleReadSerializer
 
+    @action(detail=False, methods=['GET'])
+    def facets(self, request):
+        """Количество отфильтрованных произведений по категориям, жанрам
+        и десятилетиям: один запрос id, дальше пересечения с индексом."""
+        queryset = DjangoFilterBackend().filter_queryset(
+            request, self.get_queryset(), self
+        )
+        bits = ids_to_bits(queryset.values_list('pk', flat=True))
+        return Response({
+            'count': popcount(bits),
+            **title_filter_index.facets(bits),
+        })
 
-class ReviewViewSet(viewsets.ModelViewSet):
+    @action(detail=False, methods=['POST'])
+    def bulk(self, request):
+        """Пакетное создание (без `id`) и изменение (с `id`) произведений
+        с результатом для каждого элемента."""
+        if not isinstance(request.data, list):
+            return Response(
+                {'detail': 'Ожидается список произведений.'},
+                status=HTTPStatus.BAD_REQUEST
+            )
+        if len(request.data) > settings.BULK_MAX_ITEMS:
+            return Response(
+                {'detail': 'Слишком много произведений в одном запросе, '
+                           f'не больше {settings.BULK_MAX_ITEMS}.'},
+                status=HTTPStatus.BAD_REQUEST
+            )
+        return Response(TitleBulkWriter(request.data).save())
+
+    @action(detail=False, methods=['GET'])
+    def top(self, request):
+        """Лучшие произведения по байесовскому рейтингу в категории
+        и/или жанре из готовых списков индекса."""
+        try:
+            k = int(request.query_params.get('k', settings.LEADERBOARD_K))
+        except ValueError:
+            k = settings.LEADERBOARD_K
+        k = min(max(k, 1), settings.LEADERBOARD_MAX_K)
+        keys = {}
+        for kind in ('category', 'genre'):
+            slug = request.query_params.get(kind) or None
+            keys[kind] = slug and title_filter_index.resolve(kind, slug)
+            if slug and keys[kind] is None:
+                return Response([])
+        ids = leaderboard_index.top(k, keys['category'], keys['genre'])
+        titles = self.plan_queryset(Title.objects.all()).in_bulk(ids)
+        serializer = self.get_serializer(
+            [titles[pk] for pk in ids if pk in titles], many=True
+        )
+        return Response(serializer.data)
+
+
+class ReviewViewSet(ResponseCacheMixin, QueryPlanMixin, MultiGetMixin,
+                    FastReadMixin, NestedRouteMixin, viewsets.ModelViewSet):
     """Вьюсет для отзыва."""
+    queryset = Review.objects.all()
     serializer_class = ReviewSerializer
+    fast_reader_class = ReviewReader
     permission_classes = [
         IsAuthenticatedOrReadOnly,
         IsAuthorOrModeratorOrReadOnly
     ]
-    pagination_class = LimitOffsetPagination
-
-    def get_title(self):
-        return get_object_or_404(
-            Title,
-            id=self.kwargs.get('title_id')
-        )
+    pagination_class = CachedCountPagination
+    keyset_ordering = ('pub_date', 'id')
+    cache_tags = ('reviews:{title_id}', 'authors')
+    cache_max_age = 10
+    parent_model = Title
+    parent_lookups = (('title_id', 'pk'),)
+    parent_fields = ('rating_count',)
+    nested_lookups = (('title_id', 'title_id'),)
 
-    def get_queryset(self):
-        return self.get_title().reviews.all()
+    def get_known_count(self):
+        return self.get_parent()['rating_count']
 
     def perform_create(self, serializer):
-        serializer.save(
+        group_commit(
+            serializer.save,
             author=self.request.user,
-            title_id=self.get_title().id
+            title_id=self.get_parent()['pk']
         )
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(ResponseCacheMixin, QueryPlanMixin, MultiGetMixin,
+                     FastReadMixin, NestedRouteMixin, viewsets.ModelViewSet):
     """Вьюсет для комментариев."""
+    queryset = Comment.objects.all()
     serializer_class = CommentSerializer
+    fast_reader_class = CommentReader
     permission_classes = [
         IsAuthenticatedOrReadOnly,
         IsAuthorOrModeratorOrReadOnly
     ]
-    pagination_class = LimitOffsetPagination
-
-    def get_review(self):
-        return get_object_or_404(
-            Review,
-            id=self.kwargs.get('review_id')
-        )
+    pagination_class = CachedCountPagination
+    keyset_ordering = ('pub_date', 'id')
+    cache_tags = ('comments:{review_id}', 'authors')
+    cache_max_age = 10
+    parent_model = Review
+    parent_lookups = (('review_id', 'pk'), ('title_id', 'title_id'))
+    parent_fields = ('comment_count',)
+    nested_lookups = (
+        ('review_id', 'review_id'), ('title_id', 'review__title_id')
+    )
 
-    def get_queryset(self):
-        return self.get_review().comments.all()
+    def get_known_count(self):
+        return self.get_parent()['comment_count']
 
     def perform_create(self, serializer):
-        serializer.save(
+        group_commit(
+            serializer.save,
             author=self.request.user,
-            review_id=self.get_review().id
+            review_id=self.get_parent()['pk']
+        )
+
+
+class SuggestView(APIView):
+    """Подсказки названий произведений, жанров и категорий по префиксу."""
+    authentication_classes = ()
+    permission_classes = (AllowAny,)
+
+    def get(self, request):
+        try:
+            limit = int(request.query_params.get('limit',
+                                                 settings.SUGGEST_LIMIT))
+        except ValueError:
+            limit = settings.SUGGEST_LIMIT
+        limit = min(max(limit, 1), settings.SUGGEST_MAX_LIMIT)
+        return Response(
+            suggest_index.suggest(request.query_params.get('q', ''), limit)
+        )
+
+
+class ChangesView(APIView):
+    """Изменения каталога после номера `since` из журнала изменений.
+
+    `next` - значение `since` для следующего запроса. Ответ 410 значит,
+    что записи об удалениях после `since` уже не хранятся и клиенту нужна
+    полная синхронизация; `since=0` отдаёт все существующие объекты.
+    """
+    permission_classes = (AllowAny,)
+
+    def get(self, request):
+        try:
+            since = int(request.query_params.get('since', 0))
+        except ValueError:
+            raise ValidationError({'since': 'Ожидается номер изменения.'})
+        try:
+            limit = int(request.query_params.get('limit',
+                                                 settings.CHANGES_LIMIT))
+        except ValueError:
+            limit = settings.CHANGES_LIMIT
+        limit = min(max(limit, 1), settings.CHANGES_MAX_LIMIT)
+        if 0 < since < ChangeLog.horizon():
+            return Response(
+                {'detail': 'Журнал изменений сжат, нужна полная '
+                           'синхронизация.'},
+                status=HTTPStatus.GONE
+            )
+        rows = list(ChangeLog.objects.filter(seq__gt=since).values_list(
+            'seq', 'model', 'object_id', 'op'
+        )[:limit + 1])
+        return Response({
+            'next': rows[:limit][-1][0] if rows else since,
+            'has_more': len(rows) > limit,
+            'changes': compact_changes(rows[:limit]),
+        })
+
+
+class ExportView(APIView):
+    """Потоковая выгрузка каталога в NDJSON для администратора.
+
+    `since` ограничивает выгрузку произведениями, изменёнными с указанного
+    момента; заголовок `X-Export-Timestamp` - значение для следующей
+    выгрузки. Поток читает БД по мере отдачи, поэтому под ASGI его
+    перебирает `StreamingASGIHandler` в отдельном потоке.
+    """
+    permission_classes = (IsAdmin,)
+
+    def get(self, request):
+        since = request.query_params.get('since')
+        if since:
+            since = parse_since(since)
+        started = timezone.now()
+        chunks = ndjson_chunks(export_records(since or None))
+        encoding = negotiate_encoding(
+            request.META.get('HTTP_ACCEPT_ENCODING', '')
+        )
+        if encoding:
+            chunks = compress_chunks(chunks, encoding)
+        response = StreamingHttpResponse(
+            chunks, content_type='application/x-ndjson'
         )
+        if encoding:
+            response['Content-Encoding'] = encoding
+        response['X-Export-Timestamp'] = started.isoformat()
+        patch_vary_headers(response, ('Accept-Encoding',))
+        return response
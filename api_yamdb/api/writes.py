@@ -0,0 +1,134 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError
+from http import HTTPStatus
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from rest_framework.exceptions import APIException
+
+
+class GroupCommitWriter:
+    """Единственный поток записи, объединяющий записи в транзакции.
+
+    SQLite допускает одного писателя, и параллельные запросы ждут друг
+    друга или получают «database is locked». Здесь записи копятся
+    `window` секунд (не больше `max_batch`) и выполняются одним потоком
+    в одной транзакции; каждая запись - в своей точке сохранения, так что
+    ошибка одной (например, нарушение уникальности) не отменяет остальные.
+    Результат или исключение каждой записи отдаётся через Future после
+    фиксации транзакции.
+    """
+
+    def __init__(self, window=None, max_batch=None):
+        self.window = (
+            settings.WRITE_GROUP_COMMIT_WINDOW if window is None else window
+        )
+        self.max_batch = max_batch or settings.WRITE_GROUP_COMMIT_MAX_BATCH
+        self.queue = queue.SimpleQueue()
+        self.lock = threading.Lock()
+        self.thread = None
+
+    def submit(self, function, *args, **kwargs):
+        with self.lock:
+            if self.thread is None:
+                self.thread = threading.Thread(
+                    target=self.run, name='group-commit', daemon=True
+                )
+                self.thread.start()
+        future = Future()
+        self.queue.put((future, function, args, kwargs))
+        return future
+
+    def close(self):
+        with self.lock:
+            if self.thread is not None:
+                self.queue.put(None)
+                self.thread.join()
+                self.thread = None
+
+    def run(self):
+        try:
+            while True:
+                batch, stop = self.collect()
+                if batch:
+                    self.commit(batch)
+                    close_old_connections()
+                if stop:
+                    return
+        finally:
+            connection.close()
+
+    def collect(self):
+        """Ждёт первую запись и добирает пакет до конца окна."""
+        item = self.queue.get()
+        if item is None:
+            return [], True
+        batch = [item]
+        deadline = time.monotonic() + self.window
+        while len(batch) < self.max_batch:
+            timeout = deadline - time.monotonic()
+            try:
+                item = self.queue.get(timeout=max(timeout, 0))
+            except queue.Empty:
+                break
+            if item is None:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def commit(self, batch):
+        try:
+            with transaction.atomic():
+                results = [
+                    (future, *self.execute(function, args, kwargs))
+                    for future, function, args, kwargs in batch
+                    if future.set_running_or_notify_cancel()
+                ]
+        except Exception as error:
+            for future, *_ in batch:
+                if not future.cancelled():
+                    future.set_exception(error)
+            return
+        for future, succeeded, result in results:
+            if succeeded:
+                future.set_result(result)
+            else:
+                future.set_exception(result)
+
+    def execute(self, function, args, kwargs):
+        """Выполняет запись в точке сохранения: (успех, результат)."""
+        try:
+            with transaction.atomic():
+                return True, function(*args, **kwargs)
+        except Exception as error:
+            return False, error
+
+
+writer = GroupCommitWriter()
+
+
+class WriteQueueTimeout(APIException):
+    status_code = HTTPStatus.SERVICE_UNAVAILABLE
+    default_detail = 'Запись не выполнена: очередь записи перегружена.'
+    default_code = 'write_queue_timeout'
+
+
+def group_commit(function, *args, **kwargs):
+    """Выполняет запись через общий поток записи, если он включён.
+
+    Внутри уже открытой транзакции запись выполняется на месте: поток
+    записи её не видит и ждал бы её завершения. Если запись не дождалась
+    очереди за `WRITE_GROUP_COMMIT_TIMEOUT` секунд, она отменяется
+    и запрос получает 503; начатая запись дожидается завершения.
+    """
+    if not settings.WRITE_GROUP_COMMIT or connection.in_atomic_block:
+        return function(*args, **kwargs)
+    future = writer.submit(function, *args, **kwargs)
+    try:
+        return future.result(settings.WRITE_GROUP_COMMIT_TIMEOUT)
+    except TimeoutError:
+        if future.cancel():
+            raise WriteQueueTimeout
+    return future.result()
@@ -9,8 +9,20 @@ https://docs.djangoproject.com/en/3.2/howto/deployment/asgi/
 
 import os
 
-from django.core.asgi import get_asgi_application
+import django
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
 
-application = get_asgi_application()
+django.setup(set_prefix=False)
+
+# Потоковые ответы (выгрузка каталога) читают БД по мере отдачи и
+# перебираются в отдельном потоке, а не в цикле событий.
+from api.streaming import StreamingASGIHandler  # noqa: E402
+
+django_application = StreamingASGIHandler()
+
+# Потоки событий /api/v1/titles/{title_id}/events/ обслуживаются в обход
+# Django; модели импортируются только после его инициализации.
+from api.events import event_stream_application  # noqa: E402
+
+application = event_stream_application(django_application)
@@ -1,4 +1,5 @@
 import os
+import tempfile
 from datetime import timedelta
 
 from dotenv import load_dotenv
@@ -30,6 +31,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'api.middleware.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -69,6 +71,28 @@ DATABASES = {
     }
 }
 
+CACHE_BACKEND = os.getenv(
+    'CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'
+)
+
+# Клиенты memcached не принимают MAX_ENTRIES: память ограничивает сервер.
+LIMITS_CACHE_ENTRIES = 'memcached' not in CACHE_BACKEND
+
+# Карточки произведений (по записи на произведение на сутки) лежат
+# отдельно от короткоживущих ответов и счётчиков, чтобы те их не вытесняли.
+CACHES = {
+    'default': {
+        'BACKEND': CACHE_BACKEND,
+        'LOCATION': os.getenv('CACHE_LOCATION', 'api_yamdb'),
+        'OPTIONS': {'MAX_ENTRIES': 10000} if LIMITS_CACHE_ENTRIES else {},
+    },
+    'cards': {
+        'BACKEND': CACHE_BACKEND,
+        'LOCATION': os.getenv('CARD_CACHE_LOCATION', 'api_yamdb-cards'),
+        'OPTIONS': {'MAX_ENTRIES': 100000} if LIMITS_CACHE_ENTRIES else {},
+    },
+}
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -102,6 +126,15 @@ REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'rest_framework_simplejwt.authentication.JWTAuthentication',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'api.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend'
     ],
@@ -145,3 +178,60 @@ CONFIRMATION_CODE_MAX_LENGHT = 255
 REVIEW_COMMENT_LENGHT = 30
 NAME_TEXT_LENGTH = 256
 SLUG_LENGTH = 50
+
+# Кеширование
+COUNT_CACHE_TIMEOUT = 60 * 10
+TITLE_CARD_CACHE_TIMEOUT = 60 * 60 * 24
+RESPONSE_CACHE_TIMEOUT = 60 * 60
+
+# Индексы в памяти процесса
+IN_MEMORY_INDEX_TTL = 60 * 5
+SUGGEST_LIMIT = 10
+SUGGEST_MAX_LIMIT = 50
+FILTER_INDEX_MAX_IDS = 900
+LEADERBOARD_PRIOR_MEAN = 5.5
+LEADERBOARD_PRIOR_WEIGHT = 5
+LEADERBOARD_K = 10
+LEADERBOARD_MAX_K = 100
+
+# Длина text_preview отзывов
+TEXT_PREVIEW_LENGTH = 200
+
+# Получение нескольких объектов по списку id
+MULTI_GET_MAX_IDS = 100
+
+# Пакетная запись произведений
+BULK_MAX_ITEMS = 5000
+
+# Потоковая выгрузка каталога
+EXPORT_CHUNK_SIZE = 2000
+EXPORT_BUFFER_SIZE = 64 * 1024
+
+# Сжатие ответов
+COMPRESS_MIN_SIZE = 1024
+COMPRESS_LEVEL = 6
+COMPRESS_CONTENT_TYPES = (
+    'application/json', 'text/html', 'text/plain', 'text/css',
+    'application/javascript',
+)
+
+# Журнал изменений
+CHANGES_LIMIT = 500
+CHANGES_MAX_LIMIT = 5000
+CHANGELOG_RETENTION_DAYS = 30
+
+# Потоки событий (SSE) отзывов и комментариев
+EVENTS_SOCKET_DIR = os.getenv(
+    'EVENTS_SOCKET_DIR', os.path.join(tempfile.gettempdir(), 'api_yamdb-events')
+)
+EVENTS_QUEUE_SIZE = 64
+EVENTS_MAX_CONNECTIONS = 10000
+EVENTS_HEARTBEAT = 15
+EVENTS_IDLE_TIMEOUT = 60 * 5
+EVENTS_RETRY = 3000
+
+# Групповая запись отзывов и комментариев одним потоком
+WRITE_GROUP_COMMIT = os.getenv('WRITE_GROUP_COMMIT', '') == 'True'
+WRITE_GROUP_COMMIT_WINDOW = 0.005
+WRITE_GROUP_COMMIT_MAX_BATCH = 100
+WRITE_GROUP_COMMIT_TIMEOUT = 30
@@ -45,6 +45,7 @@ class ReviewAdmin(admin.ModelAdmin):
         'text',
         'score',
         'pub_date',
+        'comment_count',
     )
     list_filter = ('title',)
     search_fields = ('text',)
@@ -70,6 +71,7 @@ class TitleAdmin(admin.ModelAdmin):
     list_display = ('pk',
                     'name',
                     'year',
+                    'rating',
                     'description',
                     'category')
     search_fields = ('name',)
@@ -0,0 +1,30 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from reviews.models import ChangeLog
+
+
+class Command(BaseCommand):
+    """Сжимает журнал изменений."""
+    help = ('Оставляет по последней записи журнала на объект и удаляет '
+            'записи об удалении старше срока хранения.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=settings.CHANGELOG_RETENTION_DAYS,
+            help='Срок хранения записей об удалении, дней'
+        )
+
+    def handle(self, *args, **options):
+        superseded, expired = ChangeLog.compact(
+            timezone.now() - timedelta(days=options['days'])
+        )
+        self.stdout.write(
+            f'Удалено вытесненных записей: {superseded}, '
+            f'истёкших удалений: {expired}.'
+        )
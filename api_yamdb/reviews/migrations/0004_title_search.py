@@ -0,0 +1,69 @@
+from django.db import migrations
+
+NORMALIZE = "replace(replace(coalesce({0}, ''), 'ё', 'е'), 'Ё', 'Е')"
+
+CREATE_SQL = (
+    """
+    CREATE VIRTUAL TABLE reviews_title_fts USING fts5(
+        name, description,
+        tokenize = 'unicode61 remove_diacritics 2',
+        prefix = '2 3'
+    )
+    """,
+    f"""
+    CREATE TRIGGER reviews_title_fts_insert AFTER INSERT ON reviews_title
+    BEGIN
+        INSERT INTO reviews_title_fts(rowid, name, description)
+        VALUES (new.id, {NORMALIZE.format('new.name')},
+                {NORMALIZE.format('new.description')});
+    END
+    """,
+    """
+    CREATE TRIGGER reviews_title_fts_delete AFTER DELETE ON reviews_title
+    BEGIN
+        DELETE FROM reviews_title_fts WHERE rowid = old.id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER reviews_title_fts_update
+    AFTER UPDATE OF name, description ON reviews_title
+    BEGIN
+        UPDATE reviews_title_fts
+        SET name = {NORMALIZE.format('new.name')},
+            description = {NORMALIZE.format('new.description')}
+        WHERE rowid = new.id;
+    END
+    """,
+    f"""
+    INSERT INTO reviews_title_fts(rowid, name, description)
+    SELECT id, {NORMALIZE.format('name')}, {NORMALIZE.format('description')}
+    FROM reviews_title
+    """,
+)
+
+DROP_SQL = (
+    'DROP TRIGGER IF EXISTS reviews_title_fts_update',
+    'DROP TRIGGER IF EXISTS reviews_title_fts_delete',
+    'DROP TRIGGER IF EXISTS reviews_title_fts_insert',
+    'DROP TABLE IF EXISTS reviews_title_fts',
+)
+
+
+def run_sqlite(statements):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor != 'sqlite':
+            return
+        for statement in statements:
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0003_title_version'),
+    ]
+
+    operations = [
+        migrations.RunPython(run_sqlite(CREATE_SQL), run_sqlite(DROP_SQL)),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 3.2 on 2026-10-18 05:03
+
+from importlib import import_module
+
+from django.db import migrations, models
+
+# SQLite пересоздаёт таблицу при добавлении поля и теряет её триггеры,
+# поэтому триггеры полнотекстового индекса ставятся заново.
+search = import_module('reviews.migrations.0004_title_search')
+CREATE_TRIGGERS = search.CREATE_SQL[1:4]
+DROP_TRIGGERS = search.DROP_SQL[:3]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0004_title_search'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            search.run_sqlite(DROP_TRIGGERS),
+            search.run_sqlite(CREATE_TRIGGERS),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='modified',
+            field=models.DateTimeField(auto_now=True, db_index=True, verbose_name='Время изменения'),
+        ),
+        migrations.RunPython(
+            search.run_sqlite(CREATE_TRIGGERS),
+            search.run_sqlite(DROP_TRIGGERS),
+        ),
+    ]
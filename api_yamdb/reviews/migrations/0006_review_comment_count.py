@@ -0,0 +1,37 @@
+# Generated by Django 3.2 on 2026-10-18 05:27
+
+from django.db import migrations, models
+from django.db.models import Count, Max
+
+
+def fill_comment_count(apps, schema_editor):
+    Review = apps.get_model('reviews', 'Review')
+    Comment = apps.get_model('reviews', 'Comment')
+    aggregates = Comment.objects.values('review_id').annotate(
+        comment_count=Count('id'), last_comment_at=Max('pub_date'))
+    for row in aggregates:
+        Review.objects.filter(pk=row['review_id']).update(
+            comment_count=row['comment_count'],
+            last_comment_at=row['last_comment_at'],
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0005_title_modified'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='review',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество комментариев'),
+        ),
+        migrations.AddField(
+            model_name='review',
+            name='last_comment_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Время последнего комментария'),
+        ),
+        migrations.RunPython(fill_comment_count, migrations.RunPython.noop),
+    ]
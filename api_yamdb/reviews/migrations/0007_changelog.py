@@ -0,0 +1,49 @@
+# Generated by Django 3.2 on 2026-10-18 05:31
+
+from django.db import migrations, models
+
+LOGGED_MODELS = ('Category', 'Genre', 'Title', 'Review', 'Comment')
+
+
+def fill_changelog(apps, schema_editor):
+    ChangeLog = apps.get_model('reviews', 'ChangeLog')
+    for name in LOGGED_MODELS:
+        model = apps.get_model('reviews', name)
+        ChangeLog.objects.bulk_create(
+            (
+                ChangeLog(model=model._meta.model_name, object_id=pk,
+                          op='create')
+                for pk in model.objects.values_list('pk', flat=True)
+            ),
+            batch_size=1000,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0006_review_comment_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeLog',
+            fields=[
+                ('seq', models.BigAutoField(primary_key=True, serialize=False, verbose_name='Номер')),
+                ('model', models.CharField(max_length=16, verbose_name='Модель')),
+                ('object_id', models.PositiveBigIntegerField(verbose_name='ID объекта')),
+                ('op', models.CharField(choices=[('create', 'создание'), ('update', 'изменение'), ('delete', 'удаление'), ('purge', 'граница истёкших удалений')], max_length=6, verbose_name='Операция')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='Время записи')),
+            ],
+            options={
+                'verbose_name': 'Запись журнала изменений',
+                'verbose_name_plural': 'Журнал изменений',
+                'ordering': ('seq',),
+            },
+        ),
+        migrations.AddIndex(
+            model_name='changelog',
+            index=models.Index(fields=['model', 'object_id'], name='reviews_cha_model_d6b574_idx'),
+        ),
+        migrations.RunPython(fill_changelog, migrations.RunPython.noop),
+    ]
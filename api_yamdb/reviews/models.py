@@ -2,6 +2,10 @@ from django.conf import settings
 from django.contrib.auth.models import AbstractUser
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
+from django.db.models import (Case, Exists, F, FloatField, OuterRef,
+                              Subquery, When)
+from django.db.models.functions import Cast
+from django.utils import timezone
 
 from api.validators import validate_regex_username, validate_username
 from .validators import valid_year
@@ -70,6 +74,28 @@ class Title(models.Model):
         on_delete=models.SET_NULL,
         related_name='titles',
         verbose_name='Категория произведения',)
+    rating_sum = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Сумма оценок',)
+    rating_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество оценок',)
+    rating = models.FloatField(
+        blank=True,
+        null=True,
+        editable=False,
+        db_index=True,
+        verbose_name='Рейтинг произведения',)
+    version = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Версия представления',)
+    modified = models.DateTimeField(
+        auto_now=True,
+        db_index=True,
+        verbose_name='Время изменения',)
 
     class Meta:
         verbose_name = 'Произведение'
@@ -78,6 +104,54 @@ class Title(models.Model):
     def __str__(self):
         return self.name
 
+    @classmethod
+    def update_rating(cls, title_id, score_delta, count_delta):
+        """Атомарно сдвигает сумму и количество оценок произведения."""
+        rating_count = F('rating_count') + count_delta
+        return cls.objects.filter(pk=title_id).update(
+            rating_sum=F('rating_sum') + score_delta,
+            rating_count=rating_count,
+            version=F('version') + 1,
+            rating=Case(
+                When(
+                    rating_count__gt=-count_delta,
+                    then=Cast(F('rating_sum') + score_delta, FloatField())
+                    / rating_count
+                ),
+                default=None,
+                output_field=FloatField(),
+            ),
+        )
+
+    @classmethod
+    def recalculate_rating(cls, title_id):
+        """Пересчитывает рейтинг произведения по всем его отзывам."""
+        aggregate = Review.objects.filter(title_id=title_id).aggregate(
+            rating_sum=models.Sum('score'),
+            rating_count=models.Count('id'),
+        )
+        rating_sum = aggregate['rating_sum'] or 0
+        rating_count = aggregate['rating_count']
+        return cls.objects.filter(pk=title_id).update(
+            rating_sum=rating_sum,
+            rating_count=rating_count,
+            rating=rating_sum / rating_count if rating_count else None,
+            version=F('version') + 1,
+        )
+
+    @classmethod
+    def bump_version(cls, **lookups):
+        """Делает устаревшими закешированные представления произведений."""
+        return cls.objects.filter(**lookups).update(
+            version=F('version') + 1,
+            modified=timezone.now(),
+        )
+
+    @classmethod
+    def touch(cls, **lookups):
+        """Отмечает изменение отзывов или комментариев произведений."""
+        return cls.objects.filter(**lookups).update(modified=timezone.now())
+
 
 class GenreTitle(models.Model):
     """Класс для объединения жанров и произведений."""
@@ -192,6 +266,17 @@ class Review(PublicAuthor):
             MinValueValidator(1, "Оценка не должна меньше 1.")
         ]
     )
+    comment_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество комментариев',
+    )
+    last_comment_at = models.DateTimeField(
+        blank=True,
+        null=True,
+        editable=False,
+        verbose_name='Время последнего комментария',
+    )
 
     class Meta(PublicAuthor.Meta):
         constraints = [
@@ -204,6 +289,39 @@ class Review(PublicAuthor):
         verbose_name = 'Отзыв'
         verbose_name_plural = 'Отзывы'
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Запоминает загруженные оценку и произведение для пересчёта."""
+        instance = super().from_db(db, field_names, values)
+        instance.remember_rating()
+        return instance
+
+    def remember_rating(self):
+        self._loaded_rating = (
+            self.__dict__.get('title_id'),
+            self.__dict__.get('score'),
+        )
+
+    @classmethod
+    def add_comment(cls, review_id, pub_date):
+        """Атомарно учитывает новый комментарий отзыва."""
+        return cls.objects.filter(pk=review_id).update(
+            comment_count=F('comment_count') + 1,
+            last_comment_at=pub_date,
+        )
+
+    @classmethod
+    def remove_comment(cls, review_id):
+        """Атомарно убирает удалённый комментарий из счётчиков отзыва."""
+        return cls.objects.filter(pk=review_id).update(
+            comment_count=F('comment_count') - 1,
+            last_comment_at=Subquery(
+                Comment.objects.filter(
+                    review_id=OuterRef('pk')
+                ).order_by('-pub_date').values('pub_date')[:1]
+            ),
+        )
+
 
 class Comment(PublicAuthor):
     """Модель Комменты."""
@@ -219,3 +337,107 @@ class Comment(PublicAuthor):
         default_related_name = 'comments'
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
+
+
+class ChangeLog(models.Model):
+    """Журнал изменений для инкрементальной синхронизации клиентов.
+
+    Записи только добавляются; `seq` растёт монотонно. Сжатие оставляет
+    по последней записи на объект, поэтому журнал всегда описывает все
+    существующие объекты. Записи об удалении хранятся ограниченный срок;
+    последняя из истёкших становится отметкой `purge`, и клиент, который
+    отстал сильнее, должен синхронизироваться заново.
+    """
+    CREATE = 'create'
+    UPDATE = 'update'
+    DELETE = 'delete'
+    PURGE = 'purge'
+    OPERATIONS = (
+        (CREATE, 'создание'),
+        (UPDATE, 'изменение'),
+        (DELETE, 'удаление'),
+        (PURGE, 'граница истёкших удалений'),
+    )
+
+    seq = models.BigAutoField(primary_key=True, verbose_name='Номер')
+    model = models.CharField(max_length=16, verbose_name='Модель')
+    object_id = models.PositiveBigIntegerField(verbose_name='ID объекта')
+    op = models.CharField(
+        max_length=6,
+        choices=OPERATIONS,
+        verbose_name='Операция',
+    )
+    created = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Время записи',
+    )
+
+    class Meta:
+        ordering = ('seq',)
+        indexes = [models.Index(fields=('model', 'object_id'))]
+        verbose_name = 'Запись журнала изменений'
+        verbose_name_plural = 'Журнал изменений'
+
+    def __str__(self):
+        return f'{self.seq}: {self.op} {self.model} {self.object_id}'
+
+    @classmethod
+    def record(cls, model, ids, op):
+        """Записывает операцию над объектами модели с указанными id."""
+        return cls.objects.bulk_create(
+            cls(model=model._meta.model_name, object_id=pk, op=op)
+            for pk in ids
+        )
+
+    @classmethod
+    def horizon(cls):
+        """Номер, раньше которого журнал неполон, или 0."""
+        return cls.objects.filter(op=cls.PURGE).aggregate(
+            horizon=models.Max('seq')
+        )['horizon'] or 0
+
+    @classmethod
+    def compact(cls, deleted_before):
+        """Удаляет вытесненные записи и истёкшие записи об удалении.
+
+        Возвращает количество удалённых записей каждого вида.
+        """
+        superseded, _ = cls.objects.exclude(op=cls.PURGE).filter(
+            Exists(cls.objects.filter(
+                model=OuterRef('model'),
+                object_id=OuterRef('object_id'),
+                seq__gt=OuterRef('seq'),
+            ))
+        ).delete()
+        expired = cls.objects.filter(
+            op=cls.DELETE, created__lt=deleted_before
+        )
+        last = expired.aggregate(seq=models.Max('seq'))['seq']
+        if last is None:
+            return superseded, 0
+        cls.objects.filter(pk=last).update(op=cls.PURGE)
+        removed, _ = cls.objects.filter(
+            op__in=(cls.PURGE, cls.DELETE),
+            seq__lt=last,
+            created__lt=deleted_before,
+        ).delete()
+        return superseded, removed + 1
+
+
+class CacheTag(models.Model):
+    """Версия тега, от которого зависят кешированные ответы API.
+
+    Версии хранятся в БД, а не в кеше: кеш по умолчанию у каждого процесса
+    свой, а запись в одном воркере должна устаревать ответы всех.
+    """
+    tag = models.CharField(
+        max_length=100, primary_key=True, verbose_name='Тег'
+    )
+    version = models.BigIntegerField(verbose_name='Версия')
+
+    class Meta:
+        verbose_name = 'Версия тега кеша'
+        verbose_name_plural = 'Версии тегов кеша'
+
+    def __str__(self):
+        return f'{self.tag}: {self.version}'
@@ -0,0 +1,142 @@
+from django.db.models.signals import (m2m_changed, post_delete, post_save,
+                                      pre_delete)
+from django.dispatch import receiver
+
+from .models import (Category, ChangeLog, Comment, Genre, GenreTitle, Review,
+                     Title)
+
+
+def change_titles(**lookups):
+    """Новая версия произведений и запись их изменения в журнал."""
+    Title.bump_version(**lookups)
+    ChangeLog.record(
+        Title, Title.objects.filter(**lookups).values_list('pk', flat=True),
+        ChangeLog.UPDATE,
+    )
+
+
+@receiver(post_save, sender=Review)
+def update_rating_on_review_save(sender, instance, created, **kwargs):
+    """Обновляет сохранённый рейтинг произведения при записи отзыва."""
+    loaded_title_id, loaded_score = getattr(
+        instance, '_loaded_rating', (None, None)
+    )
+    if created:
+        Title.update_rating(instance.title_id, instance.score, 1)
+    elif loaded_title_id is None or loaded_score is None:
+        Title.recalculate_rating(instance.title_id)
+    elif loaded_title_id != instance.title_id:
+        Title.update_rating(loaded_title_id, -loaded_score, -1)
+        Title.update_rating(instance.title_id, instance.score, 1)
+    elif loaded_score != instance.score:
+        Title.update_rating(
+            instance.title_id, instance.score - loaded_score, 0
+        )
+    instance.remember_rating()
+
+
+@receiver(post_delete, sender=Review)
+def update_rating_on_review_delete(sender, instance, **kwargs):
+    """Убирает оценку удалённого отзыва из рейтинга произведения."""
+    title_id, score = getattr(instance, '_loaded_rating', (None, None))
+    if title_id is None or score is None:
+        title_id, score = instance.title_id, instance.score
+    Title.update_rating(title_id, -score, -1)
+
+
+@receiver(post_save, sender=Comment)
+def count_comment_on_save(sender, instance, created, **kwargs):
+    """Учитывает новый комментарий в счётчиках отзыва."""
+    if created:
+        Review.add_comment(instance.review_id, instance.pub_date)
+
+
+@receiver(post_delete, sender=Comment)
+def count_comment_on_delete(sender, instance, **kwargs):
+    Review.remove_comment(instance.review_id)
+
+
+@receiver(post_save, sender=Title)
+def bump_version_on_title_save(sender, instance, **kwargs):
+    """Новая версия представления при изменении самого произведения."""
+    Title.bump_version(pk=instance.pk)
+
+
+@receiver(post_save, sender=GenreTitle)
+@receiver(post_delete, sender=GenreTitle)
+def bump_version_on_genre_title(sender, instance, **kwargs):
+    change_titles(pk=instance.title_id)
+
+
+@receiver(m2m_changed, sender=GenreTitle)
+def bump_version_on_genres_change(sender, instance, action, reverse,
+                                  pk_set, **kwargs):
+    """Новая версия при изменении жанров через менеджер связи."""
+    if not reverse and action in ('post_add', 'post_remove', 'post_clear'):
+        change_titles(pk=instance.pk)
+    elif reverse and action in ('post_add', 'post_remove'):
+        change_titles(pk__in=pk_set)
+    elif reverse and action == 'pre_clear':
+        change_titles(genre=instance)
+
+
+@receiver(post_save, sender=Category)
+@receiver(pre_delete, sender=Category)
+def bump_version_on_category(sender, instance, **kwargs):
+    if not kwargs.get('created'):
+        change_titles(category=instance)
+
+
+@receiver(post_save, sender=Genre)
+def bump_version_on_genre(sender, instance, created, **kwargs):
+    if not created:
+        change_titles(genre=instance)
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def touch_title_on_review(sender, instance, **kwargs):
+    """Отмечает изменение произведения для инкрементальной выгрузки."""
+    Title.touch(pk=instance.title_id)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def touch_title_on_comment(sender, instance, **kwargs):
+    Title.touch(reviews=instance.review_id)
+
+
+@receiver(post_save, sender=Title)
+@receiver(post_save, sender=Review)
+@receiver(post_save, sender=Comment)
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=Genre)
+def log_save(sender, instance, created, **kwargs):
+    """Записывает создание или изменение объекта в журнал изменений."""
+    ChangeLog.record(
+        sender, [instance.pk],
+        ChangeLog.CREATE if created else ChangeLog.UPDATE,
+    )
+
+
+@receiver(post_delete, sender=Title)
+@receiver(post_delete, sender=Review)
+@receiver(post_delete, sender=Comment)
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=Genre)
+def log_delete(sender, instance, **kwargs):
+    ChangeLog.record(sender, [instance.pk], ChangeLog.DELETE)
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def log_title_on_review(sender, instance, **kwargs):
+    """Отзыв меняет рейтинг и количество отзывов произведения."""
+    ChangeLog.record(Title, [instance.title_id], ChangeLog.UPDATE)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def log_review_on_comment(sender, instance, **kwargs):
+    """Комментарий меняет счётчики отзыва."""
+    ChangeLog.record(Review, [instance.review_id], ChangeLog.UPDATE)
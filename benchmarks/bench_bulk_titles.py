@@ -0,0 +1,83 @@
+"""Пропускная способность записи произведений: по одному POST и пакетом.
+
+Запуск из корня репозитория:
+
+    SECRET_KEY=x python benchmarks/bench_bulk_titles.py --count 1000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'api_yamdb'))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import connection  # noqa: E402
+from django.test.utils import (setup_test_environment,  # noqa: E402
+                               teardown_test_environment)
+from rest_framework.test import APIClient  # noqa: E402
+
+from reviews.models import Category, Genre, Title, User  # noqa: E402
+
+
+def make_items(count, prefix):
+    return [
+        {
+            'name': f'{prefix} {number}',
+            'year': 1950 + number % 70,
+            'genre': ['drama', 'comedy'],
+            'category': 'films',
+        }
+        for number in range(count)
+    ]
+
+
+def measure(label, count, run):
+    started = time.perf_counter()
+    run()
+    elapsed = time.perf_counter() - started
+    print(f'{label:>10}: {count} произведений за {elapsed:.2f} с, '
+          f'{count / elapsed:.0f} в секунду')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count', type=int, default=500)
+    args = parser.parse_args()
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        admin = User.objects.create_user(
+            username='bench', email='bench@yamdb.fake', role='admin'
+        )
+        Category.objects.create(name='Фильмы', slug='films')
+        Genre.objects.create(name='Драма', slug='drama')
+        Genre.objects.create(name='Комедия', slug='comedy')
+        client = APIClient()
+        client.force_authenticate(admin)
+
+        def single():
+            for item in make_items(args.count, 'Одиночное'):
+                client.post('/api/v1/titles/', item, format='json')
+
+        def bulk():
+            client.post(
+                '/api/v1/titles/bulk/', make_items(args.count, 'Пакетное'),
+                format='json'
+            )
+
+        measure('POST', args.count, single)
+        measure('bulk', args.count, bulk)
+        assert Title.objects.count() == 2 * args.count
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+if __name__ == '__main__':
+    main()
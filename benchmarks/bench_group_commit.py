@@ -0,0 +1,106 @@
+"""Параллельное создание отзывов: транзакция на запрос и групповая запись.
+
+Тестовая БД SQLite создаётся в файле, как в рабочем окружении. Запуск из
+корня репозитория:
+
+    SECRET_KEY=x python benchmarks/bench_group_commit.py --threads 16
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'api_yamdb'))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test.utils import (setup_test_environment,  # noqa: E402
+                               teardown_test_environment)
+from rest_framework.test import APIClient  # noqa: E402
+
+from api.writes import writer  # noqa: E402
+from reviews.models import Category, Review, Title, User  # noqa: E402
+
+
+def post_reviews(user, titles, errors):
+    client = APIClient()
+    client.force_authenticate(user)
+    for title in titles:
+        try:
+            response = client.post(
+                f'/api/v1/titles/{title.pk}/reviews/',
+                {'text': 'Отзыв', 'score': 5}, format='json'
+            )
+        except Exception as error:
+            errors.append(type(error).__name__)
+        else:
+            if response.status_code != 201:
+                errors.append(str(response.status_code))
+    connection.close()
+
+
+def measure(label, users, titles):
+    errors = []
+    threads = [
+        threading.Thread(target=post_reviews, args=(user, titles, errors))
+        for user in users
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    count = len(users) * len(titles)
+    print(f'{label:>12}: {count} отзывов за {elapsed:.2f} с, '
+          f'{count / elapsed:.0f} в секунду, ошибок: {len(errors)}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--titles', type=int, default=20)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    connection.settings_dict['TEST']['NAME'] = os.path.join(
+        directory, 'bench.sqlite3'
+    )
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        category = Category.objects.create(name='Фильмы', slug='films')
+        titles = [
+            Title.objects.create(
+                name=f'Произведение {number}', year=2000, category=category
+            )
+            for number in range(2 * args.titles)
+        ]
+        users = [
+            User.objects.create_user(
+                username=f'reader{number}',
+                email=f'reader{number}@yamdb.fake'
+            )
+            for number in range(args.threads)
+        ]
+        connection.close()
+        settings.WRITE_GROUP_COMMIT = False
+        measure('транзакции', users, titles[:args.titles])
+        settings.WRITE_GROUP_COMMIT = True
+        measure('групповая', users, titles[args.titles:])
+        writer.close()
+        print(f'Отзывов в БД: {Review.objects.count()}')
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+if __name__ == '__main__':
+    main()
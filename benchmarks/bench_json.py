@@ -0,0 +1,109 @@
+"""Скорость рендеринга JSON: JSONRenderer DRF и FastJSONRenderer.
+
+Данные - реальные ответы API со списками произведений и отзывов.
+Запуск из корня репозитория:
+
+    SECRET_KEY=x python benchmarks/bench_json.py --count 500 --repeat 200
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'api_yamdb'))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import connection  # noqa: E402
+from django.test.utils import (setup_test_environment,  # noqa: E402
+                               teardown_test_environment)
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+from rest_framework.test import APIClient  # noqa: E402
+
+from api import renderers  # noqa: E402
+from api.renderers import FastJSONRenderer  # noqa: E402
+from reviews.models import (Category, Genre, Review, Title,  # noqa: E402
+                            User)
+
+
+def populate(count):
+    author = User.objects.create_user(
+        username='bench', email='bench@yamdb.fake', role='admin'
+    )
+    category = Category.objects.create(name='Фильмы', slug='films')
+    genres = [
+        Genre.objects.create(name='Драма', slug='drama'),
+        Genre.objects.create(name='Комедия', slug='comedy'),
+    ]
+    Title.objects.bulk_create(
+        Title(name=f'Произведение {number}', year=1950 + number % 70,
+              description='Описание произведения. ' * 5, category=category)
+        for number in range(count)
+    )
+    titles = list(Title.objects.order_by('id'))
+    for title in titles:
+        title.genre.set(genres)
+    User.objects.bulk_create(
+        User(username=f'reader{number}', email=f'reader{number}@yamdb.fake')
+        for number in range(count)
+    )
+    readers = User.objects.filter(username__startswith='reader')
+    for number, reader in enumerate(readers):
+        Review.objects.create(
+            title=titles[0], author=reader, score=1 + number % 10,
+            text=f'Отзыв номер {number}: «неплохо», но длинно. ' * 3
+        )
+    return author, titles[0]
+
+
+def measure(label, data, repeat, render):
+    size = len(render(data))
+    started = time.perf_counter()
+    for _ in range(repeat):
+        render(data)
+    elapsed = time.perf_counter() - started
+    print(f'{label:>24}: {elapsed / repeat * 1000:.3f} мс на ответ '
+          f'({size} байт)')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        author, title = populate(args.count)
+        client = APIClient()
+        client.force_authenticate(author)
+        payloads = {
+            'titles': client.get(
+                '/api/v1/titles/', {'limit': args.count}
+            ).data,
+            'reviews': client.get(
+                f'/api/v1/titles/{title.pk}/reviews/', {'limit': args.count}
+            ).data,
+        }
+        orjson = renderers.orjson
+        for name, data in payloads.items():
+            print(f'{name}:')
+            measure('JSONRenderer', data, args.repeat, JSONRenderer().render)
+            renderers.orjson = None
+            measure('FastJSONRenderer (json)', data, args.repeat,
+                    FastJSONRenderer().render)
+            renderers.orjson = orjson
+            if orjson is not None:
+                measure('FastJSONRenderer (orjson)', data, args.repeat,
+                        FastJSONRenderer().render)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+if __name__ == '__main__':
+    main()
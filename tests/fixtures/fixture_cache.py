@@ -0,0 +1,17 @@
+import pytest
+from django.core.cache import caches
+
+from api.indexes import reset_indexes
+
+
+def clear_caches():
+    for cache in caches.all():
+        cache.clear()
+    reset_indexes()
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    clear_caches()
+    yield
+    clear_caches()
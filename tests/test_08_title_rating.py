@@ -0,0 +1,56 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08TitleRating:
+
+    def test_01_rating_follows_reviews(self, admin_client, user_client,
+                                       moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        reviews_url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+
+        review = create_single_review(user_client, titles[0]['id'], 'a', 3)
+        create_single_review(moderator_client, titles[0]['id'], 'b', 8)
+        assert admin_client.get(url).json()['rating'] == 5, (
+            'Проверьте, что рейтинг произведения пересчитывается при '
+            'создании отзыва.'
+        )
+
+        response = user_client.patch(
+            f'{reviews_url}{review.json()["id"]}/', data={'score': 10}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert admin_client.get(url).json()['rating'] == 9, (
+            'Проверьте, что рейтинг произведения пересчитывается при '
+            'изменении оценки в отзыве.'
+        )
+
+        response = user_client.delete(f'{reviews_url}{review.json()["id"]}/')
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert admin_client.get(url).json()['rating'] == 8, (
+            'Проверьте, что рейтинг произведения пересчитывается при '
+            'удалении отзыва.'
+        )
+
+    def test_02_rating_ordering_and_filter(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        create_single_review(user_client, titles[0]['id'], 'a', 4)
+        create_single_review(user_client, titles[1]['id'], 'b', 9)
+
+        response = admin_client.get('/api/v1/titles/?ordering=-rating')
+        names = [title['name'] for title in response.json()['results']]
+        assert names == [titles[1]['name'], titles[0]['name']], (
+            'Проверьте, что произведения можно упорядочить по рейтингу.'
+        )
+
+        response = admin_client.get('/api/v1/titles/?rating_min=7')
+        names = [title['name'] for title in response.json()['results']]
+        assert names == [titles[1]['name']], (
+            'Проверьте, что произведения можно отфильтровать по '
+            'минимальному рейтингу.'
+        )
@@ -0,0 +1,55 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import (create_comments, create_reviews, create_single_review,
+                         create_titles)
+
+
+def count_queries(client, url):
+    client.get(url)
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == 200
+    return len(context.captured_queries)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09QueryPlan:
+
+    def test_01_titles_constant_queries(self, admin_client, client):
+        create_titles(admin_client)
+        url = '/api/v1/titles/'
+        single_page = count_queries(client, f'{url}?limit=1')
+        full_page = count_queries(client, url)
+        assert single_page == full_page, (
+            f'Проверьте, что число запросов к БД при GET-запросе к `{url}` '
+            'не зависит от количества произведений на странице.'
+        )
+
+    def test_02_reviews_constant_queries(self, admin_client, client, user,
+                                         user_client, moderator_client):
+        reviews, titles = create_reviews(admin_client, {user: user_client})
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        single_page = count_queries(client, url)
+        create_single_review(moderator_client, titles[0]['id'], 'text', 7)
+        full_page = count_queries(client, url)
+        assert single_page == full_page, (
+            f'Проверьте, что число запросов к БД при GET-запросе к `{url}` '
+            'не зависит от количества отзывов на странице.'
+        )
+
+    def test_03_comments_constant_queries(self, admin_client, client,
+                                          user, user_client, moderator,
+                                          moderator_client):
+        comments, reviews, titles = create_comments(
+            admin_client, {user: user_client, moderator: moderator_client}
+        )
+        url = (f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+               f'{reviews[0]["id"]}/comments/')
+        single_page = count_queries(client, f'{url}?limit=1')
+        full_page = count_queries(client, url)
+        assert single_page == full_page, (
+            f'Проверьте, что число запросов к БД при GET-запросе к `{url}` '
+            'не зависит от количества комментариев на странице.'
+        )
@@ -0,0 +1,125 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_titles
+
+
+def walk(client, url, key):
+    """Проходит все страницы вперёд, затем назад по ссылкам курсора."""
+    forward, response = [], client.get(url).json()
+    pages = [response]
+    forward.extend(item[key] for item in response['results'])
+    while response['next']:
+        response = client.get(response['next']).json()
+        pages.append(response)
+        forward.extend(item[key] for item in response['results'])
+    backward = []
+    while response['previous']:
+        response = client.get(response['previous']).json()
+        backward = [item[key] for item in response['results']] + backward
+    return forward, backward, pages
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10KeysetPagination:
+
+    def test_01_titles_cursor(self, admin_client, client):
+        titles, _, _ = create_titles(admin_client)
+        for number in range(3):
+            admin_client.post('/api/v1/titles/', data={
+                'name': 'Крепкий орешек',
+                'year': 1990 + number,
+                'genre': titles[1]['genre'],
+                'category': titles[1]['category'],
+            })
+        expected = [
+            title['id'] for title in
+            client.get('/api/v1/titles/?limit=100').json()['results']
+        ]
+        forward, backward, pages = walk(
+            client, '/api/v1/titles/?cursor=&limit=2', 'id'
+        )
+        assert forward == expected, (
+            'Проверьте, что пагинация по курсору для `/api/v1/titles/` '
+            'возвращает произведения в порядке (name, id) без пропусков.'
+        )
+        assert backward == expected[:-len(pages[-1]['results'])], (
+            'Проверьте, что ссылка `previous` в режиме курсора ведёт на '
+            'предыдущую страницу.'
+        )
+        assert 'count' not in pages[0], (
+            'В режиме курсора ответ не должен содержать `count`.'
+        )
+
+    def test_02_reviews_cursor(self, admin_client, client,
+                               django_user_model):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        review_model = django_user_model._meta.apps.get_model(
+            'reviews', 'Review'
+        )
+        for number in range(5):
+            author = django_user_model.objects.create_user(
+                username=f'author{number}', email=f'a{number}@yamdb.fake'
+            )
+            review_model.objects.create(
+                author=author, title_id=titles[0]['id'],
+                text=f'review {number}', score=number + 1
+            )
+        forward, _, _ = walk(client, f'{url}?cursor=&limit=2', 'text')
+        assert forward == [f'review {number}' for number in range(5)], (
+            f'Проверьте, что пагинация по курсору для `{url}` возвращает '
+            'отзывы в порядке публикации.'
+        )
+
+    def test_03_invalid_cursor(self, client):
+        response = client.get('/api/v1/titles/?cursor=broken')
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что при неверном курсоре возвращается статус 404.'
+        )
+        response = client.get('/api/v1/titles/?cursor=&ordering=-year')
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что `ordering` вместе с курсором не игнорируется '
+            'молча, а возвращается статус 400.'
+        )
+        assert 'ordering' in response.json()
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10CountCache:
+
+    def test_01_count_cached_and_invalidated(self, admin_client, client):
+        titles, _, _ = create_titles(admin_client)
+        url = '/api/v1/titles/?genre=horror'
+        assert client.get(url).json()['count'] == 1
+        with CaptureQueriesContext(connection) as context:
+            assert client.get(url).json()['count'] == 1
+        assert not any(
+            'COUNT(' in query['sql'] for query in context.captured_queries
+        ), (
+            'Проверьте, что повторный запрос с теми же фильтрами берёт '
+            'количество объектов из кеша.'
+        )
+        admin_client.post('/api/v1/titles/', data={
+            'name': 'Чужой',
+            'year': 1979,
+            'genre': ['horror'],
+            'category': titles[0]['category'],
+        })
+        assert client.get(url).json()['count'] == 2, (
+            'Проверьте, что кешированное количество сбрасывается при '
+            'изменении произведений.'
+        )
+
+    def test_02_count_modes(self, admin_client, client):
+        create_titles(admin_client)
+        data = client.get('/api/v1/titles/?count=none&limit=1').json()
+        assert data['count'] is None and data['next'], (
+            'Проверьте, что при `count=none` количество не считается, '
+            'а ссылка на следующую страницу сохраняется.'
+        )
+        data = client.get('/api/v1/titles/?count=estimate').json()
+        assert data['count'] == 2
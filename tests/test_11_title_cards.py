@@ -0,0 +1,87 @@
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_single_review, create_titles
+
+
+def get_title(client, title_id):
+    return client.get(f'/api/v1/titles/{title_id}/').json()
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11TitleCards:
+
+    def test_01_cards_follow_related_changes(self, admin_client, client,
+                                             user_client,
+                                             django_user_model):
+        titles, categories, genres = create_titles(admin_client)
+        title_id = titles[0]['id']
+        get_title(client, title_id)
+        apps = django_user_model._meta.apps
+
+        genre = apps.get_model('reviews', 'Genre').objects.get(
+            slug=genres[0]['slug']
+        )
+        genre.name = 'Хоррор'
+        genre.save()
+        assert {'name': 'Хоррор', 'slug': genre.slug} in get_title(
+            client, title_id)['genre'], (
+            'Проверьте, что карточка произведения обновляется при '
+            'переименовании жанра.'
+        )
+
+        category = apps.get_model('reviews', 'Category').objects.get(
+            slug=categories[0]['slug']
+        )
+        category.name = 'Кино'
+        category.save()
+        assert get_title(client, title_id)['category']['name'] == 'Кино', (
+            'Проверьте, что карточка произведения обновляется при '
+            'переименовании категории.'
+        )
+
+        create_single_review(user_client, title_id, 'text', 7)
+        assert get_title(client, title_id)['rating'] == 7, (
+            'Проверьте, что карточка произведения обновляется при '
+            'изменении рейтинга.'
+        )
+
+        admin_client.patch(
+            f'/api/v1/titles/{title_id}/', data={'genre': [genres[2]['slug']]}
+        )
+        assert get_title(client, title_id)['genre'] == [genres[2]], (
+            'Проверьте, что карточка произведения обновляется при '
+            'изменении жанров.'
+        )
+
+    def test_02_cached_list_skips_prefetch(self, admin_client, client):
+        create_titles(admin_client)
+        url = '/api/v1/titles/'
+        first = client.get(url).json()
+        with CaptureQueriesContext(connection) as context:
+            second = client.get(url).json()
+        assert first == second
+        assert not any(
+            'reviews_genretitle' in query['sql']
+            for query in context.captured_queries
+        ), (
+            'Проверьте, что при наличии всех карточек в кеше жанры '
+            'произведений не запрашиваются из БД.'
+        )
+
+    def test_03_cards_not_evicted_by_other_entries(self, admin_client):
+        create_titles(admin_client)
+        url = '/api/v1/titles/'
+        admin_client.get(url)
+        cache.set_many({f'filler:{number}': number for number in range(1000)})
+        with CaptureQueriesContext(connection) as context:
+            admin_client.get(url)
+        assert not any(
+            'reviews_genretitle' in query['sql']
+            for query in context.captured_queries
+        ), (
+            'Проверьте, что карточки произведений не вытесняются из кеша '
+            'другими записями.'
+        )
@@ -0,0 +1,129 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import (create_single_review, create_titles,
+                         data_queries)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12ConditionalGet:
+
+    def test_01_etag_not_modified(self, admin_client, client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        response = client.get(url)
+        etag = response['ETag']
+        assert etag and response['Last-Modified'], (
+            f'Проверьте, что ответ на GET-запрос к `{url}` содержит '
+            'заголовки `ETag` и `Last-Modified`.'
+        )
+        assert 'max-age=10' in response['Cache-Control']
+
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f'Проверьте, что GET-запрос к `{url}` с актуальным '
+            '`If-None-Match` возвращает ответ со статусом 304.'
+        )
+        assert not response.content
+
+        create_single_review(user_client, titles[0]['id'], 'text', 5)
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что после добавления отзыва GET-запрос к `{url}` '
+            'со старым `If-None-Match` возвращает новые данные.'
+        )
+        assert response['ETag'] != etag
+
+    def test_02_if_modified_since(self, admin_client, client):
+        create_titles(admin_client)
+        url = '/api/v1/categories/'
+        response = client.get(url)
+        assert 'max-age=3600' in response['Cache-Control']
+        response = client.get(
+            url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+        )
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f'Проверьте, что GET-запрос к `{url}` с актуальным '
+            '`If-Modified-Since` возвращает ответ со статусом 304.'
+        )
+
+    def test_03_title_detail_follows_genre_rename(self, admin_client,
+                                                  client):
+        titles, _, genres = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        etag = client.get(url)['ETag']
+        admin_client.delete(f'/api/v1/genres/{genres[0]["slug"]}/')
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK
+        assert genres[0] not in response.json()['genre']
+
+    def test_04_validators_shared_between_processes(self, admin_client,
+                                                    client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        etag = client.get(url)['ETag']
+        cache.clear()
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            'Проверьте, что версии для `ETag` хранятся не в локальном кеше '
+            'процесса.'
+        )
+        create_single_review(user_client, titles[0]['id'], 'text', 5)
+        cache.clear()
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что запись в другом процессе меняет `ETag` ответов '
+            'всех процессов.'
+        )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12ResponseCache:
+
+    def test_01_anonymous_response_cached(self, admin_client, client,
+                                          user_client):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        first = client.get(url)
+        with CaptureQueriesContext(connection) as context:
+            second = client.get(url)
+        assert second.content == first.content
+        assert not data_queries(context), (
+            f'Проверьте, что повторный анонимный GET-запрос к `{url}` '
+            'отдаётся из кеша без запросов к данным.'
+        )
+        create_single_review(user_client, titles[0]['id'], 'text', 5)
+        assert client.get(url).json()['count'] == 1, (
+            'Проверьте, что кеш ответов сбрасывается при добавлении отзыва.'
+        )
+
+    def test_02_authenticated_not_cached(self, admin_client):
+        create_titles(admin_client)
+        admin_client.get('/api/v1/genres/')
+        with CaptureQueriesContext(connection) as context:
+            admin_client.get('/api/v1/genres/')
+        assert any(
+            'reviews_genre' in query['sql']
+            for query in context.captured_queries
+        ), (
+            'Проверьте, что ответы авторизованным пользователям не '
+            'берутся из общего кеша.'
+        )
+
+    def test_03_browsable_api_not_shared(self, admin_client):
+        create_titles(admin_client)
+        url = '/api/v1/categories/'
+        first = Client().get(url, HTTP_ACCEPT='text/html')
+        second = Client().get(url, HTTP_ACCEPT='text/html')
+        assert 'csrftoken' in second.cookies, (
+            'Проверьте, что страницы браузерного API с CSRF-токеном не '
+            'отдаются другим клиентам из кеша ответов.'
+        )
+        assert first.cookies['csrftoken'].value != (
+            second.cookies['csrftoken'].value
+        )
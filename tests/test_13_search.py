@@ -0,0 +1,125 @@
+import pytest
+
+from tests.utils import create_titles
+
+
+def names(client, url):
+    return [title['name'] for title in client.get(url).json()['results']]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13TitleSearch:
+
+    def test_01_search_ranked_by_relevance(self, admin_client, client):
+        titles, categories, genres = create_titles(admin_client)
+        admin_client.post('/api/v1/titles/', data={
+            'name': 'Ёлки',
+            'year': 2010,
+            'genre': [genres[1]['slug']],
+            'category': categories[0]['slug'],
+            'description': 'Терминатор здесь только упоминается.',
+        })
+        assert names(client, '/api/v1/titles/?search=термин') == [
+            'Терминатор', 'Ёлки'
+        ], (
+            'Проверьте, что поиск находит произведения по префиксу слова '
+            'и выше ставит совпадения в названии.'
+        )
+        assert names(client, '/api/v1/titles/?search=елки') == ['Ёлки'], (
+            'Проверьте, что поиск не различает `е` и `ё`.'
+        )
+        assert names(client, '/api/v1/titles/?search=КРЕПКИЙ') == [
+            'Крепкий орешек'
+        ]
+        assert names(client, '/api/v1/titles/?search=несуществующее') == []
+
+    def test_02_search_composes_with_filters(self, admin_client, client):
+        titles, categories, genres = create_titles(admin_client)
+        admin_client.post('/api/v1/titles/', data={
+            'name': 'Терминатор 2',
+            'year': 1991,
+            'genre': [genres[2]['slug']],
+            'category': categories[1]['slug'],
+        })
+        url = '/api/v1/titles/?search=терминатор&genre=drama'
+        assert names(client, url) == ['Терминатор 2'], (
+            'Проверьте, что поиск сочетается с фильтрами по жанру.'
+        )
+        url = '/api/v1/titles/?search=терминатор&year=1984'
+        assert names(client, url) == ['Терминатор']
+
+    def test_03_index_follows_updates(self, admin_client, client):
+        titles, _, _ = create_titles(admin_client)
+        admin_client.patch(
+            f'/api/v1/titles/{titles[0]["id"]}/', data={'name': 'Робокоп'}
+        )
+        assert names(client, '/api/v1/titles/?search=термин') == []
+        assert names(client, '/api/v1/titles/?search=робокоп') == [
+            'Робокоп'
+        ]
+        admin_client.delete(f'/api/v1/titles/{titles[0]["id"]}/')
+        assert names(client, '/api/v1/titles/?search=робокоп') == []
+
+    def test_04_all_matches_filtered_and_counted(self, admin_client,
+                                                 client):
+        _, categories, genres = create_titles(admin_client)
+        items = [
+            {
+                'name': f'Сиквел {number}',
+                'year': 2000,
+                'genre': [genres[0]['slug']],
+                'category': categories[number % 2]['slug'],
+                'description': 'Продолжение.' * (number % 2),
+            }
+            for number in range(600)
+        ]
+        admin_client.post('/api/v1/titles/bulk/', items, format='json')
+        data = client.get('/api/v1/titles/?search=сиквел').json()
+        assert data['count'] == 600, (
+            'Проверьте, что поиск не ограничивает число найденных '
+            'произведений до фильтров и пагинации.'
+        )
+        data = client.get(
+            '/api/v1/titles/?search=сиквел'
+            f'&category={categories[1]["slug"]}'
+        ).json()
+        assert data['count'] == 300, (
+            'Проверьте, что фильтры применяются ко всем результатам поиска.'
+        )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13Suggest:
+    url = '/api/v1/suggest/'
+
+    def test_01_suggest_by_prefix(self, admin_client, client):
+        create_titles(admin_client)
+        response = client.get(self.url, {'q': 'кр'})
+        assert response.status_code == 200, (
+            f'Эндпоинт `{self.url}` не найден или недоступен.'
+        )
+        assert [item['name'] for item in response.json()] == [
+            'Крепкий орешек'
+        ], (
+            f'Проверьте, что `{self.url}` возвращает названия, '
+            'начинающиеся с переданного префикса.'
+        )
+        suggestions = client.get(self.url, {'q': 'ко'}).json()
+        assert {'type': 'genre', 'slug': 'comedy', 'name': 'Комедия'} in (
+            suggestions
+        ), 'Проверьте, что подсказки включают жанры.'
+        suggestions = client.get(self.url, {'q': 'орешек'}).json()
+        assert [item['name'] for item in suggestions] == ['Крепкий орешек']
+
+    def test_02_suggest_follows_writes(self, admin_client, client):
+        titles, _, genres = create_titles(admin_client)
+        assert client.get(self.url, {'q': 'ужас'}).json()
+        admin_client.delete(f'/api/v1/genres/{genres[0]["slug"]}/')
+        admin_client.patch(
+            f'/api/v1/titles/{titles[0]["id"]}/', data={'name': 'Чужой'}
+        )
+        assert client.get(self.url, {'q': 'ужас'}).json() == []
+        assert client.get(self.url, {'q': 'терм'}).json() == []
+        assert client.get(self.url, {'q': 'чуж', 'limit': 1}).json() == [
+            {'type': 'title', 'id': titles[0]['id'], 'name': 'Чужой'}
+        ]
@@ -0,0 +1,184 @@
+from http import HTTPStatus
+from itertools import product
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.filters import filter_titles_sql
+from api.indexes import leaderboard_index, suggest_index, title_filter_index
+from tests.utils import create_single_review, create_titles, data_queries
+
+CRITERIA = (
+    {'genres': ['horror', 'drama'], 'genre_mode': 'or'},
+    {'genres': ['horror', 'comedy'], 'genre_mode': 'and'},
+    {'genres': ['horror', 'drama'], 'genre_mode': 'and'},
+    {'genres': ['missing']},
+    {'category': 'films'},
+    {'category': 'books', 'genres': ['drama']},
+    {'year_min': 1985},
+    {'year_max': 1990, 'genres': ['comedy', 'drama']},
+    {'year_min': 1980, 'year_max': 1989, 'category': 'films'},
+)
+
+
+def add_titles(admin_client, categories, genres):
+    """Добавляет произведения на все сочетания жанров, категорий и лет."""
+    slugs = [genre['slug'] for genre in genres]
+    genre_sets = ([slugs[0]], [slugs[1], slugs[2]], slugs)
+    for number, (genre, category, year) in enumerate(product(
+            genre_sets, categories, (1979, 1990, 2005))):
+        admin_client.post('/api/v1/titles/', data={
+            'name': f'Произведение {number}',
+            'year': year,
+            'genre': genre,
+            'category': category['slug'],
+        })
+
+
+def ids(client, url):
+    return sorted(
+        title['id']
+        for title in client.get(url).json()['results']
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14TitleFilterIndex:
+
+    def assert_matches_sql(self, django_user_model):
+        title_model = django_user_model._meta.apps.get_model(
+            'reviews', 'Title'
+        )
+        for criteria in CRITERIA:
+            expected = sorted(filter_titles_sql(
+                title_model.objects.all(), **criteria
+            ).values_list('pk', flat=True))
+            assert title_filter_index.select(**criteria) == expected, (
+                'Проверьте, что индекс фильтров возвращает те же '
+                f'произведения, что и SQL-запрос, для условий {criteria}.'
+            )
+
+    def test_01_index_matches_sql(self, admin_client, django_user_model):
+        _, categories, genres = create_titles(admin_client)
+        add_titles(admin_client, categories, genres)
+        self.assert_matches_sql(django_user_model)
+
+    def test_02_index_follows_writes(self, admin_client, django_user_model):
+        titles, categories, genres = create_titles(admin_client)
+        self.assert_matches_sql(django_user_model)
+        add_titles(admin_client, categories, genres)
+        admin_client.patch(f'/api/v1/titles/{titles[0]["id"]}/', data={
+            'genre': ['drama'], 'year': 2001, 'category': 'books'
+        })
+        admin_client.delete(f'/api/v1/titles/{titles[1]["id"]}/')
+        admin_client.delete('/api/v1/genres/comedy/')
+        admin_client.delete('/api/v1/categories/films/')
+        self.assert_matches_sql(django_user_model)
+
+    def test_04_index_follows_other_processes(self, admin_client,
+                                              user_client, client,
+                                              django_user_model,
+                                              monkeypatch):
+        titles, categories, genres = create_titles(admin_client)
+        add_titles(admin_client, categories, genres)
+        self.assert_matches_sql(django_user_model)
+        assert client.get('/api/v1/titles/top/').json() == []
+        for index in (title_filter_index, leaderboard_index, suggest_index):
+            monkeypatch.setattr(index, 'apply', lambda *args: None)
+            monkeypatch.setattr(index, 'reset', lambda: None)
+        admin_client.patch(f'/api/v1/titles/{titles[0]["id"]}/', data={
+            'name': 'Робокоп', 'genre': ['drama'], 'year': 2001,
+            'category': 'books',
+        })
+        admin_client.delete(f'/api/v1/titles/{titles[1]["id"]}/')
+        admin_client.delete('/api/v1/genres/comedy/')
+        admin_client.delete('/api/v1/categories/films/')
+        create_single_review(user_client, titles[0]['id'], 'Отзыв', 9)
+        monkeypatch.undo()
+        self.assert_matches_sql(django_user_model)
+        assert [
+            title['id'] for title in client.get('/api/v1/titles/top/').json()
+        ] == [titles[0]['id']], (
+            'Проверьте, что лидеры учитывают отзывы, записанные другим '
+            'процессом.'
+        )
+        assert client.get('/api/v1/titles/facets/', {
+            'category': 'books'
+        }).json()['decade']['2000'] == 4
+        assert [item['name'] for item in client.get(
+            '/api/v1/suggest/', {'q': 'робо'}
+        ).json()] == ['Робокоп'], (
+            'Проверьте, что подсказки учитывают записи другого процесса.'
+        )
+
+    def test_03_filter_params(self, admin_client, client):
+        titles, _, _ = create_titles(admin_client)
+        first, second = titles[0]['id'], titles[1]['id']
+        url = '/api/v1/titles/'
+        assert ids(client, f'{url}?genre=horror,drama') == [first, second], (
+            f'Проверьте, что `{url}` принимает несколько жанров через '
+            'запятую и по умолчанию объединяет их.'
+        )
+        assert ids(client, f'{url}?genre=horror,drama&genre_mode=and') == [
+        ], (
+            'Проверьте, что при `genre_mode=and` произведение должно '
+            'относиться ко всем переданным жанрам.'
+        )
+        assert ids(client, f'{url}?genre=horror,comedy&genre_mode=and') == [
+            first
+        ]
+        assert ids(client, f'{url}?year_min=1985') == [second], (
+            f'Проверьте, что `{url}` фильтрует по диапазону лет.'
+        )
+        assert ids(client, f'{url}?year_max=1985&category=films') == [first]
+        assert ids(client, f'{url}?year=1988&genre=drama') == [second]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14TitleFacets:
+    url = '/api/v1/titles/facets/'
+
+    def test_01_facets(self, admin_client, client):
+        create_titles(admin_client)
+        response = client.get(self.url)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Эндпоинт `{self.url}` не найден или недоступен.'
+        )
+        assert response.json() == {
+            'count': 2,
+            'category': {'books': 1, 'films': 1},
+            'genre': {'comedy': 1, 'drama': 1, 'horror': 1},
+            'decade': {'1980': 2},
+        }, (
+            f'Проверьте, что `{self.url}` возвращает количество '
+            'произведений по категориям, жанрам и десятилетиям.'
+        )
+        data = client.get(self.url, {'genre': 'horror'}).json()
+        assert data['count'] == 1 and data['genre'] == {
+            'comedy': 1, 'drama': 0, 'horror': 1
+        }, (
+            f'Проверьте, что `{self.url}` учитывает параметры фильтрации '
+            'и возвращает нулевые значения.'
+        )
+
+    def test_02_facets_follow_writes(self, admin_client, client):
+        titles, _, _ = create_titles(admin_client)
+        client.get(self.url)
+        admin_client.post('/api/v1/genres/', data={
+            'name': 'Триллер', 'slug': 'thriller'
+        })
+        admin_client.patch(f'/api/v1/titles/{titles[0]["id"]}/', data={
+            'year': 2001, 'genre': ['thriller']
+        })
+        data = client.get(self.url).json()
+        assert data['genre']['thriller'] == 1
+        assert data['decade'] == {'1980': 1, '2000': 1}
+        with CaptureQueriesContext(connection) as context:
+            data = client.get(self.url, {
+                'genre': 'thriller,drama', 'rating_max': 10
+            }).json()
+        assert len(data_queries(context)) == 1, (
+            f'Проверьте, что `{self.url}` выполняет один запрос к данным.'
+        )
+        assert data['count'] == 0
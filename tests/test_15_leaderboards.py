@@ -0,0 +1,129 @@
+from http import HTTPStatus
+
+import pytest
+from django.conf import settings
+
+from tests.utils import create_titles
+
+URL = '/api/v1/titles/top/'
+
+
+def add_reviews(django_user_model, title_id, scores):
+    review_model = django_user_model._meta.apps.get_model(
+        'reviews', 'Review'
+    )
+    reviews = []
+    for score in scores:
+        number = django_user_model.objects.count()
+        author = django_user_model.objects.create_user(
+            username=f'critic{number}', email=f'critic{number}@yamdb.fake'
+        )
+        reviews.append(review_model.objects.create(
+            author=author, title_id=title_id, text='text', score=score
+        ))
+    return reviews
+
+
+def expected_top(django_user_model, **lookups):
+    """Порядок лидеров, посчитанный по данным из БД."""
+    title_model = django_user_model._meta.apps.get_model('reviews', 'Title')
+    weight = settings.LEADERBOARD_PRIOR_WEIGHT
+    titles = title_model.objects.filter(rating_count__gt=0, **lookups)
+    return [title.id for title in sorted(titles, key=lambda title: (
+        -(weight * settings.LEADERBOARD_PRIOR_MEAN + title.rating_sum)
+        / (weight + title.rating_count),
+        title.id,
+    ))]
+
+
+def top_ids(client, **params):
+    return [title['id'] for title in client.get(URL, params).json()]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15Leaderboards:
+
+    def test_01_bayesian_order(self, admin_client, client,
+                               django_user_model):
+        titles, _, _ = create_titles(admin_client)
+        add_reviews(django_user_model, titles[0]['id'], [10])
+        add_reviews(django_user_model, titles[1]['id'], [9, 9, 8, 9])
+        response = client.get(URL)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Эндпоинт `{URL}` не найден или недоступен.'
+        )
+        assert [title['id'] for title in response.json()] == [
+            titles[1]['id'], titles[0]['id']
+        ], (
+            f'Проверьте, что `{URL}` упорядочивает произведения по '
+            'байесовскому рейтингу и единственный высокий отзыв не '
+            'выводит произведение в лидеры.'
+        )
+        assert response.json()[0]['name'] == titles[1]['name']
+        assert top_ids(client, k=1) == [titles[1]['id']], (
+            f'Проверьте, что `{URL}` ограничивает список параметром `k`.'
+        )
+        assert top_ids(client, genre='horror') == [titles[0]['id']], (
+            f'Проверьте, что `{URL}` фильтрует лидеров по жанру.'
+        )
+        assert top_ids(client, category='books', genre='drama') == [
+            titles[1]['id']
+        ]
+        assert top_ids(client, category='books', genre='horror') == []
+        assert top_ids(client, genre='missing') == []
+        assert top_ids(client, genre='', category='', k=3) == [
+            titles[1]['id'], titles[0]['id']
+        ], (
+            f'Проверьте, что `{URL}` считает пустые `genre` и `category` '
+            'отсутствующими.'
+        )
+        assert top_ids(client, genre='horror', category='') == [
+            titles[0]['id']
+        ]
+
+    def test_02_follows_writes(self, admin_client, client,
+                               django_user_model):
+        titles, _, _ = create_titles(admin_client)
+        for number in range(4):
+            title_id = admin_client.post('/api/v1/titles/', data={
+                'name': f'Произведение {number}',
+                'year': 2000,
+                'genre': ['comedy'],
+                'category': 'films',
+            }).json()['id']
+            add_reviews(django_user_model, title_id, [number + 5] * 3)
+        reviews = add_reviews(django_user_model, titles[0]['id'], [10] * 5)
+        assert top_ids(client) == expected_top(django_user_model)
+        reviews[0].delete()
+        reviews[1].score = 1
+        reviews[1].save()
+        admin_client.patch(f'/api/v1/titles/{titles[0]["id"]}/', data={
+            'genre': ['drama'], 'category': 'books'
+        })
+        assert top_ids(client) == expected_top(django_user_model), (
+            f'Проверьте, что `{URL}` учитывает изменения отзывов.'
+        )
+        assert top_ids(client, genre='comedy', category='films') == (
+            expected_top(
+                django_user_model, genre__slug='comedy',
+                category__slug='films'
+            )
+        ), f'Проверьте, что `{URL}` учитывает изменения жанров.'
+        assert top_ids(client, category='books') == expected_top(
+            django_user_model, category__slug='books'
+        ), f'Проверьте, что `{URL}` учитывает изменения категорий.'
+
+    def test_03_genre_cleared(self, admin_client, client, django_user_model):
+        titles, _, genres = create_titles(admin_client)
+        for title in titles:
+            add_reviews(django_user_model, title['id'], [8] * 3)
+        assert top_ids(client, genre=genres[0]['slug'])
+        genre_model = django_user_model._meta.apps.get_model(
+            'reviews', 'Genre'
+        )
+        genre_model.objects.get(slug=genres[0]['slug']).title_set.clear()
+        assert top_ids(client, genre=genres[0]['slug']) == [], (
+            f'Проверьте, что `{URL}` учитывает снятие жанра со всех '
+            'произведений.'
+        )
+        assert top_ids(client) == expected_top(django_user_model)
@@ -0,0 +1,158 @@
+import asyncio
+import gzip
+import json
+import zlib
+from http import HTTPStatus
+
+import pytest
+from asgiref.testing import ApplicationCommunicator
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api_yamdb.asgi import application
+
+from tests.utils import create_comments
+
+URL = '/api/v1/export/'
+
+
+def read_export(client, params=None, **extra):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(URL, params, **extra)
+        content = b''.join(response.streaming_content)
+    if response.get('Content-Encoding') == 'gzip':
+        content = gzip.decompress(content)
+    elif response.get('Content-Encoding') == 'deflate':
+        content = zlib.decompress(content)
+    records = [json.loads(line) for line in content.decode().splitlines()]
+    return response, records, len(context.captured_queries)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16Export:
+
+    def test_01_export_nested(self, admin_client, user_client,
+                              moderator_client, user, moderator):
+        comments, reviews, titles = create_comments(admin_client, {
+            user: user_client, moderator: moderator_client
+        })
+        response, records, queries = read_export(admin_client)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что администратор может выгрузить каталог '
+            f'через `{URL}`.'
+        )
+        assert response['Content-Type'] == 'application/x-ndjson'
+        assert [record['id'] for record in records] == sorted(
+            title['id'] for title in titles
+        ), f'Проверьте, что `{URL}` выгружает все произведения по строке.'
+        record = next(
+            record for record in records if record['id'] == titles[0]['id']
+        )
+        assert record['category']['slug'] == titles[0]['category']
+        assert sorted(
+            genre['slug'] for genre in record['genre']
+        ) == sorted(titles[0]['genre'])
+        assert [review['id'] for review in record['reviews']] == [
+            review['id'] for review in reviews
+        ], 'Проверьте, что в выгрузку попадают отзывы произведения.'
+        assert [
+            comment['text'] for comment in record['reviews'][0]['comments']
+        ] == [comment['text'] for comment in comments], (
+            'Проверьте, что в выгрузку попадают комментарии к отзывам.'
+        )
+
+        admin_client.post('/api/v1/titles/', data={
+            'name': 'Чужой', 'year': 1979, 'genre': ['horror'],
+            'category': 'films',
+        })
+        _, records, more_queries = read_export(admin_client)
+        assert len(records) == 3 and more_queries == queries, (
+            f'Проверьте, что число запросов `{URL}` не зависит от объёма '
+            'каталога.'
+        )
+
+    def test_02_gzip_and_since(self, admin_client, user_client, user):
+        comments, reviews, titles = create_comments(admin_client, {
+            user: user_client
+        })
+        response, records, _ = read_export(
+            admin_client, HTTP_ACCEPT_ENCODING='gzip'
+        )
+        assert response['Content-Encoding'] == 'gzip', (
+            f'Проверьте, что `{URL}` сжимает выгрузку, если клиент '
+            'принимает gzip.'
+        )
+        assert len(records) == 2
+        response, gzip_records, _ = read_export(
+            admin_client, HTTP_ACCEPT_ENCODING='gzip;q=0, deflate'
+        )
+        assert response['Content-Encoding'] == 'deflate', (
+            f'Проверьте, что `{URL}` учитывает веса в Accept-Encoding.'
+        )
+        assert gzip_records == records
+        response, _, _ = read_export(
+            admin_client, HTTP_ACCEPT_ENCODING='gzip;q=0'
+        )
+        assert not response.has_header('Content-Encoding'), (
+            f'Проверьте, что `{URL}` не сжимает выгрузку, если клиент '
+            'отказался от gzip.'
+        )
+        since = response['X-Export-Timestamp']
+        _, records, _ = read_export(admin_client, {'since': since})
+        assert records == [], (
+            'Проверьте, что `since` исключает неизменённые произведения.'
+        )
+        user_client.patch(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/'
+            f'comments/{comments[0]["id"]}/', data={'text': 'Изменено'}
+        )
+        _, records, _ = read_export(admin_client, {'since': since})
+        assert [record['id'] for record in records] == [titles[0]['id']], (
+            'Проверьте, что изменение комментария попадает в '
+            'инкрементальную выгрузку.'
+        )
+        comment = records[0]['reviews'][0]['comments'][0]
+        assert comment['text'] == 'Изменено'
+        response = admin_client.get(URL, {'since': 'вчера'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_03_export_admin_only(self, client, user_client):
+        assert client.get(URL).status_code == HTTPStatus.UNAUTHORIZED
+        assert user_client.get(URL).status_code == HTTPStatus.FORBIDDEN, (
+            f'Проверьте, что `{URL}` доступен только администратору.'
+        )
+
+    def test_04_export_under_asgi(self, settings, admin_client, token_admin,
+                                  user, user_client):
+        create_comments(admin_client, {user: user_client})
+        settings.EXPORT_CHUNK_SIZE = 1
+        settings.EXPORT_BUFFER_SIZE = 1
+        scope = {
+            'type': 'http',
+            'method': 'GET',
+            'path': URL,
+            'query_string': b'',
+            'headers': [(
+                b'authorization', f'Bearer {token_admin["access"]}'.encode()
+            )],
+        }
+
+        async def scenario():
+            communicator = ApplicationCommunicator(application, scope)
+            await communicator.send_input({'type': 'http.request'})
+            start = await communicator.receive_output(5)
+            body = b''
+            message = await communicator.receive_output(5)
+            while message.get('more_body'):
+                body += message['body']
+                message = await communicator.receive_output(5)
+            await communicator.wait(5)
+            return start, body
+
+        start, body = asyncio.run(scenario())
+        assert start['status'] == HTTPStatus.OK
+        records = [json.loads(line) for line in body.decode().splitlines()]
+        assert len(records) == 2, (
+            f'Проверьте, что `{URL}` отдаёт выгрузку под ASGI: поток '
+            'читает БД вне цикла событий.'
+        )
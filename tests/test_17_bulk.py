@@ -0,0 +1,138 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_titles
+
+URL = '/api/v1/titles/bulk/'
+
+
+def new_titles(count, genre=('comedy', 'drama'), category='films'):
+    return [
+        {
+            'name': f'Произведение {number}',
+            'year': 1990 + number % 30,
+            'genre': list(genre),
+            'category': category,
+        }
+        for number in range(count)
+    ]
+
+
+def post_bulk(client, items):
+    with CaptureQueriesContext(connection) as context:
+        response = client.post(URL, items, format='json')
+    return response, len(context.captured_queries)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17BulkTitles:
+
+    def test_01_bulk_create(self, admin_client, client):
+        create_titles(admin_client)
+        response, queries = post_bulk(admin_client, new_titles(3))
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что администратор может отправить POST-запрос '
+            f'к `{URL}` со списком произведений.'
+        )
+        results = response.json()
+        assert [result['status'] for result in results] == [201] * 3
+        title = client.get(f'/api/v1/titles/{results[0]["id"]}/').json()
+        assert title['name'] == 'Произведение 0'
+        assert title['category']['slug'] == 'films'
+        assert sorted(genre['slug'] for genre in title['genre']) == [
+            'comedy', 'drama'
+        ], 'Проверьте, что пакетная запись привязывает жанры.'
+
+        _, more_queries = post_bulk(admin_client, new_titles(30))
+        assert more_queries == queries, (
+            f'Проверьте, что число запросов `{URL}` не зависит от '
+            'количества произведений в пакете.'
+        )
+        response = client.get('/api/v1/titles/', {'genre': 'drama'})
+        assert response.json()['count'] == 34, (
+            'Проверьте, что после пакетной записи фильтры и кеши '
+            'учитывают новые произведения.'
+        )
+        response = client.get('/api/v1/titles/', {'search': 'произведение'})
+        assert response.json()['count'] == 33
+
+    def test_02_per_item_results(self, admin_client, client):
+        titles, _, _ = create_titles(admin_client)
+        items = new_titles(2) + [
+            {'name': 'Без жанра', 'year': 2000, 'genre': ['missing'],
+             'category': 'films'},
+            {'name': 'Из будущего', 'year': 3000, 'genre': ['drama'],
+             'category': 'books'},
+            {'id': titles[0]['id'], 'name': 'Терминатор 2',
+             'genre': ['drama']},
+            {'id': 100500, 'name': 'Нет такого'},
+            'не словарь',
+        ]
+        response, _ = post_bulk(admin_client, items)
+        statuses = [result['status'] for result in response.json()]
+        assert statuses == [201, 201, 400, 400, 200, 404, 400], (
+            f'Проверьте, что `{URL}` возвращает результат для каждого '
+            'элемента пакета.'
+        )
+        assert 'genre' in response.json()[2]['errors']
+        title = client.get(f'/api/v1/titles/{titles[0]["id"]}/').json()
+        assert title['name'] == 'Терминатор 2'
+        assert title['year'] == titles[0]['year']
+        assert [genre['slug'] for genre in title['genre']] == ['drama'], (
+            'Проверьте, что пакетное изменение заменяет жанры произведения.'
+        )
+
+    def test_03_bulk_validation(self, admin_client, user_client):
+        response = user_client.post(URL, new_titles(1), format='json')
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            f'Проверьте, что `{URL}` доступен только администратору.'
+        )
+        response = admin_client.post(URL, new_titles(1)[0], format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_04_item_ids(self, admin_client, client):
+        titles, _, _ = create_titles(admin_client)
+        first, second = titles[0]['id'], titles[1]['id']
+        response, _ = post_bulk(admin_client, [
+            {'id': first, 'genre': ['drama']},
+            {'id': first, 'genre': ['drama', 'comedy']},
+            {'id': str(second), 'name': 'Крепкий орешек 2'},
+        ])
+        results = response.json()
+        assert [result['status'] for result in results] == [400, 400, 200], (
+            'Проверьте, что повторяющиеся `id` в пакете отклоняются, а `id` '
+            'строкой приводится к числу.'
+        )
+        assert isinstance(results[0]['errors']['id'], list)
+        title = client.get(f'/api/v1/titles/{first}/').json()
+        assert len(title['genre']) == len(titles[0]['genre'])
+        title = client.get(f'/api/v1/titles/{second}/').json()
+        assert title['name'] == 'Крепкий орешек 2'
+
+    def test_05_bulk_update_queries(self, admin_client, client):
+        create_titles(admin_client)
+        titles = [
+            result['id'] for result in
+            post_bulk(admin_client, new_titles(33))[0].json()
+        ]
+        response, queries = post_bulk(admin_client, [
+            {'id': title_id, 'genre': ['drama']} for title_id in titles[:3]
+        ])
+        assert [result['status'] for result in response.json()] == [200] * 3
+        _, more_queries = post_bulk(admin_client, [
+            {'id': title_id, 'genre': ['drama']} for title_id in titles[3:]
+        ])
+        assert more_queries == queries, (
+            f'Проверьте, что число запросов `{URL}` при изменении жанров не '
+            'зависит от количества произведений в пакете.'
+        )
+        response = client.get('/api/v1/titles/', {'genre': 'comedy'})
+        assert response.json()['count'] == 1, (
+            'Проверьте, что после пакетного изменения жанров фильтры и кеши '
+            'не находят произведения по удалённым жанрам.'
+        )
+        response = client.get('/api/v1/titles/', {'genre': 'drama'})
+        assert response.json()['count'] == 34
@@ -0,0 +1,87 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_comments, create_titles
+
+
+def multi_get(client, url, ids):
+    return client.get(url, {'ids': ','.join(map(str, ids))})
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18MultiGet:
+
+    def test_01_titles_by_ids(self, admin_client, client):
+        titles, _, _ = create_titles(admin_client)
+        url = '/api/v1/titles/'
+        ids = [titles[1]['id'], 100500, titles[0]['id']]
+        with CaptureQueriesContext(connection) as context:
+            response = multi_get(client, url, ids)
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert [title['id'] for title in data['results']] == [
+            titles[1]['id'], titles[0]['id']
+        ], (
+            f'Проверьте, что `{url}?ids=` возвращает объекты в порядке '
+            'переданных id.'
+        )
+        assert data['missing'] == [100500], (
+            f'Проверьте, что `{url}?ids=` перечисляет ненайденные id '
+            'в `missing`.'
+        )
+        assert data['results'][1]['genre'], (
+            'Проверьте, что объекты возвращаются с вложенными связями.'
+        )
+        title_queries = [
+            query for query in context.captured_queries
+            if query['sql'].startswith('SELECT "reviews_title"."id"')
+        ]
+        assert len(title_queries) == 1 and ' IN (' in title_queries[0][
+            'sql'], 'Проверьте, что объекты выбираются одним запросом.'
+
+    def test_02_reviews_comments_users(self, admin_client, user_client,
+                                       moderator_client, user, moderator,
+                                       admin):
+        comments, reviews, titles = create_comments(admin_client, {
+            user: user_client, moderator: moderator_client
+        })
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        data = multi_get(client=admin_client, url=url, ids=[
+            reviews[1]['id'], reviews[0]['id']
+        ]).json()
+        assert [review['text'] for review in data['results']] == [
+            reviews[1]['text'], reviews[0]['text']
+        ]
+        data = multi_get(
+            admin_client, f'{url}{reviews[0]["id"]}/comments/',
+            [comments[1]['id'], comments[0]['id'], 100500]
+        ).json()
+        assert [comment['author'] for comment in data['results']] == [
+            comments[1]['author'], comments[0]['author']
+        ]
+        assert data['missing'] == [100500]
+        data = multi_get(
+            admin_client, '/api/v1/users/', [moderator.id, admin.id]
+        ).json()
+        assert [item['username'] for item in data['results']] == [
+            moderator.username, admin.username
+        ]
+        other_title = f'/api/v1/titles/{titles[1]["id"]}/reviews/'
+        data = multi_get(admin_client, other_title, [reviews[0]['id']])
+        assert data.json()['missing'] == [reviews[0]['id']], (
+            'Проверьте, что `?ids=` не возвращает отзывы другого '
+            'произведения.'
+        )
+
+    def test_03_invalid_ids(self, client, settings):
+        url = '/api/v1/titles/'
+        response = client.get(url, {'ids': '1,abc'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        ids = range(1, settings.MULTI_GET_MAX_IDS + 2)
+        response = multi_get(client, url, ids)
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            f'Проверьте, что `{url}?ids=` ограничивает количество id.'
+        )
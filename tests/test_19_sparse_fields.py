@@ -0,0 +1,72 @@
+import pytest
+from django.conf import settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_single_review, create_titles
+
+
+def get_with_queries(client, url, params):
+    with CaptureQueriesContext(connection) as context:
+        data = client.get(url, params).json()
+    return data, ' '.join(query['sql'] for query in context.captured_queries)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19SparseFields:
+
+    def test_01_title_fields(self, admin_client, client):
+        titles, _, _ = create_titles(admin_client)
+        url = '/api/v1/titles/'
+        data, sql = get_with_queries(client, url, {'fields': 'id,name'})
+        assert data['results'] == [
+            {'id': titles[1]['id'], 'name': titles[1]['name']},
+            {'id': titles[0]['id'], 'name': titles[0]['name']},
+        ], (
+            f'Проверьте, что `{url}?fields=` оставляет в ответе только '
+            'перечисленные поля.'
+        )
+        assert '"description"' not in sql and 'reviews_genretitle' not in (
+            sql
+        ), (
+            'Проверьте, что невостребованные поля и связи не запрашиваются '
+            'из БД.'
+        )
+        data, sql = get_with_queries(
+            client, f'{url}{titles[0]["id"]}/', {'omit': 'description,genre'}
+        )
+        assert set(data) == {
+            'id', 'name', 'year', 'rating', 'review_count', 'category'
+        }, (
+            'Проверьте, что `?omit=` убирает поля из ответа.'
+        )
+        assert '"description"' not in sql
+        assert set(client.get(url).json()['results'][0]) == {
+            'id', 'name', 'year', 'rating', 'review_count', 'description',
+            'genre', 'category'
+        }, 'Проверьте, что без параметров ответ не изменился.'
+
+    def test_02_review_text_preview(self, admin_client, user_client,
+                                    client):
+        titles, _, _ = create_titles(admin_client)
+        text = ('Очень длинный отзыв. ' * 30).strip()
+        create_single_review(user_client, titles[0]['id'], text, 7)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        data, sql = get_with_queries(
+            client, url, {'fields': 'id,score,text_preview'}
+        )
+        review = data['results'][0]
+        assert set(review) == {'id', 'score', 'text_preview'}
+        assert review['text_preview'] == text[:settings.TEXT_PREVIEW_LENGTH], (
+            'Проверьте, что `text_preview` содержит начало текста отзыва.'
+        )
+        assert ', "reviews_review"."text"' not in sql
+        review = client.get(url).json()['results'][0]
+        assert 'text_preview' not in review and review['text'] == text, (
+            'Проверьте, что `text_preview` выводится только по запросу.'
+        )
+
+    def test_03_category_fields(self, admin_client, client):
+        create_titles(admin_client)
+        data = client.get('/api/v1/categories/', {'fields': 'slug'}).json()
+        assert data['results'] == [{'slug': 'books'}, {'slug': 'films'}]
@@ -0,0 +1,85 @@
+import pytest
+from rest_framework.renderers import JSONRenderer
+
+from api.readers import CommentReader, ReviewReader, TitleReader
+from api.serializers import (CommentSerializer, ReviewSerializer,
+                             TitleReadSerializer)
+from api.views import CommentViewSet, ReviewViewSet, TitleViewSet
+from tests.utils import create_comments, create_single_review
+
+
+def render(data):
+    return JSONRenderer().render(data)
+
+
+def read(reader_class, queryset):
+    reader = reader_class()
+    return reader.represent(reader.rows(queryset))
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20FastReaders:
+
+    @pytest.fixture
+    def catalogue(self, admin_client, user_client, moderator_client, user,
+                  moderator, django_user_model):
+        comments, reviews, titles = create_comments(admin_client, {
+            user: user_client, moderator: moderator_client
+        })
+        create_single_review(user_client, titles[1]['id'], 'Ещё', 8)
+        apps = django_user_model._meta.apps
+        admin_client.delete(f'/api/v1/categories/{titles[1]["category"]}/')
+        return titles, reviews, apps
+
+    def test_01_parity_with_serializers(self, catalogue):
+        _, _, apps = catalogue
+        cases = (
+            ('Title', TitleReader, TitleReadSerializer),
+            ('Review', ReviewReader, ReviewSerializer),
+            ('Comment', CommentReader, CommentSerializer),
+        )
+        for model_name, reader_class, serializer_class in cases:
+            queryset = apps.get_model('reviews', model_name).objects.order_by(
+                'id'
+            )
+            expected = render(serializer_class(queryset, many=True).data)
+            assert render(read(reader_class, queryset)) == expected, (
+                f'Проверьте, что `{reader_class.__name__}` выдаёт тот же '
+                f'JSON, что и `{serializer_class.__name__}`.'
+            )
+
+    def test_02_parity_in_views(self, catalogue, admin_client, monkeypatch):
+        titles, reviews, _ = catalogue
+        reviews_url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        comments_url = f'{reviews_url}{reviews[0]["id"]}/comments/'
+        cases = (
+            (ReviewViewSet, reviews_url),
+            (ReviewViewSet, f'{reviews_url}?cursor=&limit=1'),
+            (CommentViewSet, comments_url),
+        )
+        for viewset, url in cases:
+            fast = admin_client.get(url).content
+            monkeypatch.setattr(viewset, 'fast_reader_class', None)
+            assert admin_client.get(url).content == fast, (
+                f'Проверьте, что быстрый путь чтения `{url}` не меняет '
+                'ответ.'
+            )
+            monkeypatch.undo()
+
+    def test_03_title_reader_selectable(self, catalogue, admin_client,
+                                        monkeypatch):
+        titles, _, _ = catalogue
+        for url in (
+            '/api/v1/titles/',
+            '/api/v1/titles/?cursor=&limit=1',
+            f'/api/v1/titles/?ids={titles[0]["id"]}',
+            '/api/v1/titles/?ordering=-rating',
+        ):
+            cards = admin_client.get(url).content
+            monkeypatch.setattr(TitleViewSet, 'fast_reader_class',
+                                TitleReader)
+            assert admin_client.get(url).content == cards, (
+                f'Проверьте, что `TitleReader` можно включить для `{url}` '
+                'без изменения ответа.'
+            )
+            monkeypatch.undo()
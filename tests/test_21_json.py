@@ -0,0 +1,94 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+from http import HTTPStatus
+from io import BytesIO
+
+import pytest
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+
+from api import renderers
+from api.parsers import FastJSONParser
+from api.renderers import FastJSONRenderer
+from tests.utils import create_comments, create_single_review
+
+
+@pytest.fixture(params=['orjson', 'stdlib'])
+def encoder(request, monkeypatch):
+    if request.param == 'stdlib':
+        monkeypatch.setattr(renderers, 'orjson', None)
+    elif renderers.orjson is None:
+        pytest.skip('orjson не установлен')
+    return request.param
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21FastJSON:
+
+    def test_01_parity_on_api_payloads(self, encoder, admin_client,
+                                       user_client, moderator_client, user,
+                                       moderator):
+        comments, reviews, titles = create_comments(admin_client, {
+            user: user_client, moderator: moderator_client
+        })
+        create_single_review(
+            user_client, titles[1]['id'], 'Строка «кавычки» "и" \\', 9
+        )
+        reviews_url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        for url in (
+            '/api/v1/titles/',
+            f'/api/v1/titles/{titles[1]["id"]}/',
+            f'/api/v1/titles/{titles[1]["id"]}/reviews/',
+            f'{reviews_url}{reviews[0]["id"]}/comments/',
+            '/api/v1/titles/facets/',
+        ):
+            data = admin_client.get(url).data
+            assert FastJSONRenderer().render(data) == JSONRenderer().render(
+                data
+            ), (
+                f'Проверьте, что `FastJSONRenderer` ({encoder}) выдаёт для '
+                f'`{url}` те же байты, что и `JSONRenderer`.'
+            )
+
+    def test_02_special_types(self, encoder):
+        data = {
+            'moment': datetime(2023, 5, 1, 12, 30, 15, 123456,
+                               tzinfo=timezone.utc),
+            'date': datetime(2023, 5, 1).date(),
+            'amount': Decimal('7.5'),
+            'text': 'Строка\u2028с разделителем\u2029',
+            'nested': [{'score': 10, 'empty': None, 'flag': True}],
+        }
+        assert FastJSONRenderer().render(data) == JSONRenderer().render(
+            data
+        ), 'Проверьте, что даты и Decimal кодируются так же, как в DRF.'
+        assert FastJSONRenderer().render(None) == b''
+        indented = FastJSONRenderer().render(
+            data, 'application/json; indent=2'
+        )
+        assert indented == JSONRenderer().render(
+            data, 'application/json; indent=2'
+        ), 'Проверьте, что форматированный вывод остаётся за DRF.'
+
+    def test_03_parser(self, encoder, admin_client):
+        parser = FastJSONParser()
+        assert parser.parse(
+            BytesIO('{"name": "Фильм", "year": 1990}'.encode())
+        ) == {'name': 'Фильм', 'year': 1990}
+        for body in (b'{"name": ', b'{"year": NaN}'):
+            with pytest.raises(ParseError):
+                parser.parse(BytesIO(body))
+        response = admin_client.post(
+            '/api/v1/categories/', data=b'{"name": ',
+            content_type='application/json'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что некорректный JSON в теле запроса приводит к '
+            'ответу со статусом 400.'
+        )
+        response = admin_client.post(
+            '/api/v1/categories/',
+            data='{"name": "Книги", "slug": "books"}'.encode(),
+            content_type='application/json'
+        )
+        assert response.status_code == HTTPStatus.CREATED
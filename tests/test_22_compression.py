@@ -0,0 +1,97 @@
+import gzip
+import zlib
+from http import HTTPStatus
+
+import pytest
+
+from api import middleware
+from api.middleware import negotiate_encoding
+from tests.utils import create_titles
+
+
+@pytest.fixture
+def small_threshold(settings):
+    settings.COMPRESS_MIN_SIZE = 100
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22Compression:
+    url = '/api/v1/titles/'
+
+    def test_01_gzip_and_etag(self, admin_client, client, small_threshold):
+        create_titles(admin_client)
+        plain = client.get(self.url)
+        response = client.get(self.url, HTTP_ACCEPT_ENCODING='gzip, br')
+        assert response['Content-Encoding'] == 'gzip', (
+            f'Проверьте, что ответ `{self.url}` сжимается gzip, если клиент '
+            'его поддерживает.'
+        )
+        assert gzip.decompress(response.content) == plain.content
+        assert response['Content-Length'] == str(len(response.content))
+        assert 'Accept-Encoding' in response['Vary']
+        assert response['ETag'] == f'W/{plain["ETag"]}', (
+            'Проверьте, что сжатый ответ получает слабый ETag.'
+        )
+        response = client.get(
+            self.url, HTTP_ACCEPT_ENCODING='gzip',
+            HTTP_IF_NONE_MATCH=response['ETag']
+        )
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            'Проверьте, что слабый ETag сжатого ответа даёт 304.'
+        )
+
+    def test_02_negotiation(self, admin_client, client, small_threshold):
+        create_titles(admin_client)
+        response = client.get(
+            self.url, HTTP_ACCEPT_ENCODING='gzip;q=0, deflate'
+        )
+        assert response['Content-Encoding'] == 'deflate'
+        assert zlib.decompress(response.content) == client.get(
+            self.url).content
+        response = client.get(self.url, HTTP_ACCEPT_ENCODING='identity')
+        assert not response.has_header('Content-Encoding')
+        response = client.get(
+            '/api/v1/genres/?limit=1', HTTP_ACCEPT_ENCODING='gzip'
+        )
+        assert not response.has_header('Content-Encoding'), (
+            'Проверьте, что ответы меньше порога не сжимаются.'
+        )
+        assert negotiate_encoding('deflate;q=0.5, *;q=0.8') == 'gzip'
+        assert negotiate_encoding('deflate, gzip') == 'gzip'
+        assert negotiate_encoding('*;q=0') is None
+
+    def test_03_compressed_once(self, admin_client, client, small_threshold,
+                                monkeypatch):
+        create_titles(admin_client)
+        calls = []
+        compress = middleware.COMPRESSORS['gzip']
+        monkeypatch.setitem(
+            middleware.COMPRESSORS, 'gzip',
+            lambda content, level: calls.append(1) or compress(
+                content, level
+            )
+        )
+        bodies = {
+            client.get(self.url, HTTP_ACCEPT_ENCODING='gzip').content
+            for _ in range(3)
+        }
+        assert len(bodies) == 1 and len(calls) == 1, (
+            'Проверьте, что публичный ответ сжимается один раз и затем '
+            'берётся из кеша.'
+        )
+        admin_client.get(self.url, HTTP_ACCEPT_ENCODING='gzip')
+        admin_client.get(self.url, HTTP_ACCEPT_ENCODING='gzip')
+        assert len(calls) == 3, (
+            'Проверьте, что ответы для авторизованных пользователей не '
+            'попадают в общий кеш сжатых тел.'
+        )
+
+    def test_04_export_not_recompressed(self, admin_client, small_threshold):
+        create_titles(admin_client)
+        response = admin_client.get(
+            '/api/v1/export/', HTTP_ACCEPT_ENCODING='gzip'
+        )
+        content = gzip.decompress(b''.join(response.streaming_content))
+        assert content.count(b'\n') == 2, (
+            'Проверьте, что потоковая выгрузка не сжимается повторно.'
+        )
@@ -0,0 +1,74 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_comments, data_queries
+
+
+def count_from(context, table):
+    return sum(
+        f'FROM "{table}"' in query['sql']
+        for query in context.captured_queries
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23NestedRoutes:
+
+    @pytest.fixture
+    def thread(self, admin_client, user_client, moderator_client, user,
+               moderator):
+        comments, reviews, titles = create_comments(admin_client, {
+            user: user_client, moderator: moderator_client
+        })
+        return titles, reviews, comments
+
+    def test_01_chain_is_checked(self, thread, user_client):
+        titles, reviews, comments = thread
+        review_id = reviews[0]['id']
+        right = f'/api/v1/titles/{titles[0]["id"]}/reviews/{review_id}/'
+        wrong = f'/api/v1/titles/{titles[1]["id"]}/reviews/{review_id}/'
+        assert user_client.get(f'{right}comments/').status_code == (
+            HTTPStatus.OK
+        )
+        for url in (
+            f'{wrong}comments/',
+            f'{wrong}comments/{comments[0]["id"]}/',
+            wrong,
+            '/api/v1/titles/100500/reviews/',
+        ):
+            assert user_client.get(url).status_code == HTTPStatus.NOT_FOUND, (
+                f'Проверьте, что `{url}` проверяет всю цепочку '
+                '`title_id/review_id` из адреса.'
+            )
+        response = user_client.post(
+            f'{wrong}comments/', data={'text': 'Не туда'}
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что комментарий нельзя создать к отзыву чужого '
+            'произведения.'
+        )
+        response = user_client.post(
+            f'{right}comments/', data={'text': 'Туда'}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert response.json()['review'] == review_id
+
+    def test_02_parent_loaded_once(self, thread, client):
+        titles, reviews, comments = thread
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        with CaptureQueriesContext(connection) as context:
+            assert client.get(url).status_code == HTTPStatus.OK
+        assert count_from(context, 'reviews_title') == 1, (
+            f'Проверьте, что `{url}` проверяет произведение одним запросом '
+            'и не загружает его повторно.'
+        )
+        url = f'{url}{reviews[0]["id"]}/comments/{comments[0]["id"]}/'
+        with CaptureQueriesContext(connection) as context:
+            assert client.get(url).status_code == HTTPStatus.OK
+        assert len(data_queries(context)) == 1, (
+            f'Проверьте, что `{url}` проверяет цепочку родителей тем же '
+            'запросом, что выбирает комментарий.'
+        )
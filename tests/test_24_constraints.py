@@ -0,0 +1,107 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import IntegrityError, connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.validators import UniqueValidator
+
+from api.serializers import ReviewSerializer
+from tests.utils import create_titles
+
+EXISTS_QUERY = 'SELECT (1) AS "a" FROM "{}"'
+
+
+def post_with_queries(client, url, data):
+    with CaptureQueriesContext(connection) as context:
+        response = client.post(url, data=data)
+    return response, ' '.join(
+        query['sql'] for query in context.captured_queries
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24Constraints:
+
+    def test_01_duplicate_review(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        data = {'text': 'Отзыв', 'score': 7}
+        response, sql = post_with_queries(user_client, url, data)
+        assert response.status_code == HTTPStatus.CREATED
+        assert EXISTS_QUERY.format('reviews_review') not in sql, (
+            'Проверьте, что уникальность отзыва не проверяется отдельным '
+            'запросом перед вставкой.'
+        )
+        response = user_client.post(url, data=data)
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert response.json() == {'non_field_errors': [
+            'Вы уже оставили отзыв на это произведение.'
+        ]}, (
+            'Проверьте, что нарушение ограничения БД превращается в ошибку '
+            'валидации.'
+        )
+
+    def test_02_duplicate_user_fields(self, admin_client, user_client,
+                                      user, admin):
+        url = '/api/v1/users/'
+        response, sql = post_with_queries(admin_client, url, {
+            'username': 'new_user', 'email': 'new_user@yamdb.fake'
+        })
+        assert response.status_code == HTTPStatus.CREATED
+        assert EXISTS_QUERY.format('reviews_user') not in sql, (
+            'Проверьте, что уникальность `username` и `email` проверяет БД.'
+        )
+        response = admin_client.post(url, data={
+            'username': user.username, 'email': 'other@yamdb.fake'
+        })
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert response.json() == {
+            'username': [str(UniqueValidator.message)]
+        }
+        response = admin_client.post(url, data={
+            'username': 'other', 'email': user.email
+        })
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert list(response.json()) == ['email']
+        response = user_client.patch(
+            f'{url}me/', data={'username': admin.username}
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что смена `username` на занятый возвращает 400.'
+        )
+
+    def test_03_signup(self, client, user, settings):
+        url = '/api/v1/auth/signup/'
+        data = {'username': 'signed', 'email': 'signed@yamdb.fake'}
+        assert client.post(url, data=data).status_code == HTTPStatus.OK
+        assert client.post(url, data=data).status_code == HTTPStatus.OK
+        response = client.post(url, data={
+            'username': user.username, 'email': 'free@yamdb.fake'
+        })
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert response.json() == settings.USERNAME_EXISTS_MESSAGE, (
+            'Проверьте, что при занятом `username` сообщается именно о нём.'
+        )
+        response = client.post(url, data={
+            'username': 'free', 'email': user.email
+        })
+        assert response.json() == settings.EMAIL_EXISTS_MESSAGE
+
+    def test_04_only_unique_violations_converted(self):
+        serializer = ReviewSerializer()
+        for text in (
+            'UNIQUE constraint failed: reviews_review.author_id, '
+            'reviews_review.title_id',
+            'duplicate key value violates unique constraint '
+            '"unique_author_review"',
+        ):
+            assert serializer.get_unique_errors(IntegrityError(text)) == {
+                'non_field_errors': [
+                    'Вы уже оставили отзыв на это произведение.'
+                ]
+            }
+        error = IntegrityError(
+            'CHECK constraint failed: "rating_count" >= 0'
+        )
+        with pytest.raises(IntegrityError):
+            serializer.get_unique_errors(error)
@@ -0,0 +1,76 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25Counters:
+
+    @pytest.fixture
+    def thread(self, admin_client, user_client, moderator_client, user,
+               moderator):
+        comments, reviews, titles = create_comments(admin_client, {
+            user: user_client, moderator: moderator_client
+        })
+        review_url = (
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/'
+        )
+        return titles, review_url, comments
+
+    def test_01_review_counters(self, thread, client, admin_client):
+        titles, review_url, comments = thread
+        reviews_url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        review = client.get(reviews_url).json()['results'][0]
+        last = admin_client.get(
+            f'{review_url}comments/{comments[1]["id"]}/'
+        ).json()
+        assert review['comment_count'] == 2, (
+            'Проверьте, что отзыв содержит количество комментариев '
+            '`comment_count`.'
+        )
+        assert review['last_comment_at'] == last['pub_date']
+        admin_client.delete(f'{review_url}comments/{comments[1]["id"]}/')
+        first = admin_client.get(
+            f'{review_url}comments/{comments[0]["id"]}/'
+        ).json()
+        review = client.get(reviews_url).json()['results'][0]
+        assert review['comment_count'] == 1, (
+            'Проверьте, что удаление комментария уменьшает `comment_count` '
+            'и сбрасывает кешированный список отзывов.'
+        )
+        assert review['last_comment_at'] == first['pub_date'], (
+            'Проверьте, что после удаления последнего комментария '
+            '`last_comment_at` указывает на предыдущий.'
+        )
+        admin_client.delete(f'{review_url}comments/{comments[0]["id"]}/')
+        review = admin_client.get(review_url).json()
+        assert (review['comment_count'], review['last_comment_at']) == (
+            0, None
+        )
+
+    def test_02_title_review_count(self, thread, client):
+        titles, _, _ = thread
+        title = client.get(f'/api/v1/titles/{titles[0]["id"]}/').json()
+        assert title['review_count'] == 2, (
+            'Проверьте, что произведение содержит количество отзывов '
+            '`review_count`.'
+        )
+        other = client.get(f'/api/v1/titles/{titles[1]["id"]}/').json()
+        assert other['review_count'] == 0
+
+    def test_03_comments_count_without_query(self, thread, client):
+        _, review_url, _ = thread
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(f'{review_url}comments/')
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['count'] == 2
+        assert not any(
+            'COUNT(' in query['sql'] for query in context.captured_queries
+        ), (
+            'Проверьте, что количество комментариев берётся из '
+            '`comment_count` отзыва, а не из COUNT(*).'
+        )
@@ -0,0 +1,74 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from tests.utils import create_single_review, create_titles
+
+URL = '/api/v1/changes/'
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26Changes:
+
+    def test_01_incremental_changes(self, admin_client, user_client, client):
+        titles, categories, genres = create_titles(admin_client)
+        data = client.get(URL).json()
+        assert sorted(data['changes']['title']['changed']) == sorted(
+            title['id'] for title in titles
+        ), (
+            f'Проверьте, что `{URL}` перечисляет созданные произведения.'
+        )
+        assert len(data['changes']['genre']['changed']) == len(genres)
+        assert not data['has_more']
+        since = data['next']
+        assert client.get(URL, {'since': since}).json()['changes'] == {}
+        create_single_review(user_client, titles[0]['id'], 'Отзыв', 8)
+        admin_client.delete(f'/api/v1/titles/{titles[1]["id"]}/')
+        data = client.get(URL, {'since': since}).json()
+        assert data['changes']['title'] == {
+            'changed': [titles[0]['id']], 'deleted': [titles[1]['id']]
+        }, (
+            f'Проверьте, что `{URL}?since=` возвращает только изменения '
+            'после указанного номера, свёрнутые по объектам.'
+        )
+        assert len(data['changes']['review']['changed']) == 1
+        page = client.get(URL, {'since': since, 'limit': 1}).json()
+        assert page['has_more'] and page['next'] == since + 1, (
+            f'Проверьте, что `{URL}?limit=` ограничивает страницу журнала.'
+        )
+        response = client.get(URL, {'since': 'abc'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_02_compaction(self, admin_client, client, django_user_model):
+        titles, _, _ = create_titles(admin_client)
+        since = client.get(URL).json()['next']
+        admin_client.patch(
+            f'/api/v1/titles/{titles[0]["id"]}/', data={'year': 1990}
+        )
+        admin_client.delete(f'/api/v1/titles/{titles[1]["id"]}/')
+        ChangeLog = django_user_model._meta.apps.get_model(
+            'reviews', 'ChangeLog'
+        )
+        call_command('compact_changelog', days=0)
+        rows = list(ChangeLog.objects.exclude(op=ChangeLog.PURGE).values_list(
+            'model', 'object_id'
+        ))
+        assert len(rows) == len(set(rows)), (
+            'Проверьте, что сжатие оставляет по одной записи на объект.'
+        )
+        response = client.get(URL, {'since': since})
+        assert response.status_code == HTTPStatus.GONE, (
+            'Проверьте, что клиенту, пропустившему истёкшие удаления, '
+            'возвращается 410.'
+        )
+        data = client.get(URL).json()
+        assert data['changes']['title'] == {
+            'changed': [titles[0]['id']], 'deleted': []
+        }, (
+            'Проверьте, что после сжатия журнал описывает все существующие '
+            'объекты.'
+        )
+        assert client.get(
+            URL, {'since': data['next']}
+        ).status_code == HTTPStatus.OK
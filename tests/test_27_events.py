@@ -0,0 +1,125 @@
+import asyncio
+import json
+import socket
+
+import pytest
+from asgiref.sync import sync_to_async
+from asgiref.testing import ApplicationCommunicator
+
+from api.events import broadcaster, event_stream_application, notifier
+from tests.utils import create_single_comment, create_titles
+
+
+def events_scope(title_id):
+    return {
+        'type': 'http',
+        'method': 'GET',
+        'path': f'/api/v1/titles/{title_id}/events/',
+        'headers': [],
+    }
+
+
+async def open_stream(title_id):
+    communicator = ApplicationCommunicator(
+        event_stream_application(None), events_scope(title_id)
+    )
+    await communicator.send_input({'type': 'http.request'})
+    start = await communicator.receive_output(5)
+    return communicator, start
+
+
+async def read_event(communicator):
+    message = await communicator.receive_output(5)
+    kind, data = message['body'].decode().strip().split('\n')
+    return kind[len('event: '):], json.loads(data[len('data: '):])
+
+
+@pytest.fixture
+def events_settings(settings, tmp_path):
+    settings.EVENTS_SOCKET_DIR = str(tmp_path)
+    return settings
+
+
+@pytest.mark.django_db(transaction=True)
+class Test27Events:
+
+    def test_01_review_and_comment_events(self, events_settings,
+                                          admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        url = f'/api/v1/titles/{title_id}/reviews/'
+
+        async def scenario():
+            communicator, start = await open_stream(title_id)
+            assert start['status'] == 200
+            assert (b'content-type', b'text/event-stream') in start[
+                'headers'
+            ]
+            retry = await communicator.receive_output(5)
+            assert retry['body'].startswith(b'retry:')
+            review = (await sync_to_async(user_client.post)(
+                url, data={'text': 'Отзыв', 'score': 9}
+            )).json()
+            assert await read_event(communicator) == ('review', {
+                'type': 'review', 'op': 'create', 'id': review['id'],
+                'title': title_id,
+            }), (
+                'Проверьте, что поток событий произведения получает новый '
+                'отзыв.'
+            )
+            comment = (await sync_to_async(create_single_comment)(
+                user_client, title_id, review['id'], 'Комментарий'
+            )).json()
+            kind, event = await read_event(communicator)
+            assert kind == 'comment' and event['id'] == comment['id']
+            await sync_to_async(user_client.delete)(f'{url}{review["id"]}/')
+            operations = {
+                (await read_event(communicator))[1]['type']
+                for _ in range(2)
+            }
+            assert operations == {'review', 'comment'}, (
+                'Проверьте, что удаление отзыва публикует события удаления.'
+            )
+            await communicator.send_input({'type': 'http.disconnect'})
+            await communicator.wait(5)
+            assert broadcaster.count == 0
+
+        asyncio.run(scenario())
+
+    def test_02_limits(self, events_settings, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+
+        async def scenario():
+            _, start = await open_stream(100500)
+            assert start['status'] == 404
+            events_settings.EVENTS_MAX_CONNECTIONS = 1
+            communicator, start = await open_stream(title_id)
+            _, rejected = await open_stream(title_id)
+            assert rejected['status'] == 503, (
+                'Проверьте, что число открытых потоков ограничено.'
+            )
+            await communicator.receive_output(5)
+            events_settings.EVENTS_QUEUE_SIZE = 2
+            queue = broadcaster.subscribe(title_id)
+            for number in range(3):
+                broadcaster.publish({'title': title_id, 'id': number})
+            assert queue.qsize() == 1 and queue.get_nowait() is None, (
+                'Проверьте, что переполненная очередь отстающего клиента '
+                'очищается и поток закрывается.'
+            )
+            broadcaster.unsubscribe(title_id, queue)
+            await communicator.send_input({'type': 'http.disconnect'})
+            await communicator.wait(5)
+
+        asyncio.run(scenario())
+
+    def test_03_stale_sockets_removed(self, events_settings, tmp_path):
+        path = tmp_path / 'stale.sock'
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        stale.bind(str(path))
+        stale.close()
+        notifier.send({'type': 'review', 'title': 1})
+        assert not path.exists(), (
+            'Проверьте, что сокеты завершившихся процессов удаляются.'
+        )
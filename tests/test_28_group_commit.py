@@ -0,0 +1,101 @@
+import threading
+from functools import partial
+from http import HTTPStatus
+
+import pytest
+from django.db import IntegrityError, transaction
+
+from api.writes import (GroupCommitWriter, WriteQueueTimeout, group_commit,
+                        writer)
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test28GroupCommit:
+
+    def test_01_batch_in_one_transaction(self, django_user_model):
+        Genre = django_user_model._meta.apps.get_model('reviews', 'Genre')
+        batch_writer = GroupCommitWriter(window=0.5)
+        committed = []
+
+        def create_genre(slug):
+            Genre.objects.create(name=slug, slug=slug)
+            transaction.on_commit(partial(committed.append, slug))
+            return list(committed)
+
+        futures = [
+            batch_writer.submit(create_genre, slug)
+            for slug in ('drama', 'drama', 'comedy')
+        ]
+        try:
+            assert futures[0].result(5) == []
+            with pytest.raises(IntegrityError):
+                futures[1].result(5)
+            assert futures[2].result(5) == [], (
+                'Проверьте, что записи, пришедшие в окне, выполняются в одной '
+                'транзакции.'
+            )
+        finally:
+            batch_writer.close()
+        assert committed == ['drama', 'comedy']
+        assert sorted(Genre.objects.values_list('slug', flat=True)) == [
+            'comedy', 'drama'
+        ], (
+            'Проверьте, что ошибка одной записи откатывает только её точку '
+            'сохранения.'
+        )
+
+    def test_02_reviews_and_comments(self, settings, admin_client,
+                                     user_client):
+        settings.WRITE_GROUP_COMMIT = True
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        data = {'text': 'Отзыв', 'score': 7}
+        response = user_client.post(url, data=data)
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что при `WRITE_GROUP_COMMIT` отзыв создаётся через '
+            'поток записи.'
+        )
+        review = response.json()
+        response = user_client.post(url, data=data)
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert response.json() == {'non_field_errors': [
+            'Вы уже оставили отзыв на это произведение.'
+        ]}, (
+            'Проверьте, что нарушение уникальности в потоке записи '
+            'возвращается запросу как ошибка валидации.'
+        )
+        response = user_client.post(
+            f'{url}{review["id"]}/comments/', data={'text': 'Комментарий'}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        review = user_client.get(f'{url}{review["id"]}/').json()
+        assert review['comment_count'] == 1
+        response = user_client.post(
+            '/api/v1/titles/100500/reviews/', data=data
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_03_timeout_cancels_write(self, settings, django_user_model):
+        Genre = django_user_model._meta.apps.get_model('reviews', 'Genre')
+        settings.WRITE_GROUP_COMMIT = True
+        settings.WRITE_GROUP_COMMIT_TIMEOUT = 0.2
+        started, release = threading.Event(), threading.Event()
+
+        def block():
+            started.set()
+            release.wait(5)
+
+        blocker = writer.submit(block)
+        started.wait(5)
+        try:
+            with pytest.raises(WriteQueueTimeout):
+                group_commit(Genre.objects.create, name='Драма', slug='drama')
+        finally:
+            release.set()
+            blocker.result(5)
+            writer.close()
+        assert not Genre.objects.exists(), (
+            'Проверьте, что запись, не дождавшаяся очереди, отменяется и '
+            'не выполняется после ответа 503.'
+        )
@@ -304,3 +304,13 @@ def check_fields(obj_type, url_pattern, obj, expected_data, detail=False):
         f'данные {obj_types[obj_type]}{results_in_msg}. Поле `id` не '
         'найдено или не является целым числом.'
     )
+
+
+def data_queries(context):
+    """Запросы, кроме служебных: версий тегов кеша для ETag и проверки
+    журнала изменений индексами в памяти."""
+    return [
+        query for query in context.captured_queries
+        if 'FROM "reviews_cachetag"' not in query['sql']
+        and 'FROM "reviews_changelog"' not in query['sql']
+    ]